@@ -0,0 +1,147 @@
+"""
+Benchmark de UnitProcessor.create_unit_list: caminho antigo (um round trip ao
+driver por elemento + df.loc[len(df)] por linha) versus o atual (ROSTER_JS em
+um único evaluate + DataFrame construído de uma vez).
+
+Não acessa o Canaimé: a página é simulada e cada chamada ao driver custa
+``--ipc-ms`` milissegundos, para refletir a latência de IPC com o Playwright.
+
+Uso:
+    python -m benchmarks.bench_create_unit_list --entries 1700 --ipc-ms 0.3
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from controllers.unit_controller import (
+    URL_CALL,
+    ROSTER_COLUMNS,
+    UnitProcessor,
+    photo_link,
+    parse_roster_entry,
+)
+
+
+class SimulatedPage:
+    """
+    Página de chamada simulada que conta os round trips ao driver.
+    """
+
+    def __init__(self, entries: int, ipc_seconds: float):
+        self.ipc_seconds = ipc_seconds
+        self.round_trips = 0
+        self.url = None
+        self.entries = [f"GS{100000 + i}\n\n\n\nALA: {i % 9} / {i % 40:02d}" for i in range(entries)]
+        self.names = [f"PRESO NUMERO {i}" for i in range(entries)]
+        self.srcs = [f"../../fotos/presos/{100000 + i}.jpg" for i in range(entries)]
+
+    def _ipc(self):
+        self.round_trips += 1
+        if self.ipc_seconds:
+            time.sleep(self.ipc_seconds)
+
+    def goto(self, url, timeout=0):
+        self._ipc()
+        self.url = url
+
+    def evaluate(self, script, arg=None):
+        self._ipc()
+        return {"entries": list(self.entries), "names": list(self.names), "srcs": list(self.srcs)}
+
+    def locator(self, selector):
+        values = {
+            '.titulobkSingCAPS': self.entries,
+            '.titulobkSingCAPS .titulo12bk': self.names,
+            'img': self.srcs,
+        }[selector]
+        return SimulatedLocator(self, values)
+
+
+class SimulatedLocator:
+    def __init__(self, page, values, index=None):
+        self.page = page
+        self.values = values
+        self.index = index
+
+    def count(self):
+        self.page._ipc()
+        return len(self.values)
+
+    def nth(self, i):
+        return SimulatedLocator(self.page, self.values, i)
+
+    def text_content(self):
+        self.page._ipc()
+        return self.values[self.index]
+
+    def get_attribute(self, name):
+        self.page._ipc()
+        return self.values[self.index]
+
+
+def legacy_create_unit_list(page, unit: str) -> pd.DataFrame:
+    """
+    Caminho antigo de create_unit_list, mantido aqui apenas como referência.
+    """
+    df = pd.DataFrame(columns=ROSTER_COLUMNS)
+    page.goto(URL_CALL + unit, timeout=0)
+    all_entries = page.locator('.titulobkSingCAPS')
+    names = page.locator('.titulobkSingCAPS .titulo12bk')
+    count = all_entries.count()
+    all_imgs = page.locator('img')
+    img_count = all_imgs.count()
+
+    foto_urls = []
+    for i in range(img_count):
+        foto_src = all_imgs.nth(i).get_attribute('src')
+        if foto_src:
+            foto_urls.append(photo_link(foto_src))
+    while len(foto_urls) < count:
+        foto_urls.append("SEM FOTO")
+
+    for i in range(count):
+        entry_text = all_entries.nth(i).text_content()
+        inmate_name = names.nth(i).text_content()
+        link_foto = foto_urls[i] if i < len(foto_urls) else "SEM FOTO"
+        df.loc[len(df)] = parse_roster_entry(unit, entry_text, inmate_name, link_foto)
+    return df
+
+
+def run(entries: int, ipc_ms: float) -> dict:
+    """
+    Executa os dois caminhos sobre a mesma página simulada e devolve os tempos.
+    """
+    results = {}
+
+    page = SimulatedPage(entries, ipc_ms / 1000)
+    start = time.perf_counter()
+    df_legacy = legacy_create_unit_list(page, "PAMC")
+    results["antigo"] = (time.perf_counter() - start, page.round_trips)
+
+    page = SimulatedPage(entries, ipc_ms / 1000)
+    start = time.perf_counter()
+    df_bulk = UnitProcessor(page).create_unit_list("PAMC")
+    results["atual"] = (time.perf_counter() - start, page.round_trips)
+
+    # Os dois caminhos devem produzir exatamente o mesmo DataFrame
+    pd.testing.assert_frame_equal(df_legacy.reset_index(drop=True), df_bulk, check_dtype=False)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1700, help="presos na página de chamada")
+    parser.add_argument("--ipc-ms", type=float, default=0.3, help="custo simulado de cada chamada ao driver")
+    args = parser.parse_args()
+
+    results = run(args.entries, args.ipc_ms)
+    print(f"\ncreate_unit_list com {args.entries} presos (IPC simulado: {args.ipc_ms} ms)")
+    for name, (seconds, round_trips) in results.items():
+        print(f"  {name:<7} {seconds:8.3f} s  {round_trips:6d} round trips")
+    print(f"  ganho   {results['antigo'][0] / results['atual'][0]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
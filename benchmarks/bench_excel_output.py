@@ -0,0 +1,78 @@
+"""
+Benchmark de ExcelHandler: tempo de escrita/gravação e tamanho do .xlsx para
+cada combinação de photo_links ('comment' / 'formula') e streaming.
+
+Os presos são sintéticos (todas as colunas da planilha preenchidas, com foto
+em ``--photo-ratio`` deles), distribuídos em ``--units`` unidades. Cada
+unidade é gravada com create_unit_sheet e o arquivo é finalizado com close()
+(sem os save() intermediários de main.py, que só somariam regravações).
+
+Uso:
+    python -m benchmarks.bench_excel_output --inmates 5000 --units 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from controllers.unit_controller import DETAIL_COLUMNS, ROSTER_COLUMNS
+from views.excel_view import ExcelHandler
+
+
+def synthetic_unit(unit_index: int, inmates: int, photo_ratio: float) -> pd.DataFrame:
+    """
+    Gera o DataFrame de uma unidade já enriquecida.
+    """
+    with_photo = int(inmates * photo_ratio)
+    rows = []
+    for i in range(inmates):
+        code = f"{unit_index}{100000 + i}"
+        foto = f"https://canaime.com.br/sgp2rr/fotos/presos/{code}.jpg" if i < with_photo else "SEM FOTO"
+        rows.append([f"ALA {i % 9}", f"{i % 40:02d}", code, foto, f"PRESO NUMERO {code}"]
+                    + [f"{col} {i}" for col in DETAIL_COLUMNS])
+    return pd.DataFrame(rows, columns=ROSTER_COLUMNS + DETAIL_COLUMNS)
+
+
+def run(inmates: int, units: int, photo_ratio: float) -> dict:
+    """
+    Grava o mesmo conjunto de unidades em cada modo e devolve
+    {modo: (segundos, bytes)}.
+    """
+    per_unit = max(1, inmates // units)
+    dfs = [(f"U{n:02d}", synthetic_unit(n, per_unit, photo_ratio)) for n in range(units)]
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for photo_links in ("comment", "formula"):
+            for streaming in (False, True):
+                name = f"{photo_links}{' streaming' if streaming else ''}"
+                path = os.path.join(tmp, f"{photo_links}_{streaming}.xlsx")
+                start = time.perf_counter()
+                handler = ExcelHandler(path, streaming=streaming, photo_links=photo_links)
+                for unit, df in dfs:
+                    handler.create_unit_sheet(unit, df)
+                handler.close()
+                results[name] = (time.perf_counter() - start, os.path.getsize(path))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inmates", type=int, default=5000, help="total de presos")
+    parser.add_argument("--units", type=int, default=10, help="número de unidades (abas)")
+    parser.add_argument("--photo-ratio", type=float, default=0.9, help="fração de presos com foto")
+    args = parser.parse_args()
+
+    results = run(args.inmates, args.units, args.photo_ratio)
+    baseline_seconds, baseline_bytes = results["comment"]
+    print(f"\nExcel com {args.inmates} presos em {args.units} abas (fotos: {args.photo_ratio:.0%})")
+    for name, (seconds, size) in results.items():
+        print(f"  {name:<20} {seconds:8.3f} s  {size / 1024:9.1f} KiB"
+              f"  ({baseline_seconds / seconds:4.1f}x tempo, {baseline_bytes / size:4.1f}x tamanho)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark do bloqueio de recursos: tempo por navegação sem bloqueio, com o
+callback antigo (context.route("**/*") decidindo cada requisição em Python) e
+com a rota por padrão de URL (utils.resource_blocking, avaliada pelo driver).
+
+Não acessa o Canaimé: um servidor HTTP local serve uma página no formato da
+chamada com fotos (``--images`` imagens, uma folha de estilo e uma fonte), e
+cada recurso demora ``--delay-ms`` milissegundos para responder. Para cada
+modo são medidos o tempo por navegação e as requisições e bytes que chegaram
+ao servidor.
+
+Uso:
+    python -m benchmarks.bench_request_blocking --navigations 50 --images 40
+    python -m benchmarks.bench_request_blocking --executable-path /caminho/do/chrome
+"""
+
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from playwright.sync_api import sync_playwright
+
+from utils.resource_blocking import blocked_url_pattern
+
+
+def make_handler(images: int, delay: float, served: dict):
+    """
+    Cria o handler do servidor local: "/" é a página, o resto são recursos.
+    Cada resposta soma 1 em ``served["requests"]`` e o corpo em ``served["bytes"]``.
+    """
+    lock = threading.Lock()
+    page = (
+        '<html><head><link rel="stylesheet" href="/estilo.css">'
+        '<style>@font-face {font-family: f; src: url(/fonte.woff2);} body {font-family: f;}</style>'
+        '</head><body><table>'
+        + "".join(
+            f'<tr><td class="titulobkSingCAPS">GS{n}<span class="titulo12bk">PRESO {n}</span>'
+            f' ALA: A / 01</td><td><img src="/fotos/presos/{n}.jpg"></td></tr>'
+            for n in range(images)
+        )
+        + '</table></body></html>'
+    ).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/":
+                body, content_type = page, "text/html; charset=utf-8"
+            else:
+                time.sleep(delay)
+                body, content_type = b"\0" * 2048, "application/octet-stream"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+            with lock:
+                served["requests"] += 1
+                served["bytes"] += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def legacy_blocking(context) -> None:
+    """
+    Bloqueio antigo, mantido aqui apenas como referência.
+    """
+    context.route("**/*", lambda route: route.abort() if route.request.resource_type == "image" else route.continue_())
+
+
+def pattern_blocking(context) -> None:
+    context.route(blocked_url_pattern(['image', 'stylesheet', 'font']), lambda route: route.abort())
+
+
+def run(navigations: int, images: int, delay_ms: float, executable_path: str = None) -> dict:
+    """
+    Navega ``navigations`` vezes até a página local em cada modo e devolve
+    {modo: {"seconds": segundos por navegação, "requests": requisições por
+    navegação, "bytes": bytes por navegação}}.
+    """
+    served = {"requests": 0, "bytes": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(images, delay_ms / 1000, served))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    modes = {"sem bloqueio": None, "callback": legacy_blocking, "padrão de URL": pattern_blocking}
+    results = {}
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True, executable_path=executable_path)
+            for name, install in modes.items():
+                context = browser.new_context(java_script_enabled=False)
+                if install is not None:
+                    install(context)
+                page = context.new_page()
+                page.goto(url)  # aquecimento
+                served.update(requests=0, bytes=0)
+                start = time.perf_counter()
+                for _ in range(navigations):
+                    page.goto(url)
+                results[name] = {
+                    "seconds": (time.perf_counter() - start) / navigations,
+                    "requests": served["requests"] / navigations,
+                    "bytes": served["bytes"] / navigations,
+                }
+                context.close()
+            browser.close()
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--navigations", type=int, default=50, help="navegações por modo")
+    parser.add_argument("--images", type=int, default=40, help="imagens na página")
+    parser.add_argument("--delay-ms", type=float, default=20, help="latência de cada recurso")
+    parser.add_argument("--executable-path", help="Chromium/Chrome a usar no lugar do instalado pelo Playwright")
+    args = parser.parse_args()
+
+    results = run(args.navigations, args.images, args.delay_ms, args.executable_path)
+    baseline = results["callback"]["seconds"]
+    print(f"\n{args.navigations} navegações, {args.images} imagens + CSS + fonte (latência: {args.delay_ms} ms)")
+    print(f"  {'modo':<14} {'ms/navegação':>13} {'requisições':>12} {'bytes':>8}")
+    for name, r in results.items():
+        print(f"  {name:<14} {r['seconds'] * 1000:13.1f} {r['requests']:12.1f} {r['bytes']:8.0f}"
+              f"  ({baseline / r['seconds']:4.1f}x o callback)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+Benchmark de ponta a ponta da coleta contra o simulador local do Canaimé.
+
+Sobe benchmarks/fake_canaime.py em outro processo (para o servidor não
+disputar o GIL com o código medido) com ``--inmates`` presos e
+``--latency-ms`` de latência por página, aponta o aplicativo para ele
+(CANAIME_BASE_URL) e mede cada fase:
+
+  list    create_unit_list de todas as unidades (presos/s)
+  detail  get_inmate_full_info de ``--sample`` presos, um por vez (s/preso),
+          e iter_full_info de todos os presos (presos/s)
+  excel   ExcelHandler com as unidades enriquecidas: write_unit + close
+  main    main() completo (login no Chromium, coleta e planilha) em uma
+          pasta temporária
+
+As fases list/detail usam o motor ``--engine`` ('http' não precisa de
+browser; 'sync' faz login e navega no Chromium). A fase main precisa do
+Chromium do Playwright instalado.
+
+Cada execução é acrescentada a benchmarks/results.jsonl (commit, parâmetros
+e resultados) e comparada com a última execução com os mesmos parâmetros,
+para acompanhar o desempenho entre commits.
+
+Uso:
+    python -m benchmarks.bench_scraping --inmates 5000 --latency-ms 50
+    python -m benchmarks.bench_scraping --phases list detail excel --engine http
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+from benchmarks.fake_canaime import LOGIN_POST_PATH, STATS_PATH
+
+PHASES = ("list", "detail", "excel", "main")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FILENAME = os.path.join(ROOT, "benchmarks", "results.jsonl")
+
+# Credenciais aceitas pelo simulador (padrão de FakeCanaime)
+DEFAULT_USER = DEFAULT_PASSWORD = "bench"
+
+
+@contextlib.contextmanager
+def serve(args):
+    """
+    Sobe o simulador em um processo filho (porta livre) e devolve seu endereço.
+    """
+    command = [
+        sys.executable, "-m", "benchmarks.fake_canaime", "--port", "0", "--inmates", str(args.inmates),
+        "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+    ]
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        match = re.search(r"http://\S+", process.stdout.readline())
+        if match is None:
+            raise RuntimeError("O simulador do Canaimé não iniciou.")
+        yield match.group(0)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def point_to(base_url: str) -> None:
+    """
+    Aponta o aplicativo para o simulador. Os endereços são lidos por config.py
+    na importação, então isso precisa acontecer antes de importar os controllers.
+    """
+    os.environ["CANAIME_BASE_URL"] = base_url
+    os.environ["CANAIME_USER"] = DEFAULT_USER
+    os.environ["CANAIME_PASSWORD"] = DEFAULT_PASSWORD
+    if "config" in sys.modules and sys.modules["config"].canaime_base_url != base_url:
+        raise RuntimeError("config.py já foi importado com outro CANAIME_BASE_URL; rode o benchmark em um processo novo.")
+
+
+def http_login(base_url: str) -> list:
+    """
+    Envia o formulário de login do simulador e devolve os cookies da sessão
+    (no formato de BrowserContext.cookies()).
+    """
+    with requests.Session() as session:
+        session.post(base_url + LOGIN_POST_PATH, data={"usuario": DEFAULT_USER, "senha": DEFAULT_PASSWORD},
+                     timeout=30).raise_for_status()
+        return [{"name": c.name, "value": c.value, "domain": c.domain, "path": c.path} for c in session.cookies]
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """
+    Descarta a saída do aplicativo (uma linha por preso) durante a medição.
+    """
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def open_processor(base_url: str, engine: str, workers: int):
+    """
+    Processor autenticado no simulador: HttpUnitProcessor com os cookies de
+    um login via HTTP, ou UnitProcessor (Chromium) após o login pelo browser.
+    """
+    if engine == "http":
+        from controllers.http_controller import HttpUnitProcessor
+
+        processor = HttpUnitProcessor(http_login(base_url), workers=workers)
+        try:
+            yield processor
+        finally:
+            processor.close()
+        return
+
+    from playwright.sync_api import sync_playwright
+    from controllers.login_controller import CanaimeLogin
+    from controllers.unit_controller import UnitProcessor
+
+    with sync_playwright() as p:
+        login_controller = CanaimeLogin(p, headless=True, persist=False)
+        try:
+            yield UnitProcessor(login_controller.login())
+        finally:
+            login_controller.browser.close()
+
+
+def bench_list(processor, units) -> tuple:
+    """
+    Lê a lista de cada unidade, uma por vez.
+
+    Returns
+    -------
+    tuple
+        (resultado, {unidade: DataFrame})
+    """
+    start = time.perf_counter()
+    rosters = {unit: processor.create_unit_list(unit) for unit in units}
+    seconds = time.perf_counter() - start
+    inmates = sum(len(df) for df in rosters.values())
+    return {"seconds": seconds, "inmates": inmates, "inmates_per_second": inmates / seconds}, rosters
+
+
+def bench_detail(processor, rosters: dict, sample: int) -> dict:
+    """
+    Latência de get_inmate_full_info (presos um a um) e vazão de
+    iter_full_info (todos os presos, com a concorrência do processor).
+    Preenche os DataFrames de ``rosters`` com os detalhes coletados.
+    """
+    codes = [code for df in rosters.values() for code in df["Código"]][:sample]
+    start = time.perf_counter()
+    for code in codes:
+        processor.get_inmate_full_info(code)
+    serial = time.perf_counter() - start
+
+    # Só a coleta é medida: os dados vão para os DataFrames depois (em main()
+    # isso fica com o estágio de escrita, em outra thread)
+    collected = []
+    start = time.perf_counter()
+    for df in rosters.values():
+        if len(df) > 0:
+            collected.extend((df, result) for result in processor.iter_full_info(list(zip(df.index, df["Código"]))))
+    parallel = time.perf_counter() - start
+
+    inmates = len(collected)
+    failures = 0
+    for df in rosters.values():
+        if len(df) > 0:
+            processor.prepare_extra_columns(df)
+    for df, (i, code, data, ok) in collected:
+        failures += not ok
+        for col, val in data.items():
+            df.loc[i, col] = val
+    return {
+        "seconds_per_inmate": serial / max(1, len(codes)),
+        "seconds": parallel,
+        "inmates": inmates,
+        "failures": failures,
+        "inmates_per_second": inmates / parallel if parallel else 0.0,
+    }
+
+
+def bench_excel(rosters: dict) -> dict:
+    """
+    Grava as unidades enriquecidas com as opções de planilha de config.py.
+    """
+    from config import excel_streaming, excel_photo_links
+    from views.excel_view import ExcelHandler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.xlsx")
+        start = time.perf_counter()
+        handler = ExcelHandler(path, streaming=excel_streaming, photo_links=excel_photo_links)
+        for unit, df in rosters.items():
+            handler.write_unit(unit, df)
+        handler.close()
+        seconds = time.perf_counter() - start
+        return {"seconds": seconds, "bytes": os.path.getsize(path)}
+
+
+def bench_main(engine: str) -> dict:
+    """
+    Executa main() completo em uma pasta temporária (cache, diário e
+    planilha novos a cada medição).
+    """
+    import main as app
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            start = time.perf_counter()
+            app.main(engine=engine, refresh=True, sinks=["excel"], check_updates=False)
+            return {"seconds": time.perf_counter() - start}
+        finally:
+            os.chdir(cwd)
+
+
+def run(args) -> dict:
+    """
+    Sobe o simulador e mede as fases pedidas.
+
+    Returns
+    -------
+    dict
+        {fase: {medida: valor}}
+    """
+    results = {}
+    with serve(args) as base_url:
+        point_to(base_url)
+        from config import units
+
+        # A planilha usa as unidades enriquecidas pela fase detail, e esta,
+        # as listas da fase list: as fases anteriores rodam mesmo se não pedidas
+        measured = {}
+        if {"list", "detail", "excel"} & set(args.phases):
+            with quiet(not args.verbose), open_processor(base_url, args.engine, args.workers) as processor:
+                measured["list"], rosters = bench_list(processor, units)
+                if {"detail", "excel"} & set(args.phases):
+                    measured["detail"] = bench_detail(processor, rosters, args.sample)
+            if "excel" in args.phases:
+                with quiet(not args.verbose):
+                    measured["excel"] = bench_excel(rosters)
+        results.update((phase, measured[phase]) for phase in args.phases if phase in measured)
+        if "main" in args.phases:
+            with quiet(not args.verbose):
+                results["main"] = bench_main(args.engine)
+        results["requests"] = requests.get(base_url + STATS_PATH, timeout=30).json()
+    return results
+
+
+def git_revision() -> str:
+    """
+    Commit atual (com "+" se há alterações não commitadas), ou "?" fora do git.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "?"
+    return commit + ("+" if dirty else "")
+
+
+def load_results(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record(path: str, params: dict, results: dict) -> None:
+    entry = {"commit": git_revision(), "date": time.strftime("%Y-%m-%d %H:%M:%S"), "params": params,
+             "results": results}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def report(results: dict, previous: dict = None) -> None:
+    """
+    Exibe os resultados e, se houver, a variação em relação à execução anterior.
+    """
+    before = previous["results"] if previous else {}
+    for phase in PHASES:
+        if phase not in results:
+            continue
+        print(f"  {phase}")
+        for name, value in results[phase].items():
+            line = f"    {name:<20} {value:12.4f}" if isinstance(value, float) else f"    {name:<20} {value:>12}"
+            old = before.get(phase, {}).get(name)
+            if isinstance(value, (int, float)) and old:
+                line += f"  ({(value - old) / old:+.1%} vs {previous['commit']})"
+            print(line)
+    print(f"  requisições ao simulador: {results.get('requests', {})}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inmates", type=int, default=1000, help="total de presos no simulador")
+    parser.add_argument("--latency-ms", type=float, default=20, help="latência artificial de cada página (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="variação aleatória somada à latência (ms)")
+    parser.add_argument("--engine", choices=("http", "sync"), default="http",
+                        help="motor das fases list/detail (a fase main usa o mesmo)")
+    parser.add_argument("--workers", type=int, default=4, help="presos simultâneos no motor http")
+    parser.add_argument("--sample", type=int, default=50, help="presos da medição um a um da fase detail")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=["list", "detail", "excel"],
+                        help="fases a medir (main precisa do Chromium)")
+    parser.add_argument("--results", default=RESULTS_FILENAME, help="arquivo de histórico (JSON Lines)")
+    parser.add_argument("--no-record", action="store_true", help="não grava a execução no histórico")
+    parser.add_argument("--verbose", action="store_true", help="mostra a saída do aplicativo")
+    args = parser.parse_args()
+
+    params = {key: getattr(args, key) for key in ("inmates", "latency_ms", "jitter_ms", "engine", "workers", "sample")}
+    previous = [entry for entry in load_results(args.results) if entry["params"] == params]
+    results = run(args)
+
+    print(f"\nColeta contra o simulador: {args.inmates} presos, {args.latency_ms:g} ms por página, "
+          f"motor {args.engine}")
+    report(results, previous[-1] if previous else None)
+    if not args.no_record:
+        record(args.results, params, results)
+
+
+if __name__ == "__main__":
+    main()
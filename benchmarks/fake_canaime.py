@@ -0,0 +1,427 @@
+"""
+Simulador local do Canaimé para benchmarks (e testes) sem acessar produção.
+
+Serve, nos mesmos caminhos do sistema real, o formulário de login, as páginas
+de chamada (uma por unidade) e as páginas de cadastro, informes e certidão de
+cada preso, com a estrutura HTML esperada pelos seletores de FIELDS_BY_PAGE.
+Os presos são sintéticos e determinísticos (mesmos códigos a cada execução)
+e distribuídos entre as unidades. Cada tipo de página pode ter uma latência
+artificial (mais uma variação aleatória), e a sessão pode expirar depois de
+alguns segundos, para exercitar o novo login.
+
+Para apontar o aplicativo para o simulador, defina CANAIME_BASE_URL antes de
+importar config.py (ver benchmarks/bench_scraping.py).
+
+Uso:
+    python -m benchmarks.fake_canaime --inmates 5000 --latency-ms 80 --port 8765
+"""
+
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Caminhos do sistema real (os mesmos de config.py, sem o endereço)
+LOGIN_PATH = "/sgp2rr/login/login_principal.php"
+LOGIN_POST_PATH = "/sgp2rr/login/valida_login.php"
+HOME_PATH = "/sgp2rr/areas/principal.php"
+PAGE_PATHS = {
+    "CALL": "/sgp2rr/areas/impressoes/UND_ChamadaFOTOS_todos2.php",
+    "MAIN": "/sgp2rr/areas/unidades/cadastro.php",
+    "REPORTS": "/sgp2rr/areas/unidades/Informes_LER.php",
+    "CERTIDAO": "/sgp2rr/areas/impressoes/UND_CertidaoCarceraria.php",
+}
+PHOTOS_PATH = "/sgp2rr/fotos/presos/"
+# Contagem de requisições por tipo de página (JSON), fora do sistema real
+STATS_PATH = "/__stats"
+
+# As mesmas unidades de config.units
+DEFAULT_UNITS = ('PAMC', 'CPBV', 'CPFBV', 'CPP', 'CABV', 'UPRRO', 'CME', 'DICAP')
+SESSION_COOKIE = "PHPSESSID"
+
+# Linhas com dados em cada página de detalhe (número da <tr> -> rótulo), nas
+# posições lidas pelos seletores tr:nth-child(n) de FIELDS_BY_PAGE
+MAIN_ROWS = {3: "Mãe", 4: "Pai", 8: "Cidade Origem", 9: "Estado", 10: "País", 25: "Endereço"}
+REPORTS_ROWS = {4: "Escolaridade", 8: "Religião", 11: "Profissão", 25: "Modus Operandi"}
+
+# Menor GIF válido (1x1), devolvido para qualquer foto
+PHOTO_BYTES = (b"GIF89a\x01\x00\x01\x00\x80\x00\x00\x00\x00\x00\xff\xff\xff!\xf9\x04\x01\x00\x00\x00\x00"
+               b",\x00\x00\x00\x00\x01\x00\x01\x00\x00\x02\x02D\x01\x00;")
+
+
+class FakeCanaime:
+    """
+    Servidor HTTP local (uma thread por conexão) que imita o Canaimé.
+
+    Methods
+    -------
+    start()
+        Sobe o servidor em uma thread.
+    stop()
+        Encerra o servidor.
+    inmates(unit)
+        Presos sintéticos de uma unidade.
+    expire_sessions()
+        Derruba todas as sessões abertas.
+    """
+
+    def __init__(
+        self,
+        inmates: int = 500,
+        units=DEFAULT_UNITS,
+        latency_ms: dict = None,
+        jitter_ms: float = 0,
+        session_ttl: float = None,
+        user: str = "bench",
+        password: str = "bench",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+    ):
+        """
+        Parameters
+        ----------
+        inmates : int, optional
+            Total de presos, distribuídos entre as unidades.
+        units : iterable of str, optional
+            Unidades servidas (DEFAULT_UNITS por padrão).
+        latency_ms : dict or float, optional
+            Latência artificial (ms) por tipo de página ('CALL', 'MAIN',
+            'REPORTS', 'CERTIDAO', 'LOGIN'), ou um único valor para todas.
+        jitter_ms : float, optional
+            Variação aleatória (0 a jitter_ms) somada a cada latência.
+        session_ttl : float, optional
+            Segundos até a sessão expirar (None: nunca expira). Páginas
+            pedidas com a sessão vencida são redirecionadas ao login.
+        user, password : str, optional
+            Credenciais aceitas pelo formulário de login.
+        host, port : optional
+            Endereço do servidor (porta 0: escolhida pelo sistema).
+        seed : int, optional
+            Semente do gerador da variação de latência.
+        """
+        self.units = tuple(units)
+        if not isinstance(latency_ms, dict):
+            latency_ms = dict.fromkeys(("LOGIN",) + tuple(PAGE_PATHS), latency_ms or 0)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.session_ttl = session_ttl
+        self.user = user
+        self.password = password
+        self.requests = {}  # {tipo de página: requisições atendidas}
+        self._sessions = {}  # {token: instante do login}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+
+        # Códigos sequenciais, unidade a unidade (o resto da divisão vai para a primeira)
+        per_unit, rest = divmod(max(0, int(inmates)), len(self.units))
+        self._rosters = {}
+        self._unit_of = {}
+        next_code = 100000
+        for n, unit in enumerate(self.units):
+            count = per_unit + (rest if n == 0 else 0)
+            self._rosters[unit] = [str(code) for code in range(next_code, next_code + count)]
+            for code in self._rosters[unit]:
+                self._unit_of[code] = unit
+            next_code += count
+
+        handler = type("Handler", (_Handler,), {"fake": self})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-canaime", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def inmates(self, unit: str) -> list:
+        """
+        Códigos dos presos da unidade.
+        """
+        return list(self._rosters.get(unit, ()))
+
+    def expire_sessions(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def login(self, user: str, password: str):
+        """
+        Abre uma sessão se as credenciais conferem.
+
+        Returns
+        -------
+        str or None
+            Token da sessão (cookie PHPSESSID).
+        """
+        if (user, password) != (self.user, self.password):
+            return None
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._sessions[token] = time.monotonic()
+        return token
+
+    def session_valid(self, token: str) -> bool:
+        with self._lock:
+            opened = self._sessions.get(token)
+        if opened is None:
+            return False
+        return self.session_ttl is None or time.monotonic() - opened < self.session_ttl
+
+    def stats(self) -> dict:
+        """
+        Requisições atendidas, por tipo de página.
+        """
+        with self._lock:
+            return dict(self.requests)
+
+    def count(self, page_type: str) -> None:
+        with self._lock:
+            self.requests[page_type] = self.requests.get(page_type, 0) + 1
+
+    def delay(self, page_type: str) -> None:
+        """
+        Espera a latência configurada do tipo de página.
+        """
+        ms = self.latency_ms.get(page_type, 0)
+        if self.jitter_ms:
+            with self._lock:
+                ms += self._random.uniform(0, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    # --- Páginas -------------------------------------------------------------
+
+    def login_html(self, error: bool = False) -> str:
+        message = '<p class="erro">Usuário ou senha inválidos</p>' if error else ''
+        return _document("Login", f"""{message}
+<form method="post" action="{LOGIN_POST_PATH}">
+  <input type="text" name="usuario">
+  <input type="password" name="senha">
+  <input type="submit" value="Entrar">
+</form>""")
+
+    def home_html(self) -> str:
+        menu = "".join(f'<img src="../imagens/menu{n}.gif">' for n in range(6))
+        return _document("Principal", f'<div class="menu">{menu}</div>')
+
+    def call_html(self, unit: str):
+        """
+        Página de chamada (None se a unidade não existe). Cada entrada tem o
+        formato lido por parse_roster_entry, seguida da foto do preso.
+        """
+        codes = self._rosters.get(unit)
+        if codes is None:
+            return None
+        cells = []
+        for n, code in enumerate(codes):
+            wing, cell = f"{'ABCDEFGHI'[n % 9]}{n % 3 + 1}", f"{n % 40:02d}"
+            if unit in ('CME', 'DICAP'):
+                wing, cell = cell, wing
+            cells.append(
+                f'<td><img src="../../fotos/presos/{code}.jpg" width="90"></td>\n'
+                f'<td class="titulobkSingCAPS">GS{code}\n'
+                f'      <span class="titulo12bk"> PRESO SINTETICO {code} </span>\n\n\n'
+                f'      ALA: {wing} / {cell}</td>'
+            )
+        rows = "\n".join(f"<tr>{c}</tr>" for c in cells)
+        return _document(f"Chamada {unit}", f"<table>\n{rows}\n</table>")
+
+    def detail_html(self, page_type: str, code: str):
+        """
+        Página de detalhe (MAIN, REPORTS ou CERTIDAO) do preso, ou None se o
+        código não existe.
+        """
+        if code not in self._unit_of:
+            return None
+        return {"MAIN": self.main_html, "REPORTS": self.reports_html, "CERTIDAO": self.certidao_html}[page_type](code)
+
+    def main_html(self, code: str) -> str:
+        rows = []
+        for n in range(1, 26):
+            if n == 5:
+                rows.append('<td class="titulo12bk">Sexo</td><td class="titulobk">MASCULINO</td>'
+                            f'<td class="titulo12bk">Nascimento</td><td class="titulobk">{_birth_date(code)}</td>')
+            elif n in MAIN_ROWS:
+                rows.append(_field(MAIN_ROWS[n], f"{MAIN_ROWS[n].upper()} DO PRESO {code}"))
+            else:
+                rows.append(_field(f"Campo {n}", f"VALOR {n}"))
+        return _document("Cadastro", _table(rows))
+
+    def reports_html(self, code: str) -> str:
+        rows = []
+        for n in range(1, 26):
+            if n == 3:
+                rows.append('<td class="titulo12bk">Estado Civil</td><td class="titulobk">SOLTEIRO</td>'
+                            '<td class="titulo12bk">Filhos</td>')
+            elif n == 6:
+                # Três células de dados seguidas: a terceira é a quantidade de filhos
+                rows.append('<td class="titulobk">SIM</td><td class="titulobk">COM</td>'
+                            f'<td class="titulobk">{int(code) % 5}</td>')
+            elif n == 16:
+                rows.append('<td class="titulo12bk">Cor</td><td class="titulobk">PARDA</td>')
+            elif n == 19:
+                rows.append('<td class="tituloVerde">Altura: <span class="titulobk">'
+                            f'1,{60 + int(code) % 30}</span></td>')
+            elif n in REPORTS_ROWS:
+                rows.append(_field(REPORTS_ROWS[n], f"{REPORTS_ROWS[n].upper()} DO PRESO {code}"))
+            else:
+                rows.append(f'<td class="titulo12bk">Campo {n}</td><td>-</td>')
+        return _document("Informes", _table(rows))
+
+    def certidao_html(self, code: str) -> str:
+        days = 365 + int(code) % 3000
+        return _document("Certidão", f"""<p>CERTIDÃO CARCERÁRIA</p>
+<table><tr><td class="titulobk">PRESO SINTETICO {code}</td><td class="titulobk">{days} dias</td></tr></table>""")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Atende as requisições do FakeCanaime (atributo de classe ``fake``).
+    """
+
+    fake = None
+    protocol_version = "HTTP/1.1"  # keep-alive, como o servidor real
+    # Cabeçalho e corpo saem em escritas separadas: sem TCP_NODELAY, o
+    # algoritmo de Nagle + ACK atrasado somaria ~40 ms a cada resposta
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass  # sem uma linha no terminal por requisição
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        if url.path == LOGIN_PATH:
+            self.fake.count("LOGIN")
+            return self._send(200, self.fake.login_html())
+        if url.path == STATS_PATH:
+            return self._send(200, json.dumps(self.fake.stats()), "application/json")
+        if url.path.startswith(PHOTOS_PATH):
+            return self._send(200, PHOTO_BYTES, "image/gif")
+        if not self.fake.session_valid(self._session_token()):
+            return self._redirect(LOGIN_PATH)
+        if url.path == HOME_PATH:
+            return self._send(200, self.fake.home_html())
+
+        for page_type, path in PAGE_PATHS.items():
+            if url.path == path:
+                break
+        else:
+            return self._send(404, _document("Não encontrado", ""))
+
+        self.fake.count(page_type)
+        self.fake.delay(page_type)
+        if page_type == "CALL":
+            body = self.fake.call_html(query.get("id_und_prisional", ""))
+        else:
+            body = self.fake.detail_html(page_type, query.get("id_cad_preso", ""))
+        if body is None:
+            return self._send(404, _document("Não encontrado", ""))
+        self._send(200, body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        if urlsplit(self.path).path != LOGIN_POST_PATH:
+            return self._send(404, _document("Não encontrado", ""))
+
+        self.fake.count("LOGIN")
+        self.fake.delay("LOGIN")
+        token = self.fake.login(form.get("usuario", ""), form.get("senha", ""))
+        if token is None:
+            return self._send(200, self.fake.login_html(error=True))
+        self._redirect(HOME_PATH, {"Set-Cookie": f"{SESSION_COOKIE}={token}; Path=/; HttpOnly"})
+
+    def _session_token(self):
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE:
+                return value
+        return None
+
+    def _redirect(self, location: str, headers: dict = None) -> None:
+        self._send(302, b"", headers={"Location": location, **(headers or {})})
+
+    def _send(self, status: int, body, content_type: str = "text/html; charset=utf-8", headers: dict = None):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _document(title: str, body: str) -> str:
+    return (f'<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>{title}</title></head>\n'
+            f'<body>\n{body}\n</body></html>')
+
+
+def _field(label: str, value: str) -> str:
+    return f'<td class="titulo12bk">{label}</td><td class="titulobk">{value}</td>'
+
+
+def _table(rows: list) -> str:
+    return "<table>\n" + "\n".join(f"<tr>{row}</tr>" for row in rows) + "\n</table>"
+
+
+def _birth_date(code: str) -> str:
+    n = int(code)
+    return f"{n % 28 + 1:02d}/{n % 12 + 1:02d}/{1960 + n % 45}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inmates", type=int, default=5000, help="total de presos")
+    parser.add_argument("--latency-ms", type=float, default=0, help="latência artificial de cada página (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="variação aleatória somada à latência (ms)")
+    parser.add_argument("--session-ttl", type=float, default=None, help="segundos até a sessão expirar")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    fake = FakeCanaime(
+        args.inmates, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+        session_ttl=args.session_ttl, host=args.host, port=args.port,
+    )
+    # A primeira linha é lida por benchmarks/bench_scraping.py (porta 0: escolhida pelo sistema)
+    print(f"Simulador do Canaimé em {fake.base_url} ({args.inmates} presos, usuário/senha: "
+          f"{fake.user}/{fake.password}).", flush=True)
+    print(f"Use: CANAIME_BASE_URL={fake.base_url} python main.py", flush=True)
+    fake.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
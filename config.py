@@ -1,8 +1,15 @@
-url_login_canaime = 'https://canaime.com.br/sgp2rr/login/login_principal.php'
-url_reports = "https://canaime.com.br/sgp2rr/areas/unidades/Informes_LER.php?id_cad_preso="
-url_certificate = "https://canaime.com.br/sgp2rr/areas/impressoes/UND_CertidaoCarceraria.php?id_cad_preso="
-url_call = 'https://canaime.com.br/sgp2rr/areas/impressoes/UND_ChamadaFOTOS_todos2.php?id_und_prisional='
-url_main = 'https://canaime.com.br/sgp2rr/areas/unidades/cadastro.php?id_cad_preso='
+import os
+
+# Endereço do Canaimé. CANAIME_BASE_URL aponta a coleta para outro servidor
+# (ex: o simulador local de benchmarks/fake_canaime.py)
+canaime_base_url = os.environ.get('CANAIME_BASE_URL', 'https://canaime.com.br').rstrip('/')
+
+url_login_canaime = canaime_base_url + '/sgp2rr/login/login_principal.php'
+url_reports = canaime_base_url + "/sgp2rr/areas/unidades/Informes_LER.php?id_cad_preso="
+url_certificate = canaime_base_url + "/sgp2rr/areas/impressoes/UND_CertidaoCarceraria.php?id_cad_preso="
+url_call = canaime_base_url + '/sgp2rr/areas/impressoes/UND_ChamadaFOTOS_todos2.php?id_und_prisional='
+url_main = canaime_base_url + '/sgp2rr/areas/unidades/cadastro.php?id_cad_preso='
+url_photos = canaime_base_url + '/sgp2rr/fotos/presos/'
 
 # Lista de unidades prisionais a serem processadas
 # coloque um "#" na frente da unidade para ignorar-la
@@ -22,3 +29,138 @@ current_version = 'v0.1.1'
 
 # Nome padrão do arquivo Excel de saída
 excel_filename = 'Informacoes_Presos.xlsx'
+
+# Número de páginas autenticadas usadas em paralelo para coletar os detalhes
+# dos presos. Use 1 para o modo serial (uma única página, um preso por vez).
+max_workers = 4
+
+# Motor de coleta: 'sync' (playwright.sync_api, serial ou com pool de
+# max_workers páginas), 'async' (playwright.async_api, várias navegações
+# em voo numa única thread) ou 'http' (login no browser e coleta via HTTP
+# direto com max_workers requisições simultâneas, sem Chromium).
+engine = 'sync'
+
+# Recursos que o browser não baixa (só o HTML interessa): 'image',
+# 'stylesheet', 'font', 'media' (reconhecidos pela extensão da URL) e
+# 'third_party' (hosts fora de canaime.com.br). O bloqueio é feito pelo
+# driver do Playwright, sem callback em Python para as demais requisições.
+blocked_resources = ['image', 'font', 'media']
+
+# Sessão autenticada gravada criptografada (Fernet, pacote cryptography) e
+# reaproveitada nas próximas execuções enquanto o Canaimé a aceitar e ela
+# tiver menos de session_max_age_hours. A chave vem da variável de ambiente
+# session_key_env ou do arquivo session_key_filename (criado automaticamente
+# na pasta de configuração do usuário, fora da pasta do projeto, para que a
+# chave não fique ao lado da sessão que ela decifra).
+# Para execuções agendadas, usuário e senha podem vir das variáveis
+# CANAIME_USER e CANAIME_PASSWORD (quando a sessão gravada não servir).
+persist_session = True
+session_filename = 'sessao_canaime.bin'
+# %APPDATA%\canaime no Windows; $XDG_CONFIG_HOME/canaime ou ~/.config/canaime nos demais
+user_config_dirname = os.path.join(
+    os.environ.get('APPDATA') or os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config'),
+    'canaime',
+)
+session_key_filename = os.path.join(user_config_dirname, 'sessao_canaime.key')
+session_key_env = 'CANAIME_SESSION_KEY'
+session_max_age_hours = 12
+
+# Sessão expirada no meio da execução (página redirecionada ao login ou com
+# o formulário de login): os workers param, o login é refeito uma vez e as
+# páginas afetadas são coletadas de novo; se o login falhar, a execução para. Intervalo mínimo (segundos) entre dois logins: uma
+# página que continua "expirada" logo após o novo login conta como falha.
+session_renew_interval = 60
+
+# Métricas da execução (tempo de navegação e de extração, novas tentativas e
+# falhas por tipo de página, gravação do Excel...): resumo em JSON ao final e,
+# durante a execução, arquivo no formato do Prometheus regravado a cada
+# metrics_export_interval segundos (None = não gravar)
+metrics_summary_filename = 'metricas_execucao.json'
+metrics_textfile = 'metricas_canaime.prom'
+metrics_export_interval = 15
+
+# Perfil da execução (python main.py --profile): <fase>.prof (cProfile) de cada
+# fase e stacks.folded (pilhas de todas as threads amostradas a cada
+# profile_sample_interval segundos, para flamegraph.pl/speedscope)
+profile_dirname = 'perfil_execucao'
+profile_sample_interval = 0.005
+
+# Linha do tempo por preso (python main.py --trace), no formato Chrome trace
+# event: abra em https://ui.perfetto.dev ou chrome://tracing
+trace_filename = 'linha_do_tempo.json'
+
+# Número máximo de navegações simultâneas no motor 'async'
+async_concurrency = 16
+
+# Concorrência adaptativa (AIMD): o número de páginas em voo começa em
+# min_concurrency e cresce enquanto a latência do Canaimé se mantém estável;
+# cai pela metade com erros ou lentidão. O máximo é o do motor (max_workers,
+# ou async_concurrency). max_requests_per_second é um teto fixo (None = sem teto).
+adaptive_concurrency = True
+min_concurrency = 1
+max_requests_per_second = 10
+
+# Prazo (segundos) de cada navegação/requisição, por tipo de página. Uma
+# página que passa do prazo conta como falha e é tentada de novo.
+page_timeouts = {
+    'LOGIN': 60,
+    'CALL': 180,     # página de chamada com fotos: pesada
+    'MAIN': 30,
+    'REPORTS': 30,
+    'CERTIDAO': 30,
+}
+
+# Novas tentativas de cada página com falha, com espera exponencial
+# (retry_backoff_seconds, 2x, 4x...) e jitter
+page_retries = 3
+retry_backoff_seconds = 1.0
+
+# Hedging (motores 'http' e 'async'): uma página que demora mais que o p95
+# recente do seu tipo é pedida de novo em paralelo e vale a primeira resposta
+hedge_requests = False
+
+# Presos que continuaram incompletos após as novas tentativas. Para coletar
+# só eles (e os presos novos): "python main.py --retry-failed"
+failed_codes_filename = 'presos_com_falha.csv'
+
+# Tamanho da fila entre a coleta e o estágio de escrita (DataFrame, diário,
+# progresso, planilha): com a fila cheia, a coleta espera (memória limitada)
+writer_queue_size = 500
+
+# Cache em disco (SQLite) dos dados de detalhe de cada preso.
+# Só páginas ausentes ou vencidas são coletadas novamente; use
+# "python main.py --refresh" para ignorar o cache e coletar tudo.
+cache_filename = 'cache_presos.sqlite'
+
+# Validade do cache, em dias, por tipo de página (0 = não usar o cache)
+cache_ttl_days = {
+    'MAIN': 30,      # Mãe, Pai, Data Nasc., Cidade Origem... quase nunca mudam
+    'REPORTS': 7,
+    'CERTIDAO': 1,   # Sentença muda com mais frequência
+}
+
+# Relatório de movimentações do modo delta ("python main.py --delta"):
+# entradas, transferências, mudanças de cela e saídas desde a execução anterior
+delta_report_filename = 'Movimentacoes_Presos.csv'
+
+# Diário (um registro por preso) da execução em andamento. Se o processo cair,
+# "python main.py --resume" continua de onde parou. Apagado ao concluir.
+journal_filename = 'execucao_em_andamento.jsonl'
+
+# Excel em modo streaming (openpyxl write-only): memória constante e arquivo
+# gravado uma única vez no final, em vez de regravar a planilha inteira a cada
+# unidade. Se o processo cair, os dados continuam no diário (--resume).
+excel_streaming = False
+
+# Link da foto na planilha: 'comment' (hyperlink + comentário com a URL em cada
+# célula) ou 'formula' (=HYPERLINK, sem comentários, estilos compartilhados):
+# arquivo menor e gravação/abertura mais rápidas.
+excel_photo_links = 'comment'
+
+# Destinos de saída de cada execução (um ou mais): 'excel', 'parquet',
+# 'csv' e 'sqlite'. Parquet requer o pacote pyarrow e é o formato mais rápido
+# para carregar nas análises (pd.read_parquet).
+output_sinks = ['excel']
+csv_filename = 'Informacoes_Presos.csv'
+parquet_filename = 'Informacoes_Presos.parquet'
+sqlite_filename = 'Informacoes_Presos.sqlite'
@@ -0,0 +1,372 @@
+import asyncio
+import time
+import pandas as pd
+from playwright.async_api import BrowserContext, Page
+from controllers.unit_controller import (
+    URL_CALL,
+    URL_BY_PAGE,
+    FIELDS_BY_PAGE,
+    ROSTER_JS,
+    EXTRACTION_PLANS,
+    EXTRACT_FIELDS_JS,
+    UnitProcessor,
+    SessionExpiredError,
+    check_session,
+    count_retry,
+    timed_stage,
+    PartialInfoError,
+    build_roster,
+    apply_extraction_plan,
+    has_scraped_values,
+)
+from controllers.login_controller import LOGIN_FORM_SELECTOR, is_login_url
+from utils.logger import Logger
+from utils.metrics import metrics
+from utils.resilience import LatencyTracker, aretry_call
+from utils.resource_blocking import ablock_resources
+from config import hedge_requests
+
+
+async def open_context(p, storage_state: dict, headless: bool = True) -> BrowserContext:
+    """
+    Abre browser + contexto (assíncronos) reaproveitando a sessão já logada.
+
+    Parameters
+    ----------
+    p : Playwright (async_api)
+        Instância assíncrona do Playwright.
+    storage_state : dict
+        Estado da sessão autenticada (ver CanaimeLogin.storage_state()).
+    headless : bool, optional
+        Se True, executa o browser em modo headless (padrão).
+
+    Returns
+    -------
+    BrowserContext
+    """
+    browser = await p.chromium.launch(headless=headless)
+    context = await browser.new_context(storage_state=storage_state, java_script_enabled=False)
+    await context.set_extra_http_headers({
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+    })
+    await ablock_resources(context)
+    return context
+
+
+class AsyncUnitProcessor:
+    """
+    Versão assíncrona do UnitProcessor (playwright.async_api).
+
+    Mesmo contrato de create_unit_list, get_inmate_full_info e _scrape_page,
+    mas como corrotinas. Cada navegação usa uma página livre do contexto e
+    o número de navegações em andamento é limitado por um asyncio.Semaphore,
+    permitindo manter muitas requisições em voo em uma única thread.
+    """
+
+    # Reaproveita a lógica síncrona (não acessa a página)
+    prepare_extra_columns = UnitProcessor.prepare_extra_columns
+
+    # Prazos e novas tentativas: os mesmos do UnitProcessor (config.py)
+    timeouts = UnitProcessor.timeouts
+    retries = UnitProcessor.retries
+    backoff = UnitProcessor.backoff
+    hedge = hedge_requests
+
+    def __init__(
+        self, context: BrowserContext, concurrency: int = 16, cache=None, limiter=None, session_guard=None,
+    ):
+        """
+        Parameters
+        ----------
+        context : BrowserContext (async_api)
+            Contexto já autenticado no sistema.
+        concurrency : int, optional
+            Número máximo de navegações simultâneas.
+        cache : DetailCache, optional
+            Cache em disco dos dados de detalhe.
+        limiter : AsyncAdaptiveLimiter, optional
+            Limite adaptativo (abaixo de ``concurrency``) das páginas de
+            detalhe em voo, guiado pela latência e pelos erros.
+        session_guard : SessionGuard, optional
+            Renovação da sessão quando ela expira (ver UnitProcessor). O login
+            é refeito em uma thread, sem bloquear o event loop.
+        """
+        self.context = context
+        self.cache = cache
+        self.limiter = limiter
+        self.session_guard = session_guard
+        self._session_generation = 0
+        self.latencies = LatencyTracker()
+        self.semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+        self._free_pages = []
+
+    async def _acquire_page(self) -> Page:
+        """
+        Pega uma página livre (ou abre uma nova). Como só é chamado dentro
+        do semáforo, nunca há mais páginas abertas que o limite de concorrência.
+        """
+        if self._free_pages:
+            return self._free_pages.pop()
+        return await self.context.new_page()
+
+    def _release_page(self, page: Page) -> None:
+        self._free_pages.append(page)
+
+    async def close(self) -> None:
+        """
+        Fecha o contexto e o browser associados.
+        """
+        browser = self.context.browser
+        await self.context.close()
+        if browser is not None:
+            await browser.close()
+
+    async def create_unit_list(self, unit: str) -> pd.DataFrame:
+        """
+        Acessa a página de chamada (URL_CALL + unit), coleta a lista de presos,
+        retornando um DataFrame com colunas:
+        ['Ala', 'Cela', 'Código', 'Foto', 'Preso'].
+
+        Parameters
+        ----------
+        unit : str
+            Ex: 'PAMC', 'CPBV', etc.
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        return await aretry_call(
+            lambda: self._in_session(self._load_unit_list, unit), self.retries, self.backoff,
+            on_retry=lambda: count_retry("CALL"),
+        )
+
+    async def _load_unit_list(self, unit: str) -> pd.DataFrame:
+        """
+        Uma tentativa de leitura da página de chamada.
+        """
+        async with self.semaphore:
+            page = await self._acquire_page()
+            try:
+                with timed_stage("navigation", "CALL", unit):
+                    await page.goto(URL_CALL + unit, timeout=self.timeouts["CALL"] * 1000)
+                with timed_stage("extraction", "CALL", unit):
+                    raw = await page.evaluate(ROSTER_JS, LOGIN_FORM_SELECTOR)
+                url = page.url
+            finally:
+                self._release_page(page)
+
+        if raw.get("login") or is_login_url(url):
+            raise SessionExpiredError(f"Sessão expirada ao abrir a lista da unidade {unit}")
+        return build_roster(unit, raw["entries"], raw["names"], raw["srcs"])
+
+    async def iter_unit_lists(self, units):
+        """
+        Lê as listas de todas as unidades concorrentemente (limitadas pelo
+        semáforo), devolvendo cada uma assim que fica pronta.
+
+        Yields
+        ------
+        tuple
+            (unit, df, ok), na ordem de conclusão.
+        """
+        async def read(unit):
+            try:
+                return unit, await self.create_unit_list(unit), True
+            except Exception as e:
+                Logger.capture_error(e)
+                return unit, None, False
+
+        tasks = [asyncio.ensure_future(read(unit)) for unit in units]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_inmate_full_info(self, code: str) -> dict:
+        """
+        Coleta as informações completas de 1 detento (MAIN, REPORTS, CERTIDAO),
+        retornando um dicionário {coluna: valor_coletado}.
+
+        Parameters
+        ----------
+        code : str
+            Código do preso, ex: "123456"
+
+        Returns
+        -------
+        dict
+        """
+        # As três páginas são independentes: navegam em paralelo (cada uma em
+        # uma página do contexto, dentro do semáforo) e o resultado é juntado
+        # na ordem de FIELDS_BY_PAGE
+        page_types = list(FIELDS_BY_PAGE)
+        results = await asyncio.gather(
+            *(self._get_page_data(code, page_type) for page_type in page_types),
+            return_exceptions=True
+        )
+
+        all_data = {}
+        failed = []
+        for page_type, data in zip(page_types, results):
+            if isinstance(data, BaseException):
+                Logger.capture_error(data)
+                metrics.inc("canaime_page_failures_total", page_type=page_type)
+                failed.append(page_type)
+                continue
+            all_data.update(data)
+
+        if failed:
+            raise PartialInfoError(code, all_data, failed)
+        return all_data
+
+    async def _get_page_data(self, code: str, page_type: str) -> dict:
+        """
+        Retorna os dados de uma página do preso: do cache, se válidos,
+        ou coletados via _scrape_page (e então gravados no cache).
+        """
+        if self.cache is not None:
+            cached = self.cache.get(code, page_type)
+            if cached is not None:
+                metrics.inc("canaime_cache_hits_total", page_type=page_type)
+                return cached
+
+        data = await aretry_call(
+            lambda: self._in_session(self._fetch_page, code, page_type), self.retries, self.backoff,
+            on_retry=lambda: count_retry(page_type),
+        )
+        if self.cache is not None and has_scraped_values(page_type, data):
+            self.cache.put(code, page_type, data)
+        return data
+
+    async def _in_session(self, func, *args):
+        """
+        Mesmo que UnitProcessor._in_session: a espera e o novo login rodam em
+        threads (asyncio.to_thread) e os cookies novos valem para o contexto todo.
+        """
+        guard = self.session_guard
+        if guard is None:
+            return await func(*args)
+        guard.check()
+        if not guard.ready.is_set():
+            await asyncio.to_thread(guard.wait_ready)
+        try:
+            return await func(*args)
+        except SessionExpiredError:
+            generation = await asyncio.to_thread(guard.renew, self._session_generation)
+            if generation != self._session_generation:
+                self._session_generation = generation
+                await self.context.add_cookies(guard.state["cookies"])
+            return await func(*args)
+
+    async def iter_full_info(self, items):
+        """
+        Coleta as informações completas de vários detentos, mantendo até
+        ``concurrency`` navegações em voo.
+
+        Parameters
+        ----------
+        items : iterable of (index, code)
+            Pares (índice da linha no DataFrame, código do preso).
+
+        Yields
+        ------
+        tuple
+            (index, code, dados, ok), na ordem de conclusão.
+        """
+        async def fetch(index, code):
+            try:
+                return index, code, await self.get_inmate_full_info(code), True
+            except PartialInfoError as e:
+                return index, code, e.data, False
+            except Exception as e:
+                Logger.capture_error(e)
+                return index, code, {}, False
+
+        tasks = [asyncio.ensure_future(fetch(index, code)) for index, code in items]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _fetch_page(self, code: str, page_type: str) -> dict:
+        """
+        Uma tentativa de coleta da página. Com hedging (config.hedge_requests),
+        se a navegação passar do p95 recente daquele tipo de página, uma
+        segunda navegação igual é disparada e vale a primeira que terminar.
+        """
+        threshold = self.latencies.p95(page_type) if self.hedge else None
+        if threshold is None:
+            return await self._timed_fetch(code, page_type)
+
+        tasks = [asyncio.ensure_future(self._timed_fetch(code, page_type))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=threshold)
+            if done:
+                return tasks[0].result()
+
+            tasks.append(asyncio.ensure_future(self._timed_fetch(code, page_type)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _timed_fetch(self, code: str, page_type: str) -> dict:
+        """
+        Coleta a página (dentro do limite adaptativo, se houver) e registra a latência.
+        """
+        start = time.monotonic()
+        if self.limiter is None:
+            data = await self._scrape_page(code, page_type)
+        else:
+            async with self.limiter.slot():
+                data = await self._scrape_page(code, page_type)
+        self.latencies.record(page_type, time.monotonic() - start)
+        return data
+
+    async def _scrape_page(self, code: str, page_type: str) -> dict:
+        """
+        Acessa a página correspondente (MAIN, REPORTS, CERTIDAO) e coleta
+        todos os campos de FIELDS_BY_PAGE[page_type] em uma única chamada
+        (ou o 'default').
+
+        Parameters
+        ----------
+        code : str
+            Código do preso (ex: "123456")
+        page_type : str
+            'MAIN', 'REPORTS' ou 'CERTIDAO'
+
+        Returns
+        -------
+        dict
+            {nome_coluna: valor_coletado}
+        """
+        if page_type not in URL_BY_PAGE:
+            return {}
+
+        plan = EXTRACTION_PLANS[page_type]
+        async with self.semaphore:
+            page = await self._acquire_page()
+            try:
+                with timed_stage("navigation", page_type, code):
+                    await page.goto(f"{URL_BY_PAGE[page_type]}{code}", timeout=self.timeouts[page_type] * 1000)
+                with timed_stage("extraction", page_type, code):
+                    texts_per_field = await page.evaluate(EXTRACT_FIELDS_JS, plan["selectors"])
+                url = page.url
+            finally:
+                self._release_page(page)
+
+        return apply_extraction_plan(plan, check_session(page_type, url, texts_per_field))
@@ -0,0 +1,301 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import html
+from lxml.cssselect import CSSSelector
+
+from controllers.unit_controller import (
+    URL_CALL,
+    URL_BY_PAGE,
+    FIELDS_BY_PAGE,
+    EXTRACTION_PLANS,
+    UnitProcessor,
+    PartialInfoError,
+    SessionExpiredError,
+    build_roster,
+    apply_extraction_plan,
+    check_session,
+    timed_stage,
+)
+from controllers.login_controller import LOGIN_FORM_SELECTOR, is_login_url
+from utils.logger import Logger
+from utils.metrics import metrics
+from utils.resilience import LatencyTracker
+from config import hedge_requests
+
+# Seletores CSS compilados uma única vez (mesmos de FIELDS_BY_PAGE)
+_SELECTORS = {}
+
+
+def parse_document(response):
+    """
+    Árvore HTML (lxml) da resposta.
+    """
+    # Sem charset no cabeçalho, deixa o lxml usar o <meta charset> da página
+    if "charset" in response.headers.get("Content-Type", "").lower():
+        return html.document_fromstring(response.text)
+    return html.document_fromstring(response.content)
+
+
+def css(selector: str) -> CSSSelector:
+    """
+    Retorna o seletor CSS (lxml) compilado, reaproveitando o cache.
+    """
+    compiled = _SELECTORS.get(selector)
+    if compiled is None:
+        compiled = _SELECTORS[selector] = CSSSelector(selector)
+    return compiled
+
+
+class HttpUnitProcessor(UnitProcessor):
+    """
+    UnitProcessor sem browser: as páginas do Canaimé são PHP renderizado no
+    servidor (o browser já roda com JavaScript desativado), então basta uma
+    requisição HTTP por página, reaproveitando os cookies da sessão logada
+    no Playwright, e um parser HTML (lxml) com os mesmos seletores de
+    FIELDS_BY_PAGE.
+
+    A sessão HTTP mantém conexões keep-alive em um pool do tamanho do número
+    de requisições simultâneas, e iter_full_info distribui os presos entre
+    threads; as páginas de cada preso (MAIN, REPORTS, CERTIDAO) são baixadas
+    em paralelo.
+    """
+
+    hedge = hedge_requests
+
+    def __init__(
+        self, cookies: list, workers: int = 4, timeout: float = None, cache=None, limiter=None, session_guard=None,
+    ):
+        """
+        Parameters
+        ----------
+        cookies : list
+            Cookies da sessão autenticada (ver BrowserContext.cookies()).
+        workers : int, optional
+            Número de presos coletados simultaneamente em iter_full_info (cada
+            um com suas páginas em paralelo).
+        timeout : float, optional
+            Se informado, prazo (segundos) de todas as requisições, no lugar
+            dos prazos por tipo de página (``timeouts``).
+        cache : DetailCache, optional
+            Cache em disco dos dados de detalhe.
+        limiter : AdaptiveLimiter, optional
+            Limite adaptativo de requisições em voo (ver UnitProcessor).
+        session_guard : SessionGuard, optional
+            Renovação da sessão quando ela expira (ver UnitProcessor).
+        """
+        super().__init__(page=None, cache=cache, limiter=limiter, session_guard=session_guard)
+        self.workers = max(1, int(workers))
+        if timeout is not None:
+            self.timeouts = dict.fromkeys(self.timeouts, timeout)
+        self.latencies = LatencyTracker()
+
+        # Cada worker pode ter as páginas de um preso em voo ao mesmo tempo
+        self._page_executor = ThreadPoolExecutor(
+            max_workers=self.workers * len(FIELDS_BY_PAGE), thread_name_prefix="http-page"
+        )
+        # Requisições com hedging rodam aqui (a original e a cópia)
+        self._hedge_executor = ThreadPoolExecutor(
+            max_workers=2 * self.workers * len(FIELDS_BY_PAGE), thread_name_prefix="http-hedge"
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers * len(FIELDS_BY_PAGE))
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        })
+        self._set_cookies(cookies)
+
+    @classmethod
+    def from_context(
+        cls, context, workers: int = 4, cache=None, limiter=None, session_guard=None,
+    ) -> "HttpUnitProcessor":
+        """
+        Cria o processor a partir do BrowserContext já logado (CanaimeLogin.context).
+        """
+        return cls(context.cookies(), workers=workers, cache=cache, limiter=limiter, session_guard=session_guard)
+
+    def _set_cookies(self, cookies: list) -> None:
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie["name"], cookie["value"],
+                domain=cookie.get("domain", ""), path=cookie.get("path", "/")
+            )
+
+    def _apply_session(self, state: dict) -> None:
+        self._set_cookies(state["cookies"])
+
+    def close(self) -> None:
+        """
+        Fecha as conexões do pool HTTP.
+        """
+        self._page_executor.shutdown(wait=False)
+        self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+    def _download(self, url: str, timeout: float, page_type: str, key: str):
+        """
+        Baixa a página (com prazo de ``timeout`` segundos) e devolve a
+        resposta. ``key`` é o Código do preso (ou a unidade), para a linha do tempo.
+        """
+        with timed_stage("navigation", page_type, key):
+            response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        if is_login_url(response.url):
+            # Sessão caiu: o Canaimé redirecionou para o login
+            raise SessionExpiredError(f"Sessão expirada ao abrir {url}")
+        return response
+
+    def _load_unit_list(self, unit: str) -> pd.DataFrame:
+        """
+        Uma tentativa de leitura da página de chamada, via HTTP.
+        """
+        response = self._download(URL_CALL + unit, self.timeouts["CALL"], "CALL", unit)
+        with timed_stage("extraction", "CALL", unit):
+            doc = parse_document(response)
+            if css(LOGIN_FORM_SELECTOR)(doc):
+                raise SessionExpiredError(f"Sessão expirada ao abrir a lista da unidade {unit}")
+            entries = [el.text_content() for el in css('.titulobkSingCAPS')(doc)]
+            names = [el.text_content() for el in css('.titulobkSingCAPS .titulo12bk')(doc)]
+            srcs = [img.get('src') for img in css('img')(doc)]
+            return build_roster(unit, entries, names, srcs)
+
+    def iter_unit_lists(self, units):
+        """
+        Lê as listas de todas as unidades em paralelo (até ``workers``
+        requisições), devolvendo cada uma assim que fica pronta.
+
+        Yields
+        ------
+        tuple
+            (unit, df, ok), na ordem de conclusão.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(self.read_unit_list, unit): unit for unit in units}
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result(), True
+                except Exception as e:
+                    Logger.capture_error(e)
+                    yield futures[future], None, False
+        finally:
+            # Consumidor parou antes do fim (erro, Ctrl+C): não espera as
+            # listas que ainda nem começaram
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_inmate_full_info(self, code: str) -> dict:
+        """
+        Mesmo contrato de UnitProcessor.get_inmate_full_info, mas com as
+        páginas do preso baixadas em paralelo: a latência por preso passa a
+        ser a da página mais lenta, não a soma das três.
+        """
+        futures = [
+            self._page_executor.submit(self._get_page_data, code, page_type)
+            for page_type in FIELDS_BY_PAGE
+        ]
+        all_data = {}
+        failed = []
+        for page_type, future in zip(FIELDS_BY_PAGE, futures):
+            try:
+                all_data.update(future.result())
+            except Exception as e:
+                Logger.capture_error(e)
+                metrics.inc("canaime_page_failures_total", page_type=page_type)
+                failed.append(page_type)
+
+        if failed:
+            raise PartialInfoError(code, all_data, failed)
+        return all_data
+
+    def iter_full_info(self, items):
+        """
+        Coleta as informações completas de vários detentos com até
+        ``workers`` requisições simultâneas.
+
+        Parameters
+        ----------
+        items : iterable of (index, code)
+            Pares (índice da linha no DataFrame, código do preso).
+
+        Yields
+        ------
+        tuple
+            (index, code, dados, ok), na ordem de conclusão.
+        """
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {
+                executor.submit(self.get_inmate_full_info, code): (index, code)
+                for index, code in items
+            }
+            for future in as_completed(futures):
+                index, code = futures[future]
+                try:
+                    yield index, code, future.result(), True
+                except PartialInfoError as e:
+                    yield index, code, e.data, False
+                except Exception as e:
+                    Logger.capture_error(e)
+                    yield index, code, {}, False
+        finally:
+            # A unidade inteira é enfileirada de uma vez: se o consumidor para
+            # antes do fim, os presos que ainda não começaram são descartados
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_page(self, code: str, page_type: str) -> dict:
+        """
+        Uma tentativa de coleta da página. Com hedging (config.hedge_requests),
+        se a resposta passar do p95 recente daquele tipo de página, uma cópia
+        da requisição é disparada e vale a primeira que responder.
+        """
+        threshold = self.latencies.p95(page_type) if self.hedge else None
+        if threshold is None:
+            return self._timed_fetch(code, page_type)
+
+        first = self._hedge_executor.submit(self._timed_fetch, code, page_type)
+        done, _ = wait([first], timeout=threshold)
+        if done:
+            return first.result()
+
+        pending = {first, self._hedge_executor.submit(self._timed_fetch, code, page_type)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _timed_fetch(self, code: str, page_type: str) -> dict:
+        """
+        Coleta a página (dentro do limite de concorrência) e registra a latência.
+        """
+        start = time.monotonic()
+        data = super()._fetch_page(code, page_type)
+        self.latencies.record(page_type, time.monotonic() - start)
+        return data
+
+    def _scrape_page(self, code: str, page_type: str) -> dict:
+        """
+        Baixa a página (MAIN, REPORTS, CERTIDAO) e coleta os campos de
+        FIELDS_BY_PAGE[page_type] com as mesmas regras do modo browser.
+        """
+        if page_type not in URL_BY_PAGE:
+            return {}
+
+        plan = EXTRACTION_PLANS[page_type]
+        url = f"{URL_BY_PAGE[page_type]}{code}"
+        response = self._download(url, self.timeouts[page_type], page_type, code)
+        with timed_stage("extraction", page_type, code):
+            doc = parse_document(response)
+            texts_per_field = [
+                [el.text_content() for el in css(selector)(doc)] for selector in plan["selectors"]
+            ]
+            return apply_extraction_plan(plan, check_session(page_type, url, texts_per_field))
@@ -1,8 +1,103 @@
+from __future__ import annotations
+
 import sys
 import os
-from playwright.sync_api import sync_playwright, Page, TimeoutError
+import threading
+from typing import TYPE_CHECKING
 from utils.logger import Logger
-from config import url_login_canaime
+from utils.resource_blocking import block_resources
+from utils.session_store import SessionStore
+from config import (
+    url_login_canaime, url_main, page_timeouts, persist_session,
+    session_filename, session_key_filename, session_key_env, session_max_age_hours,
+)
+
+if TYPE_CHECKING:
+    # O Playwright só é importado ao abrir o browser (ver main.py)
+    from playwright.sync_api import Page
+
+# Campo presente só no formulário de login (sessão ausente ou vencida)
+LOGIN_FORM_SELECTOR = 'input[name="senha"]'
+
+
+def is_login_url(url) -> bool:
+    """
+    Indica se a URL é da área de login (para onde o Canaimé redireciona
+    quando a sessão cai).
+    """
+    return '/sgp2rr/login/' in str(url)
+
+
+def is_login_page(page: Page) -> bool:
+    """
+    Indica se a página atual é o formulário de login do Canaimé.
+    """
+    return page.locator(LOGIN_FORM_SELECTOR).count() > 0
+
+
+def open_session_store():
+    """
+    Cria o SessionStore configurado, ou None (com aviso) se o pacote
+    cryptography não está instalado.
+    """
+    try:
+        return SessionStore(session_filename, session_key_filename, session_key_env, session_max_age_hours)
+    except ImportError as e:
+        print(f"{e} A sessão não será reaproveitada.")
+        return None
+
+
+def env_credentials():
+    """
+    Usuário e senha das variáveis CANAIME_USER e CANAIME_PASSWORD
+    (execuções agendadas), ou None se alguma não está definida.
+    """
+    user = os.environ.get('CANAIME_USER')
+    password = os.environ.get('CANAIME_PASSWORD')
+    if user and password:
+        return user, password
+    return None
+
+
+def read_credentials() -> tuple:
+    """
+    Usuário e senha das variáveis de ambiente (ver env_credentials) ou
+    digitados no terminal.
+    """
+    credentials = env_credentials()
+    if credentials is not None:
+        return credentials
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+
+    print('Você precisará digitar seu usuário e senha do Canaimé. Os dados não serão gravados.')
+    user = input('Digite seu login: ')
+    password = input('Digite sua senha: ')
+
+    os.system('cls' if os.name == 'nt' else 'clear')
+    return user, password
+
+
+def early_credentials(persist: bool = persist_session):
+    """
+    Usuário e senha pedidos logo na abertura do programa, antes do browser
+    (main.py importa os módulos da coleta enquanto eles são digitados).
+
+    Returns
+    -------
+    tuple or None
+        (usuário, senha), ou None se há uma sessão gravada a reaproveitar:
+        nesse caso login() só os pede se o Canaimé recusar a sessão.
+    """
+    if persist:
+        try:
+            store = SessionStore(session_filename, session_key_filename, session_key_env, session_max_age_hours)
+        except ImportError:
+            store = None  # o aviso sai em CanaimeLogin (open_session_store)
+        if store is not None and store.load() is not None:
+            return None
+    return read_credentials()
+
 
 class CanaimeLogin:
     """
@@ -10,13 +105,17 @@ class CanaimeLogin:
 
     Methods
     -------
-    __init__(p: Any, headless: bool = True)
+    __init__(p: Any, headless: bool = True, persist: bool = persist_session)
         Inicializa o handler de login com instância do Playwright.
     login() -> Page
-        Executa o login e retorna a página autenticada.
+        Reaproveita a sessão gravada ou executa o login; retorna a página autenticada.
+    storage_state() -> dict
+        Exporta cookies/armazenamento da sessão autenticada.
+    renew_session() -> dict
+        Refaz o login (sessão expirada no meio da execução).
     """
 
-    def __init__(self, p, headless: bool = True):
+    def __init__(self, p, headless: bool = True, persist: bool = persist_session, credentials: tuple = None):
         """
         Parâmetros
         ----------
@@ -24,45 +123,61 @@ class CanaimeLogin:
             Instância do Playwright.
         headless : bool, optional
             Se True, executa o browser em modo headless (padrão).
+        persist : bool, optional
+            Se True, grava a sessão criptografada e a reaproveita nas próximas
+            execuções (padrão: config.persist_session).
+        credentials : tuple, optional
+            (usuário, senha) já lidos (ver early_credentials).
         """
         self.p = p
         self.headless = headless
+        self.session_store = open_session_store() if persist else None
+        # Mantidas só em memória, para refazer o login se a sessão expirar
+        self.credentials = credentials
+        self.browser = None
+        self.context = None
         self.page = None
 
     def login(self) -> Page:
         """
-        Executa o login e retorna a página autenticada.
+        Executa o login e retorna a página autenticada. Se há uma sessão
+        gravada (config.persist_session) e o Canaimé ainda a aceita, ela é
+        reaproveitada sem pedir usuário e senha.
 
         Returns
         -------
         Page
             Página do Playwright já autenticada.
         """
-        os.system('cls' if os.name == 'nt' else 'clear')
+        self.browser = self.p.chromium.launch(headless=self.headless)
 
-        print('Você precisará digitar seu usuário e senha do Canaimé. Os dados não serão gravados.')
-        user = input('Digite seu login: ')
-        password = input('Digite sua senha: ')
+        state = self.session_store.load() if self.session_store else None
+        if state is not None:
+            self._open_context(state)
+            if self._session_is_valid():
+                print('Sessão anterior reaproveitada (login dispensado).')
+                # Sem credenciais digitadas: as do ambiente, se houver, ficam
+                # para refazer o login caso a sessão expire (renew_session)
+                if self.credentials is None:
+                    self.credentials = env_credentials()
+                return self.page
+            self.context.close()
+            self.session_store.clear()
 
-        os.system('cls' if os.name == 'nt' else 'clear')
-        browser = self.p.chromium.launch(headless=self.headless)
-        context = browser.new_context(java_script_enabled=False)
-
-        # Bloqueia carregamento de imagens para otimizar
-        context.set_extra_http_headers({
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
-        })
-        context.route("**/*", lambda route: route.abort() if route.request.resource_type == "image" else route.continue_())
-
-        self.page = context.new_page()
-        self.page.goto(url_login_canaime, timeout=0)
+        user, password = self.credentials = self._read_credentials()
+        self._open_context()
+        self.page.goto(url_login_canaime, timeout=page_timeouts['LOGIN'] * 1000)
         self.page.locator("input[name=\"usuario\"]").click()
         self.page.locator("input[name=\"usuario\"]").fill(user)
         self.page.locator("input[name=\"senha\"]").fill(password)
-        self.page.locator("input[name=\"senha\"]").press("Enter")
 
-        self.page.wait_for_timeout(5000)
         try:
+            # O formulário é enviado sem JavaScript: espera a navegação que ele
+            # dispara, em vez de um tempo fixo
+            with self.page.expect_navigation(wait_until="domcontentloaded",
+                                             timeout=page_timeouts['LOGIN'] * 1000):
+                self.page.locator("input[name=\"senha\"]").press("Enter")
+
             # Checa se logou com sucesso
             if self.page.locator('img').count() < 4:
                 print('Usuário ou senha inválidos')
@@ -73,4 +188,104 @@ class CanaimeLogin:
             Logger.capture_error(e1, self.page)
             sys.exit(1)
 
+        if self.session_store:
+            self.session_store.save(self.context.storage_state())
         return self.page
+
+    def _read_credentials(self) -> tuple:
+        """
+        Usuário e senha: os já usados nesta execução ou os de read_credentials().
+        """
+        if self.credentials is not None:
+            return self.credentials
+        return read_credentials()
+
+    def _open_context(self, storage_state: dict = None) -> None:
+        """
+        Abre o contexto (opcionalmente com uma sessão gravada) e a página.
+        """
+        self.context = self.browser.new_context(storage_state=storage_state, java_script_enabled=False)
+        self.context.set_extra_http_headers({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        })
+        # Bloqueia imagens, fontes etc. (config.blocked_resources) para otimizar
+        block_resources(self.context)
+        self.page = self.context.new_page()
+
+    def _session_is_valid(self) -> bool:
+        """
+        Abre uma página interna leve: com a sessão vencida, o Canaimé devolve o
+        formulário de login.
+        """
+        try:
+            self.page.goto(url_main, timeout=page_timeouts['LOGIN'] * 1000)
+        except Exception:
+            return False
+        return not is_login_page(self.page)
+
+    def renew_session(self) -> dict:
+        """
+        Refaz o login com as mesmas credenciais e devolve o novo storage_state
+        (também gravado no SessionStore). Usado pelo SessionGuard quando a
+        sessão expira no meio da execução.
+
+        O login roda em um browser novo, numa thread própria: quem chama pode
+        ser um worker cujo Playwright síncrono já está em uso (ou já foi
+        encerrado, no motor 'http').
+
+        Nunca pede usuário e senha no terminal (a coleta está em andamento
+        em outras threads): usa os desta execução ou os das variáveis de
+        ambiente (ver env_credentials).
+
+        Raises
+        ------
+        RuntimeError
+            Se o login não pôde ser refeito ou não há credenciais para ele.
+        """
+        credentials = self.credentials or env_credentials()
+        if credentials is None:
+            raise RuntimeError(
+                "A sessão do Canaimé expirou e não há usuário e senha para refazer o login "
+                "(a sessão gravada foi reaproveitada; defina CANAIME_USER e CANAIME_PASSWORD)."
+            )
+        print("\nSessão do Canaimé expirada: refazendo o login...", flush=True)
+        result = {}
+
+        def run():
+            try:
+                from playwright.sync_api import sync_playwright
+
+                with sync_playwright() as p:
+                    fresh = CanaimeLogin(p, headless=self.headless, persist=False)
+                    fresh.credentials = credentials
+                    fresh.login()
+                    result["state"] = fresh.storage_state()
+                    result["credentials"] = fresh.credentials
+                    fresh.browser.close()
+            except BaseException as e:  # inclui o sys.exit de login()
+                result["error"] = e
+
+        thread = threading.Thread(target=run, name="canaime-relogin")
+        thread.start()
+        thread.join()
+        if "error" in result:
+            raise RuntimeError("Não foi possível refazer o login no Canaimé.") from result["error"]
+
+        self.credentials = result["credentials"]
+        if self.session_store:
+            self.session_store.save(result["state"])
+        print("Login refeito; retomando a coleta.", flush=True)
+        return result["state"]
+
+    def storage_state(self) -> dict:
+        """
+        Exporta o estado da sessão autenticada (cookies e localStorage).
+
+        Usado para abrir outras páginas/contextos já logados sem repetir o login.
+
+        Returns
+        -------
+        dict
+            Estado no formato aceito por ``browser.new_context(storage_state=...)``.
+        """
+        return self.context.storage_state()
@@ -0,0 +1,262 @@
+import queue
+import threading
+from playwright.sync_api import sync_playwright
+from controllers.unit_controller import UnitProcessor, PartialInfoError
+from utils.logger import Logger
+from utils.resource_blocking import block_resources
+
+# Marcador para encerrar os workers
+_STOP = object()
+
+
+class PagePool:
+    """
+    Pool de páginas autenticadas para coletar vários detentos em paralelo.
+
+    A API síncrona do Playwright não pode ser usada por mais de uma thread,
+    então cada worker roda em sua própria thread, com sua própria instância
+    do Playwright e um contexto aberto a partir do ``storage_state`` da sessão
+    já logada (não há novo login). Os códigos são distribuídos por uma fila
+    comum: cada worker pega o próximo assim que termina o anterior.
+
+    Um worker cujo browser não abre sai do pool e deixa a fila para os
+    demais; se nenhum abre, start() levanta RuntimeError.
+
+    Methods
+    -------
+    start()
+        Abre os workers (browsers/páginas).
+    imap_unordered(func, items)
+        Executa func(processor, item) para cada item, na ordem de conclusão.
+    iter_unit_lists(units)
+        Mesmo contrato de UnitProcessor.iter_unit_lists, mas em paralelo.
+    iter_full_info(items)
+        Mesmo contrato de UnitProcessor.iter_full_info, mas em paralelo.
+    close()
+        Encerra os workers e fecha os browsers.
+    """
+
+    def __init__(
+        self, storage_state: dict, workers: int = 4, headless: bool = True, cache=None, limiter=None,
+        session_guard=None,
+    ):
+        """
+        Parameters
+        ----------
+        storage_state : dict
+            Estado da sessão autenticada (ver CanaimeLogin.storage_state()).
+        workers : int, optional
+            Número máximo de páginas simultâneas (limite de concorrência).
+        headless : bool, optional
+            Se True, executa os browsers em modo headless (padrão).
+        cache : DetailCache, optional
+            Cache de detalhes compartilhado pelos workers.
+        limiter : AdaptiveLimiter, optional
+            Limite adaptativo compartilhado pelos workers: com ele, nem todas
+            as páginas precisam estar em voo ao mesmo tempo.
+        session_guard : SessionGuard, optional
+            Renovação da sessão compartilhada pelos workers: quando ela expira,
+            um worker refaz o login e os demais passam a usar os cookies novos.
+        """
+        self.storage_state = storage_state
+        self.cache = cache
+        self.limiter = limiter
+        self.session_guard = session_guard
+        self.workers = max(1, int(workers))
+        self.headless = headless
+        self._tasks = queue.Queue()
+        self._threads = []
+        self._cond = threading.Condition()
+        self._reported = 0  # workers que já abriram o browser ou falharam
+        self._running = 0   # workers com browser aberto ainda consumindo a fila
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def start(self) -> None:
+        """
+        Inicia as threads dos workers (cada uma abre seu próprio browser) e
+        espera até que ao menos um browser esteja aberto.
+
+        Raises
+        ------
+        RuntimeError
+            Se nenhum worker conseguiu abrir o browser.
+        """
+        if self._threads:
+            return
+        self._drain()  # marcadores _STOP que sobraram de um close() anterior
+        self._reported = self._running = 0
+        for n in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f"page-pool-{n}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        with self._cond:
+            self._cond.wait_for(lambda: self._running > 0 or self._reported == self.workers)
+            opened = self._running > 0
+        if not opened:
+            self.close()
+            raise RuntimeError("Nenhum browser do pool de páginas abriu (detalhes em error_log.log).")
+
+    def close(self) -> None:
+        """
+        Descarta as tarefas ainda não iniciadas, sinaliza o fim para todos os
+        workers e aguarda o encerramento (só as coletas em andamento terminam).
+        """
+        self._drain()
+        for _ in self._threads:
+            self._tasks.put(_STOP)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+
+    def _drain(self) -> None:
+        """
+        Tira da fila as tarefas não iniciadas, devolvendo-as como falha (para
+        quem ainda estiver esperando o resultado).
+        """
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if task is not _STOP:
+                func, item, results = task
+                results.put((item, None, False))
+
+    def _open_processor(self, p) -> UnitProcessor:
+        """
+        Abre browser + contexto (com a sessão exportada) + página para um worker.
+        """
+        browser = p.chromium.launch(headless=self.headless)
+        context = browser.new_context(storage_state=self.storage_state, java_script_enabled=False)
+        context.set_extra_http_headers({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+        })
+        block_resources(context)
+        return UnitProcessor(
+            context.new_page(), cache=self.cache, limiter=self.limiter, session_guard=self.session_guard,
+        )
+
+    def _worker(self) -> None:
+        """
+        Loop de um worker: abre a página e consome tarefas até receber _STOP.
+        Se o browser não abrir, o worker sai sem tocar na fila.
+        """
+        opened = False
+        try:
+            with sync_playwright() as p:
+                processor = self._open_processor(p)
+                opened = True
+                with self._cond:
+                    self._reported += 1
+                    self._running += 1
+                    self._cond.notify_all()
+                self._consume(processor)
+        except Exception as e:
+            Logger.capture_error(e)
+        finally:
+            self._worker_exited(opened)
+
+    def _worker_exited(self, opened: bool) -> None:
+        """
+        Atualiza os contadores quando um worker termina. Se era o último com
+        browser aberto, as tarefas que sobraram na fila voltam como falha.
+        """
+        with self._cond:
+            if opened:
+                self._running -= 1
+            else:
+                self._reported += 1
+            if self._running == 0 and self._reported == self.workers:
+                self._drain()
+            self._cond.notify_all()
+
+    def _consume(self, processor: UnitProcessor) -> None:
+        while True:
+            task = self._tasks.get()
+            if task is _STOP:
+                return
+            func, item, results = task
+            try:
+                results.put((item, func(processor, item), True))
+            except Exception as e:
+                Logger.capture_error(e)
+                results.put((item, None, False))
+
+    def imap_unordered(self, func, items):
+        """
+        Distribui os itens entre os workers e devolve os resultados na ordem
+        em que ficam prontos.
+
+        Parameters
+        ----------
+        func : callable
+            Função ``func(processor, item)`` executada no worker, onde
+            ``processor`` é o UnitProcessor daquele worker.
+        items : iterable
+            Itens a processar.
+
+        Yields
+        ------
+        tuple
+            (item, resultado, ok) — ``ok`` é False se func levantou exceção.
+        """
+        self.start()
+        results = queue.Queue()
+        pending = 0
+        for item in items:
+            with self._cond:
+                if self._running == 0:
+                    raise RuntimeError("Todos os browsers do pool de páginas foram encerrados.")
+                self._tasks.put((func, item, results))
+            pending += 1
+        for _ in range(pending):
+            yield results.get()
+
+    def iter_unit_lists(self, units):
+        """
+        Lê as listas de presos das unidades em paralelo (uma página por
+        unidade), devolvendo cada uma assim que fica pronta.
+
+        Yields
+        ------
+        tuple
+            (unit, df, ok), na ordem de conclusão.
+        """
+        read = lambda processor, unit: processor.read_unit_list(unit)
+        for unit, df, ok in self.imap_unordered(read, units):
+            yield unit, df, ok
+
+    def iter_full_info(self, items):
+        """
+        Coleta as informações completas de vários detentos em paralelo.
+
+        Parameters
+        ----------
+        items : iterable of (index, code)
+            Pares (índice da linha no DataFrame, código do preso).
+
+        Yields
+        ------
+        tuple
+            (index, code, dados, ok), na ordem de conclusão.
+        """
+        for (index, code), result, ok in self.imap_unordered(_fetch_full_info, items):
+            data, complete = result if ok else ({}, False)
+            yield index, code, data, complete
+
+
+def _fetch_full_info(processor: UnitProcessor, item) -> tuple:
+    """
+    Tarefa do worker: (dados, completo) de um preso. Dados parciais de um
+    preso com páginas que falharam também voltam (completo = False).
+    """
+    try:
+        return processor.get_inmate_full_info(item[1]), True
+    except PartialInfoError as e:
+        return e.data, False
@@ -1,13 +1,33 @@
 import sys
+import threading
+from contextlib import contextmanager
 import pandas as pd
-from playwright.sync_api import Page, TimeoutError
+from playwright.sync_api import Page
+from controllers.login_controller import LOGIN_FORM_SELECTOR, is_login_url
 from utils.logger import Logger
+from utils.metrics import metrics
+from utils.tracing import tracer
+from utils.resilience import retry_call
+from config import (
+    page_timeouts, page_retries, retry_backoff_seconds, url_call, url_main, url_reports, url_certificate, url_photos,
+)
+
+# URLs base para cada tipo de página (config.canaime_base_url)
+URL_CALL = url_call
+URL_MAIN = url_main
+URL_REPORTS = url_reports
+URL_CERTIDAO = url_certificate
+URL_PHOTOS = url_photos
+
+# URL base de cada tipo de página de detalhe
+URL_BY_PAGE = {
+    "MAIN": URL_MAIN,
+    "REPORTS": URL_REPORTS,
+    "CERTIDAO": URL_CERTIDAO,
+}
 
-# URLs base para cada tipo de página
-URL_CALL = "https://canaime.com.br/sgp2rr/areas/impressoes/UND_ChamadaFOTOS_todos2.php?id_und_prisional="
-URL_MAIN = "https://canaime.com.br/sgp2rr/areas/unidades/cadastro.php?id_cad_preso="
-URL_REPORTS = "https://canaime.com.br/sgp2rr/areas/unidades/Informes_LER.php?id_cad_preso="
-URL_CERTIDAO = "https://canaime.com.br/sgp2rr/areas/impressoes/UND_CertidaoCarceraria.php?id_cad_preso="
+# Colunas do DataFrame devolvido por create_unit_list
+ROSTER_COLUMNS = ['Ala', 'Cela', 'Código', 'Foto', 'Preso']
 
 # Mapeamento dos novos campos. Ajuste conforme sua necessidade
 FIELDS_BY_PAGE = {
@@ -37,22 +57,304 @@ FIELDS_BY_PAGE = {
 }
 
 
+# Script executado na página: recebe a lista de seletores de um tipo de página
+# e devolve, para cada seletor, o textContent de todos os elementos encontrados.
+# Assim todos os campos da página são lidos em uma única chamada ao driver.
+EXTRACT_FIELDS_JS = """(selectors) => selectors.map(
+    (selector) => Array.from(document.querySelectorAll(selector), (el) => el.textContent || '')
+)"""
+
+
+# Script executado na página de chamada: devolve, em uma única chamada ao
+# driver, os textos das entradas, os nomes e o src de todas as imagens (e se
+# a página é o formulário de login, ou seja, se a sessão caiu).
+ROSTER_JS = """(loginSelector) => ({
+    entries: Array.from(document.querySelectorAll('.titulobkSingCAPS'), (el) => el.textContent || ''),
+    names: Array.from(document.querySelectorAll('.titulobkSingCAPS .titulo12bk'), (el) => el.textContent || ''),
+    srcs: Array.from(document.querySelectorAll('img'), (el) => el.getAttribute('src')),
+    login: document.querySelector(loginSelector) !== null,
+})"""
+
+
+def build_extraction_plans(fields_by_page: dict) -> dict:
+    """
+    Pré-compila, para cada tipo de página, as listas paralelas de colunas,
+    seletores e defaults usadas na extração em lote.
+
+    Parameters
+    ----------
+    fields_by_page : dict
+        Mapeamento no formato de FIELDS_BY_PAGE.
+
+    Returns
+    -------
+    dict
+        {page_type: {"columns": [...], "selectors": [...], "defaults": [...]}}.
+        ``selectors`` termina com LOGIN_FORM_SELECTOR, lido junto com os
+        campos para detectar a sessão expirada (ver check_session).
+    """
+    return {
+        page_type: {
+            "columns": [f["column_name"] for f in fields],
+            "selectors": [f["locator"] for f in fields] + [LOGIN_FORM_SELECTOR],
+            "defaults": [f["default"] for f in fields],
+        }
+        for page_type, fields in fields_by_page.items()
+    }
+
+
+def apply_extraction_plan(plan: dict, texts_per_field: list) -> dict:
+    """
+    Converte o resultado da extração em lote (uma lista de textos por seletor,
+    na ordem do plano) em {nome_coluna: valor}, com as regras de combine_texts.
+    """
+    return {
+        col_name: combine_texts(texts, default_val)
+        for col_name, default_val, texts in zip(plan["columns"], plan["defaults"], texts_per_field)
+    }
+
+
+def check_session(page_type: str, url: str, texts_per_field: list) -> list:
+    """
+    Confere, pela URL final e pelo formulário de login (último item de
+    ``texts_per_field``), se a página veio autenticada, e devolve os textos
+    dos campos.
+
+    Uma página autenticada sem dados (ex: preso sem informes) não é sessão
+    expirada: os campos ficam com o default.
+
+    Raises
+    ------
+    SessionExpiredError
+        Se a página foi redirecionada ao login ou mostra o formulário de login.
+    """
+    *fields, login_form = texts_per_field
+    if is_login_url(url) or login_form:
+        raise SessionExpiredError(f"Sessão expirada ao abrir a página {page_type}")
+    return fields
+
+
+@contextmanager
+def timed_stage(stage: str, page_type: str, key: str):
+    """
+    Mede uma etapa de uma página: o histograma canaime_<stage>_seconds e,
+    com a linha do tempo ligada (--trace), um trecho com o Código do preso
+    (ou a unidade, na página de chamada). A primeira navegação de um preso
+    encerra a sua espera na fila.
+
+    Parameters
+    ----------
+    stage : str
+        'navigation' ou 'extraction'.
+    page_type : str
+        'CALL', 'MAIN', 'REPORTS' ou 'CERTIDAO'.
+    key : str
+        Código do preso ou unidade.
+    """
+    if stage == "navigation":
+        tracer.dequeue(key)
+    with metrics.timer(f"canaime_{stage}_seconds", page_type=page_type), \
+            tracer.span(f"{page_type} {stage}", codigo=key):
+        yield
+
+
+def count_retry(page_type: str) -> None:
+    """
+    Conta uma nova tentativa de página (métrica canaime_page_retries_total).
+    """
+    metrics.inc("canaime_page_retries_total", page_type=page_type)
+
+
+def has_detail_values(details: dict) -> bool:
+    """
+    Indica se os dados de detalhe de um preso têm ao menos um valor coletado
+    (diferente do default), ou seja, se o enriquecimento não falhou por completo.
+    """
+    return any(
+        details.get(col, default) != default
+        for plan in EXTRACTION_PLANS.values()
+        for col, default in zip(plan["columns"], plan["defaults"])
+    )
+
+
+def has_scraped_values(page_type: str, data: dict) -> bool:
+    """
+    Indica se a coleta de uma página trouxe ao menos um valor diferente do
+    default. Páginas só com defaults (ex: sessão expirada) não vão para o cache.
+    """
+    plan = EXTRACTION_PLANS.get(page_type)
+    if plan is None or not data:
+        return False
+    return any(data.get(col) != default for col, default in zip(plan["columns"], plan["defaults"]))
+
+
+def photo_link(src: str) -> str:
+    """
+    Monta o link público da foto a partir do atributo src da imagem.
+    """
+    # Extrair o nome do arquivo da imagem (após a última barra)
+    return URL_PHOTOS + src.split('/')[-1]
+
+
+def parse_roster_entry(unit: str, entry_text: str, inmate_name: str, link_foto: str) -> list:
+    """
+    Converte o texto de uma entrada da página de chamada em uma linha
+    [Ala, Cela, Código, Foto, Preso].
+
+    Parameters
+    ----------
+    unit : str
+        Unidade (CME e DICAP têm ala/cela invertidas).
+    entry_text : str
+        Texto do elemento .titulobkSingCAPS, algo como
+        "LS123456\n      \n      \n      \nALA: A1 / 01".
+    inmate_name : str
+        Nome do preso.
+    link_foto : str
+        Link da foto ou "SEM FOTO".
+
+    Returns
+    -------
+    list
+    """
+    entry_text = entry_text.replace(" ", "").strip()
+    code, _, _, _, wing_cell = entry_text.split('\n')
+
+    # Ajuste de ala e cela
+    wing_cell = wing_cell.replace("ALA:", "")
+    split_index = wing_cell.rfind('/')
+
+    if split_index != -1:
+        if unit in ['CME', 'DICAP']:
+            # Para CME e DICAP, a cela será a parte antes da barra.
+            cell = wing_cell[:split_index].strip()
+            wing = wing_cell[split_index + 1:].strip()
+        else:
+            # Caso padrão: wing é a parte antes da barra e cell a parte após a barra.
+            wing = wing_cell[:split_index].strip()
+            cell = wing_cell[split_index + 1:].strip()
+    else:
+        wing = wing_cell.strip()
+        cell = ""
+
+    # code[2:] para remover algum prefixo (ex: "LS123456" -> "123456")
+    return [wing, cell, code[2:], link_foto, inmate_name.strip()]
+
+
+def build_roster(unit: str, entries: list, names: list, srcs: list) -> pd.DataFrame:
+    """
+    Monta o DataFrame da unidade a partir dos dados brutos da página de chamada,
+    construindo todas as linhas de uma vez.
+
+    Parameters
+    ----------
+    unit : str
+        Unidade (ex: 'PAMC').
+    entries : list of str
+        Texto de cada elemento .titulobkSingCAPS.
+    names : list of str
+        Texto de cada nome (.titulobkSingCAPS .titulo12bk).
+    srcs : list of str
+        Atributo src de cada <img> da página (None se ausente).
+
+    Returns
+    -------
+    pd.DataFrame
+        Colunas ['Ala', 'Cela', 'Código', 'Foto', 'Preso'].
+    """
+    # Uma única escrita (com a quebra de linha), pois as listas podem chegar em paralelo
+    print(f"[{unit}] Total de entradas: {len(entries)}, Total de imagens: {len(srcs)}\n", end="", flush=True)
+
+    # Criar lista de URLs de fotos; se não houver fotos suficientes, "SEM FOTO"
+    foto_urls = [photo_link(src) for src in srcs if src]
+
+    rows = []
+    for i, entry_text in enumerate(entries):
+        link_foto = foto_urls[i] if i < len(foto_urls) else "SEM FOTO"
+        rows.append(parse_roster_entry(unit, entry_text, names[i], link_foto))
+
+    return pd.DataFrame(rows, columns=ROSTER_COLUMNS)
+
+
+def combine_texts(texts: list, default: str) -> str:
+    """
+    Aplica a regra de valor de um campo: sem elementos, usa o default;
+    com um ou mais elementos, junta os textos não vazios com quebra de linha.
+    """
+    if not texts:
+        return default
+    # Pode haver múltiplos matches (ex: Endereço em 2 locators).
+    return "\n".join(t.strip() for t in texts if t.strip())
+
+
+# Planos de extração pré-compilados a partir de FIELDS_BY_PAGE
+EXTRACTION_PLANS = build_extraction_plans(FIELDS_BY_PAGE)
+
+# Todas as colunas de detalhe (MAIN, REPORTS, CERTIDAO), na ordem de FIELDS_BY_PAGE
+DETAIL_COLUMNS = [col for plan in EXTRACTION_PLANS.values() for col in plan["columns"]]
+
+
+class PartialInfoError(Exception):
+    """
+    Uma ou mais páginas do preso falharam mesmo após as novas tentativas.
+    ``data`` traz o que foi coletado das demais páginas.
+    """
+
+    def __init__(self, code: str, data: dict, page_types: list):
+        super().__init__(f"Preso {code}: falha nas páginas {', '.join(page_types)}")
+        self.code = code
+        self.data = data
+        self.page_types = page_types
+
+
+class SessionExpiredError(Exception):
+    """
+    A página foi redirecionada ao login ou veio com o formulário de login: a
+    sessão do Canaimé caiu e precisa ser renovada (ver SessionGuard).
+    """
+
+
 class UnitProcessor:
     """
     Classe responsável por:
       1) Criar uma lista de detentos (DataFrame) para determinada unidade.
       2) Enriquecer o DataFrame com campos extras, coletando informações
          de páginas distintas (MAIN, REPORTS, CERTIDAO).
+
+    Cada navegação tem prazo por tipo de página (``timeouts``, em segundos) e
+    é tentada de novo até ``retries`` vezes, com espera exponencial a partir
+    de ``backoff`` segundos (padrões em config.py). Se a página revelar que a
+    sessão caiu, o login é refeito pelo SessionGuard e a página é repetida.
     """
 
-    def __init__(self, page: Page):
+    timeouts = page_timeouts
+    retries = page_retries
+    backoff = retry_backoff_seconds
+
+    def __init__(self, page: Page, cache=None, limiter=None, session_guard=None):
         """
         Parameters
         ----------
         page : Page (Playwright)
             Página já autenticada no sistema.
+        cache : DetailCache, optional
+            Cache em disco dos dados de detalhe. Se informado, só páginas
+            ausentes ou vencidas no cache são acessadas.
+        limiter : AdaptiveLimiter, optional
+            Limite adaptativo de requisições em voo (compartilhado entre os
+            processors de um motor). Cada página de detalhe coletada ocupa
+            uma vaga e informa sua latência/erro.
+        session_guard : SessionGuard, optional
+            Renovação da sessão compartilhada entre os processors do motor.
+            Sem ele, uma sessão expirada conta como falha da página.
         """
         self.page = page
+        self.cache = cache
+        self.limiter = limiter
+        self.session_guard = session_guard
+        # Geração da sessão aplicada a esta página/contexto (ver SessionGuard)
+        self._session_generation = 0
+        self._session_lock = threading.Lock()
 
 
     def create_unit_list(self, unit: str) -> pd.DataFrame:
@@ -70,64 +372,8 @@ class UnitProcessor:
         -------
         pd.DataFrame
         """
-        df = pd.DataFrame(columns=['Ala', 'Cela', 'Código', 'Foto', 'Preso'])
         try:
-            self.page.goto(URL_CALL + unit, timeout=0)
-            all_entries = self.page.locator('.titulobkSingCAPS')
-            names = self.page.locator('.titulobkSingCAPS .titulo12bk')
-            count = all_entries.count()
-            
-            # Capturar todas as imagens da página
-            inicio = 'https://canaime.com.br/sgp2rr/fotos/presos/'
-            all_imgs = self.page.locator('img')
-            img_count = all_imgs.count()
-            print(f"Total de entradas: {count}, Total de imagens: {img_count}")
-            
-            # Criar lista de URLs de fotos
-            foto_urls = []
-            for i in range(img_count):
-                foto_src = all_imgs.nth(i).get_attribute('src')
-                if foto_src:
-                    # Extrair o nome do arquivo da imagem (após a última barra)
-                    nome_arquivo = foto_src.split('/')[-1]
-                    link_foto = inicio + nome_arquivo
-                    foto_urls.append(link_foto)
-            
-            # Se não temos fotos suficientes, preencher com "SEM FOTO"
-            while len(foto_urls) < count:
-                foto_urls.append("SEM FOTO")
-            
-            for i in range(count):
-                # entry_text contem algo como:
-                # "LS123456\n      \n      \n      \nALA: A1 / 01" (exemplo)
-                entry_text = all_entries.nth(i).text_content()
-                entry_text = entry_text.replace(" ", "").strip()
-                code, _, _, _, wing_cell = entry_text.split('\n')
-                inmate_name = names.nth(i).text_content().strip()
-                
-                # Usar a foto correspondente (se existir)
-                link_foto = foto_urls[i] if i < len(foto_urls) else "SEM FOTO"
-                
-                # Ajuste de ala e cela
-                wing_cell = wing_cell.replace("ALA:", "")
-                split_index = wing_cell.rfind('/')
-
-                if split_index != -1:
-                    if unit in ['CME', 'DICAP']:
-                        # Para CME e DICAP, a cela será a parte antes da barra.
-                        cell = wing_cell[:split_index].strip()
-                        wing = wing_cell[split_index + 1:].strip()
-                    else:
-                        # Caso padrão: wing é a parte antes da barra e cell a parte após a barra.
-                        wing = wing_cell[:split_index].strip()
-                        cell = wing_cell[split_index + 1:].strip()
-                else:
-                    wing = wing_cell.strip()
-                    cell = ""
-
-                # code[2:] para remover algum prefixo (ex: "LS123456" -> "123456")
-                df.loc[len(df)] = [wing, cell, code[2:], link_foto, inmate_name]
-
+            df = self.read_unit_list(unit)
         except Exception as e:
             Logger.capture_error(e)
             # Em caso de falha crítica, encerramos o programa.
@@ -135,6 +381,51 @@ class UnitProcessor:
 
         return df
 
+    def read_unit_list(self, unit: str) -> pd.DataFrame:
+        """
+        Mesmo que create_unit_list, mas propaga a exceção em caso de falha
+        (em vez de encerrar o programa), após as novas tentativas.
+        """
+        return retry_call(
+            lambda: self._in_session(self._load_unit_list, unit), self.retries, self.backoff,
+            on_retry=lambda: count_retry("CALL"),
+        )
+
+    def _load_unit_list(self, unit: str) -> pd.DataFrame:
+        """
+        Uma tentativa de leitura da página de chamada.
+        """
+        with timed_stage("navigation", "CALL", unit):
+            self.page.goto(URL_CALL + unit, timeout=self.timeouts["CALL"] * 1000)
+
+        # Entradas, nomes e fotos em uma única chamada ao driver
+        with timed_stage("extraction", "CALL", unit):
+            raw = self.page.evaluate(ROSTER_JS, LOGIN_FORM_SELECTOR)
+            if raw.get("login") or is_login_url(self.page.url):
+                raise SessionExpiredError(f"Sessão expirada ao abrir a lista da unidade {unit}")
+            return build_roster(unit, raw["entries"], raw["names"], raw["srcs"])
+
+    def iter_unit_lists(self, units):
+        """
+        Lê a lista de presos de cada unidade, devolvendo cada uma assim que
+        fica pronta (aqui, uma de cada vez, na página do processor).
+
+        Parameters
+        ----------
+        units : iterable of str
+            Unidades a listar.
+
+        Yields
+        ------
+        tuple
+            (unit, df, ok) — ``df`` é None e ``ok`` é False se a lista falhou.
+        """
+        for unit in units:
+            try:
+                yield unit, self.read_unit_list(unit), True
+            except Exception as e:
+                Logger.capture_error(e)
+                yield unit, None, False
 
     def prepare_extra_columns(self, df: pd.DataFrame) -> None:
         """
@@ -174,33 +465,113 @@ class UnitProcessor:
                 "Estado Civil": "...",
                 ...
             }
+
+        Raises
+        ------
+        PartialInfoError
+            Se alguma página falhou após as novas tentativas (com os dados
+            das demais páginas).
         """
         all_data = {}
-        try:
-            # MAIN
-            data_main = self._scrape_page(code, "MAIN")
-            all_data.update(data_main)
+        failed = []
+        for page_type in FIELDS_BY_PAGE:
+            try:
+                all_data.update(self._get_page_data(code, page_type))
+            except Exception as e:
+                Logger.capture_error(e)
+                metrics.inc("canaime_page_failures_total", page_type=page_type)
+                failed.append(page_type)
+
+        if failed:
+            raise PartialInfoError(code, all_data, failed)
+        return all_data
 
-            # REPORTS
-            data_reports = self._scrape_page(code, "REPORTS")
-            all_data.update(data_reports)
+    def _get_page_data(self, code: str, page_type: str) -> dict:
+        """
+        Retorna os dados de uma página do preso: do cache, se válidos,
+        ou coletados via _scrape_page (e então gravados no cache).
+        """
+        if self.cache is not None:
+            cached = self.cache.get(code, page_type)
+            if cached is not None:
+                metrics.inc("canaime_cache_hits_total", page_type=page_type)
+                return cached
+
+        data = retry_call(
+            lambda: self._in_session(self._fetch_page, code, page_type), self.retries, self.backoff,
+            on_retry=lambda: count_retry(page_type),
+        )
+        if self.cache is not None and has_scraped_values(page_type, data):
+            self.cache.put(code, page_type, data)
+        return data
+
+    def _fetch_page(self, code: str, page_type: str) -> dict:
+        """
+        Uma tentativa de coleta da página, dentro do limite de concorrência.
+        """
+        if self.limiter is None:
+            return self._scrape_page(code, page_type)
+        with self.limiter.slot():
+            return self._scrape_page(code, page_type)
 
-            # CERTIDAO
-            data_cert = self._scrape_page(code, "CERTIDAO")
-            all_data.update(data_cert)
+    def _in_session(self, func, *args):
+        """
+        Executa uma tentativa de coleta (``func``) com a sessão válida: espera
+        enquanto outro worker refaz o login e, se a página revelar que a sessão
+        caiu, renova a sessão (uma vez por expiração, ver SessionGuard) e
+        repete a coleta.
+        """
+        if self.session_guard is None:
+            return func(*args)
+        self.session_guard.wait_ready()
+        try:
+            return func(*args)
+        except SessionExpiredError:
+            generation = self.session_guard.renew(self._session_generation)
+            with self._session_lock:
+                if generation != self._session_generation:
+                    self._session_generation = generation
+                    self._apply_session(self.session_guard.state)
+            return func(*args)
+
+    def _apply_session(self, state: dict) -> None:
+        """
+        Passa a usar os cookies da sessão renovada (storage_state).
+        """
+        self.page.context.add_cookies(state["cookies"])
 
-        except TimeoutError as te:
-            Logger.capture_error(te)
-        except Exception as e:
-            Logger.capture_error(e)
+    def iter_full_info(self, items):
+        """
+        Coleta as informações completas de vários detentos, um de cada vez,
+        usando a página desta instância (modo serial).
 
-        return all_data
+        Parameters
+        ----------
+        items : iterable of (index, code)
+            Pares (índice da linha no DataFrame, código do preso).
+
+        Yields
+        ------
+        tuple
+            (index, code, dados, ok) — ``ok`` é False se a coleta falhou (o erro
+            já foi registrado no log); ``dados`` traz o que foi coletado.
+        """
+        for index, code in items:
+            try:
+                data, ok = self.get_inmate_full_info(code), True
+            except PartialInfoError as e:
+                data, ok = e.data, False
+            except Exception as e:
+                Logger.capture_error(e)
+                data, ok = {}, False
+            yield index, code, data, ok
 
     def _scrape_page(self, code: str, page_type: str) -> dict:
         """
-        Acessa a página correspondente (MAIN, REPORTS, CERTIDAO) e,
-        para cada campo definido em FIELDS_BY_PAGE[page_type],
-        tenta coletar via locator. Se não encontrar, utiliza o 'default'.
+        Acessa a página correspondente (MAIN, REPORTS, CERTIDAO) e
+        coleta todos os campos definidos em FIELDS_BY_PAGE[page_type] em uma
+        única chamada (EXTRACT_FIELDS_JS). Se um campo não for encontrado,
+        utiliza o 'default'.
 
         Parameters
         ----------
@@ -214,41 +585,21 @@ class UnitProcessor:
         dict
             {nome_coluna: valor_coletado}
         """
-        result = {}
-
         # Define a URL
-        if page_type == "MAIN":
-            url = f"{URL_MAIN}{code}"
-        elif page_type == "REPORTS":
-            url = f"{URL_REPORTS}{code}"
-        elif page_type == "CERTIDAO":
-            url = f"{URL_CERTIDAO}{code}"
-        else:
+        if page_type not in URL_BY_PAGE:
             # Tipo de página inválido, retorna dicionário vazio
-            return result
+            return {}
+        url = f"{URL_BY_PAGE[page_type]}{code}"
 
         # Acessa a página
-        self.page.goto(url, timeout=0)
+        with timed_stage("navigation", page_type, code):
+            self.page.goto(url, timeout=self.timeouts[page_type] * 1000)
 
-        # Para cada campo, coleta texto (ou default)
-        for field_def in FIELDS_BY_PAGE[page_type]:
-            col_name = field_def["column_name"]
-            locator = field_def["locator"]
-            default_val = field_def["default"]
-
-            elements = self.page.locator(locator)
-            count_elems = elements.count()
-
-            if count_elems > 0:
-                # Pode haver múltiplos matches (ex: Endereço em 2 locators).
-                all_contents = elements.all_text_contents()
-                # Junta tudo em uma única string (ou trate individualmente se necessário)
-                combined_text = "\n".join(t.strip() for t in all_contents if t.strip())
-                result[col_name] = combined_text
-            else:
-                result[col_name] = default_val
-
-        return result
+        # Coleta todos os campos da página de uma vez (ou default)
+        plan = EXTRACTION_PLANS[page_type]
+        with timed_stage("extraction", page_type, code):
+            texts_per_field = self.page.evaluate(EXTRACT_FIELDS_JS, plan["selectors"])
+            return apply_extraction_plan(plan, check_session(page_type, self.page.url, texts_per_field))
 
     def enrich_unit_list(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -265,14 +616,19 @@ class UnitProcessor:
         -------
         pd.DataFrame
         """
+        from models.inmate_model import Inmate, apply_records  # models importa este módulo
+
         self.prepare_extra_columns(df)
 
+        records = []
         for i, row in df.iterrows():
             code = row["Código"]
-            extra_data = self.get_inmate_full_info(code)
-
-            # Atualiza no DataFrame
-            for k, v in extra_data.items():
-                df.at[i, k] = v
-
+            try:
+                extra_data = self.get_inmate_full_info(code)
+            except PartialInfoError as e:
+                extra_data = e.data
+            records.append(Inmate.from_details(i, code, extra_data))
+
+        # Atualiza o DataFrame de uma vez, coluna a coluna
+        apply_records(df, records)
         return df
@@ -1,23 +1,61 @@
+from __future__ import annotations
+
 import sys
-import time
-from playwright.sync_api import sync_playwright
-from controllers.login_controller import CanaimeLogin
-from controllers.unit_controller import UnitProcessor
-from views.excel_view import ExcelHandler
-from config import units, excel_filename, current_version
+import asyncio
+import argparse
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from controllers.login_controller import CanaimeLogin, early_credentials
+from config import (
+    units, excel_filename, current_version, max_workers, engine, async_concurrency, writer_queue_size,
+    adaptive_concurrency, min_concurrency, max_requests_per_second,
+    cache_filename, cache_ttl_days, delta_report_filename, journal_filename, excel_streaming,
+    excel_photo_links, output_sinks, csv_filename, parquet_filename, sqlite_filename, failed_codes_filename,
+    session_renew_interval, metrics_summary_filename, metrics_textfile, metrics_export_interval,
+    profile_dirname, profile_sample_interval, trace_filename,
+)
+from utils.cache import DetailCache
+from utils.journal import Journal
+from utils.failed_codes import FailedCodes
+from utils.session_guard import SessionGuard, SessionLostError
+from utils.pipeline import WriterStage
+from utils.concurrency import AdaptiveLimiter, AsyncAdaptiveLimiter
 from utils.logger import Logger
-from utils.updater import check_and_update
-
-
-def format_seconds_to_hhmmss(seconds: float) -> str:
-    """Converte segundos em string no formato '00h:00min:00s'."""
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    return f"{h:02d}h:{m:02d}min:{s:02d}s"
-
-
-def main():
+from utils.metrics import metrics, TextfileExporter
+from utils.profiling import PhaseProfiler, profiled, profiled_iter, profiled_aiter
+from utils.tracing import tracer
+from utils.progress import Progress
+from utils.startup import preloaded
+from utils.updater import UpdateCheck
+
+if TYPE_CHECKING:
+    from controllers.unit_controller import UnitProcessor
+    from utils.snapshot import RosterSnapshot
+    from views.sink import Sink, MultiSink
+
+# Módulos da coleta (pandas, Playwright, openpyxl, requests, lxml...): ficam
+# fora da abertura do programa e são importados em segundo plano enquanto o
+# usuário digita a senha; cada função importa o que usa.
+COLLECTION_MODULES = (
+    "playwright.sync_api", "playwright.async_api",
+    "controllers.unit_controller", "controllers.pool_controller",
+    "controllers.async_unit_controller", "controllers.http_controller",
+    "models.inmate_model", "utils.snapshot",
+    "views.excel_view", "views.csv_view", "views.parquet_view", "views.sqlite_view",
+)
+
+
+def main(
+    engine: str = engine,
+    refresh: bool = False,
+    delta: bool = False,
+    resume: bool = False,
+    retry_failed: bool = False,
+    sinks: list = output_sinks,
+    check_updates: bool = True,
+    profile: bool = False,
+    trace: bool = False,
+):
     """
     Função principal que executa:
       1) Login (Playwright)
@@ -29,110 +67,601 @@ def main():
          - Salva no Excel
     Exibe o "Tempo da Aplicação" (desde o início) e
     a "Estimativa Restante" (para terminar todas as unidades).
+
+    Parameters
+    ----------
+    engine : str, optional
+        'sync' (playwright.sync_api, serial ou com pool de páginas),
+        'async' (playwright.async_api com várias navegações em voo) ou
+        'http' (login no browser, coleta via HTTP direto, sem Chromium).
+        Padrão definido em config.engine.
+    refresh : bool, optional
+        Se True, ignora o cache de detalhes e coleta tudo novamente
+        (os dados novos continuam sendo gravados no cache).
+    delta : bool, optional
+        Se True, compara as listas com a execução anterior e enriquece
+        apenas os presos novos (os demais reaproveitam os detalhes já
+        conhecidos). As movimentações são gravadas em config.delta_report_filename.
+    resume : bool, optional
+        Se True, continua uma execução interrompida: os presos já gravados
+        no diário (config.journal_filename) não são coletados novamente.
+    retry_failed : bool, optional
+        Se True, coleta de novo apenas os presos que ficaram incompletos na
+        execução anterior (config.failed_codes_filename) e os presos novos;
+        os demais reaproveitam os detalhes já conhecidos.
+    sinks : list of str, optional
+        Destinos de saída ('excel', 'parquet', 'csv', 'sqlite'); padrão
+        definido em config.output_sinks.
+    check_updates : bool, optional
+        Se False, não procura atualização do aplicativo antes de começar
+        (execuções agendadas, benchmarks com o simulador local).
+    profile : bool, optional
+        Se True, mede as fases de listas ('roster'), enriquecimento
+        ('enrichment') e gravação ('save') com cProfile e amostra as pilhas
+        de todas as threads; os arquivos vão para config.profile_dirname.
+        Desligado, não há custo algum.
+    trace : bool, optional
+        Se True, grava em config.trace_filename a linha do tempo de cada
+        preso (fila, navegações, extrações e registro) e da gravação de
+        cada unidade no DataFrame, no formato Chrome trace event.
     """
 
-    # 1) Verifica atualização
-    if check_and_update(current_version):
-        print("Atualização aplicada com sucesso! Reinicie o programa.")
-        sys.exit(0)
+    # 1) Procura atualização em segundo plano: a consulta corre enquanto o
+    #    usuário digita a senha e o browser abre, e é aplicada após o login
+    update = UpdateCheck(current_version) if check_updates else None
+
+    # 2) Usuário e senha logo na abertura (se não há sessão gravada a
+    #    reaproveitar), com os módulos da coleta sendo importados enquanto isso
+    with preloaded(COLLECTION_MODULES):
+        credentials = early_credentials()
+    from playwright.sync_api import sync_playwright
+    from controllers.unit_controller import UnitProcessor, FIELDS_BY_PAGE
+    from controllers.http_controller import HttpUnitProcessor
+    from utils.snapshot import RosterSnapshot
+
+    # Destinos de saída: cada unidade concluída é gravada em todos eles
+    output = build_sinks(sinks)
+
+    # Cache em disco dos detalhes: só páginas ausentes/vencidas vão para a rede
+    cache = DetailCache(cache_filename, cache_ttl_days, refresh=refresh)
+    # Situação da última execução (base do modo delta), no mesmo arquivo
+    snapshot = RosterSnapshot(cache_filename)
+    # Diário por preso da execução em andamento (base do --resume)
+    journal = Journal(journal_filename, resume=resume)
+    if journal.completed:
+        print(f"Retomando execução: {len(journal.completed)} presos já coletados no diário.")
+    if journal.backup:
+        print(f"Aviso: havia um diário de uma execução interrompida; ele foi guardado em {journal.backup} "
+              f"(para continuá-la, renomeie-o para {journal_filename} e use --resume).")
+    # Presos que continuaram incompletos após as novas tentativas (--retry-failed)
+    failed = FailedCodes(failed_codes_filename, keep_previous=retry_failed)
+    if retry_failed:
+        print(f"Coletando novamente {len(failed.previous)} presos com falha na execução anterior.")
+    # Métricas por etapa: arquivo do Prometheus durante a execução, JSON no fim
+    exporter = None
+    if metrics_textfile:
+        exporter = TextfileExporter(metrics, metrics_textfile, metrics_export_interval)
+        exporter.start()
+    # Perfil por fase (--profile): ligado só depois do login
+    profiler = PhaseProfiler(profile_dirname, profile_sample_interval) if profile else None
 
-    # 2) Inicia Playwright e faz login
-    with sync_playwright() as p:
-        login_controller = CanaimeLogin(p, headless=True)
-        page = login_controller.login()
+    try:
+        # 3) Inicia Playwright e faz login
+        with sync_playwright() as p:
+            login_controller = CanaimeLogin(p, headless=True, credentials=credentials)
+            page = login_controller.login()
+            if update is not None and update.apply():
+                print("Atualização aplicada com sucesso! Reinicie o programa.")
+                sys.exit(0)
+            if profiler is not None:
+                profiler.start()
+            if trace:
+                tracer.enable()
+            # Se a sessão expirar no meio da execução, os workers param, um
+            # deles refaz o login e as páginas afetadas são coletadas de novo
+            session_guard = SessionGuard(login_controller.renew_session, min_interval=session_renew_interval)
+
+            if engine == "http":
+                # Só os cookies da sessão são necessários; o Chromium é fechado
+                # antes da fase de enriquecimento.
+                processor = HttpUnitProcessor.from_context(
+                    login_controller.context, workers=max_workers, cache=cache,
+                    limiter=build_limiter(max_workers * len(FIELDS_BY_PAGE)), session_guard=session_guard,
+                )
+                login_controller.browser.close()
+            elif engine != "async":
+                processor = UnitProcessor(
+                    page, cache=cache, limiter=build_limiter(max_workers), session_guard=session_guard,
+                )
+                run_sync(processor, output, snapshot, journal, failed, delta, login_controller, profiler)
+                journal.clear()
+                return
+            else:
+                # O motor assíncrono reaproveita só a sessão (a API síncrona não pode
+                # ficar aberta dentro do event loop).
+                storage_state = login_controller.storage_state()
+
+        if engine == "http":
+            run_sync(processor, output, snapshot, journal, failed, delta, profiler=profiler)
+            processor.close()
+        else:
+            asyncio.run(run_async(
+                storage_state, output, snapshot, journal, failed, delta, cache, session_guard, profiler,
+            ))
+
+        # Concluído: o diário não é mais necessário
+        journal.clear()
+    finally:
+        # Cada passo roda mesmo se o anterior falhar: diário, lista de falhas
+        # e métricas precisam ser gravados ainda que um destino não feche
+        with cleanup_step("fechar os destinos de saída"):
+            profiled(profiler, "save", output.close)()
+        with cleanup_step("fechar o diário"):
+            journal.close()
+        with cleanup_step("gravar a lista de presos com falha"):
+            failed.save()
+            if failed.codes:
+                print(f"{len(failed.codes)} presos incompletos listados em {failed_codes_filename} "
+                      "(use --retry-failed para coletá-los de novo).")
+        print(f"Cache de detalhes: {cache.hits} páginas reaproveitadas, {cache.misses} coletadas.")
+        with cleanup_step("fechar o cache de detalhes"):
+            cache.close()
+        with cleanup_step("fechar a situação da execução"):
+            snapshot.close()
+        with cleanup_step("gravar as métricas"):
+            if exporter is not None:
+                exporter.stop()
+            metrics.write_summary(metrics_summary_filename)
+            print(f"Métricas da execução em {metrics_summary_filename}.")
+        if profiler is not None:
+            with cleanup_step("gravar o perfil da execução"):
+                profiler.stop()
+                print(f"Perfil da execução em {', '.join(profiler.save())}.")
+        if tracer.enabled:
+            with cleanup_step("gravar a linha do tempo"):
+                tracer.write(trace_filename)
+                print(f"Linha do tempo da execução em {trace_filename} (abra no Perfetto ou em chrome://tracing).")
+
+
+@contextmanager
+def cleanup_step(description: str):
+    """
+    Passo da finalização de main(): uma exceção é registrada no log e não
+    interrompe os passos seguintes.
+    """
+    try:
+        yield
+    except Exception as e:
+        Logger.capture_error(e)
+        print(f"Erro ao {description} (detalhes em error_log.log).", flush=True)
+
+
+def run_sync(
+    processor: UnitProcessor,
+    output: Sink,
+    snapshot: RosterSnapshot,
+    journal: Journal,
+    failed: FailedCodes,
+    delta: bool = False,
+    login_controller: CanaimeLogin = None,
+    profiler: PhaseProfiler = None,
+) -> None:
+    """
+    Executa a coleta com um processor síncrono (browser ou HTTP).
 
-        # 3) Inicializa processor + Excel
-        processor = UnitProcessor(page)
-        excel_handler = ExcelHandler(excel_filename)
+    Parameters
+    ----------
+    processor : UnitProcessor
+        Processor já autenticado (UnitProcessor ou HttpUnitProcessor).
+    output : Sink
+        Destino(s) de saída de cada unidade concluída.
+    snapshot : RosterSnapshot
+        Situação da execução anterior (atualizada a cada unidade salva).
+    journal : Journal
+        Diário por preso da execução em andamento.
+    failed : FailedCodes
+        Presos que continuaram incompletos (e, no --retry-failed, os que
+        devem ser coletados de novo).
+    delta : bool, optional
+        Se True, enriquece apenas os presos novos (ver plan_units).
+    login_controller : CanaimeLogin, optional
+        Controller já logado. Se informado e max_workers > 1, os detalhes são
+        coletados por um PagePool com o storage_state da sessão.
+    profiler : PhaseProfiler, optional
+        Perfil por fase (--profile).
+    """
+    from controllers.pool_controller import PagePool
+
+    # Com max_workers > 1, as listas e os detalhes são coletados por um pool
+    # de páginas que compartilham a sessão logada; caso contrário, modo serial.
+    fetcher = processor
+    if login_controller is not None and max_workers > 1:
+        fetcher = PagePool(
+            login_controller.storage_state(), workers=max_workers, headless=True,
+            cache=processor.cache, limiter=processor.limiter, session_guard=processor.session_guard,
+        )
+        fetcher.start()
+
+    # 3.1) Listas de todas as unidades (em paralelo, se o fetcher permitir).
+    #     Cada unidade começa a ser enriquecida assim que sua lista chega; o total
+    #     de presos do ETA global cresce conforme as listas chegam.
+    progress = Progress(0, len(units), limiter=processor.limiter)
+    planned = profiled_iter(profiler, "roster", iter_planned(
+        processor, fetcher.iter_unit_lists(units), snapshot, journal, failed, delta, progress,
+    ))
+    # Tarefas do estágio de escrita, medidas nas fases correspondentes
+    record = profiled(profiler, "enrichment", record_inmate)
+    save = profiled(profiler, "save", save_unit)
+
+    # 4) Agora, processamos de fato. Esta thread só coleta; o estágio de escrita
+    #    (outra thread, fila limitada) guarda os registros (Inmate), atualiza o
+    #    diário e o progresso e salva cada unidade (gravando os registros no
+    #    DataFrame) enquanto a próxima já está sendo coletada.
+    # Se o login não puder ser refeito, a execução para (SessionLostError)
+    # em vez de registrar cada preso restante como falha
+    check_session = processor.session_guard.check if processor.session_guard is not None else lambda: None
+    listed = 0
+    try:
+        with WriterStage(writer_queue_size) as writer:
+            for unit_index, (unit, df_unit, items) in enumerate(planned, start=1):
+                check_session()
+                listed += len(df_unit)
+                writer.put(start_unit, unit_index, unit, df_unit, items, progress)
+                if len(df_unit) == 0:
+                    continue  # nada a processar
 
-        # 3.1) Primeiro, descobrir total de presos em TODAS as units (para cálculo de ETA global).
-        #     Faremos um "pré-passo" para ler APENAS o total de cada unidade, sem enriquecer ainda.
-        global_total_inmates = 0
-        unit_dfs = []  # armazenaremos (unit, df) para reutilizar depois
-        for unit in units:
-            try:
-                df_tmp = processor.create_unit_list(unit)
-            except Exception as e:
-                Logger.capture_error(e)
-                print(f"Erro ao obter lista de presos da unidade '{unit}'. Pulando...", flush=True)
-                continue
-            unit_dfs.append((unit, df_tmp))
-            global_total_inmates += len(df_tmp)
+                # Loop nos presos da unidade (na ordem de conclusão, se em paralelo)
+                records = []
+                tracer.enqueue(code for _, code in items)
+                details = profiled_iter(profiler, "enrichment", fetcher.iter_full_info(items))
+                for done, (i, code, extra_data, ok) in enumerate(details, start=1):
+                    writer.put(record, df_unit, records, unit, unit_index, done, items, i, code,
+                               extra_data, ok, journal, failed, progress)
+                    check_session()
+
+                # 5) Salvar planilha com resultados da unidade
+                writer.put(save, output, unit, df_unit, records, snapshot, failed)
+    finally:
+        if fetcher is not processor:
+            fetcher.close()
+
+    if listed == 0:
+        print("Nenhum preso encontrado em todas as unidades! Encerrando.")
+        return
+    print("\nProcessamento concluído com sucesso!")
+
+
+async def run_async(
+    storage_state: dict,
+    output: Sink,
+    snapshot: RosterSnapshot,
+    journal: Journal,
+    failed: FailedCodes,
+    delta: bool = False,
+    cache: DetailCache = None,
+    session_guard: SessionGuard = None,
+    profiler: PhaseProfiler = None,
+) -> None:
+    """
+    Executa a coleta com a API assíncrona do Playwright: as unidades e os
+    presos são processados com até config.async_concurrency navegações
+    simultâneas (asyncio.Semaphore).
 
-        if global_total_inmates == 0:
-            print("Nenhum preso encontrado em todas as unidades! Encerrando.")
-            return
+    Parameters
+    ----------
+    storage_state : dict
+        Estado da sessão autenticada (ver CanaimeLogin.storage_state()).
+    output : Sink
+        Destino(s) de saída de cada unidade concluída.
+    snapshot : RosterSnapshot
+        Situação da execução anterior (atualizada a cada unidade salva).
+    journal : Journal
+        Diário por preso da execução em andamento.
+    failed : FailedCodes
+        Presos que continuaram incompletos (e, no --retry-failed, os que
+        devem ser coletados de novo).
+    delta : bool, optional
+        Se True, enriquece apenas os presos novos (ver plan_units).
+    cache : DetailCache, optional
+        Cache em disco dos dados de detalhe.
+    session_guard : SessionGuard, optional
+        Renovação da sessão, se ela expirar durante a coleta.
+    profiler : PhaseProfiler, optional
+        Perfil por fase (--profile).
+    """
+    from playwright.async_api import async_playwright
+    from controllers.async_unit_controller import AsyncUnitProcessor, open_context
+
+    async with async_playwright() as p:
+        context = await open_context(p, storage_state, headless=True)
+        processor = AsyncUnitProcessor(
+            context, concurrency=async_concurrency, cache=cache,
+            limiter=build_limiter(async_concurrency, asynchronous=True), session_guard=session_guard,
+        )
+
+        # Listas de todas as unidades concorrentemente; cada unidade começa a
+        # ser enriquecida assim que sua lista chega (no modo delta, depois de todas)
+        progress = Progress(0, len(units), limiter=processor.limiter)
+        check_session = session_guard.check if session_guard is not None else lambda: None
+        listed = 0
+        unit_index = 0
+        try:
+            # O event loop só coleta; DataFrame, diário, progresso e planilha
+            # ficam com o estágio de escrita (ver run_sync)
+            with WriterStage(writer_queue_size) as writer:
+                record = profiled(profiler, "enrichment", record_inmate)
+                save = profiled(profiler, "save", save_unit)
+                unit_lists = profiled_aiter(profiler, "roster", processor.iter_unit_lists(units))
+                async for rosters in roster_batches(unit_lists, delta):
+                    for unit, df_unit, items in iter_planned(processor, rosters, snapshot, journal, failed, delta, progress):
+                        check_session()
+                        unit_index += 1
+                        listed += len(df_unit)
+                        await writer.aput(start_unit, unit_index, unit, df_unit, items, progress)
+                        if len(df_unit) == 0:
+                            continue
+
+                        done = 0
+                        records = []
+                        tracer.enqueue(code for _, code in items)
+                        details = profiled_aiter(profiler, "enrichment", processor.iter_full_info(items))
+                        async for i, code, extra_data, ok in details:
+                            done += 1
+                            await writer.aput(record, df_unit, records, unit, unit_index, done, items, i, code,
+                                              extra_data, ok, journal, failed, progress)
+                            check_session()
+
+                        await writer.aput(save, output, unit, df_unit, records, snapshot, failed)
+        finally:
+            await processor.close()
+
+    if listed == 0:
+        print("Nenhum preso encontrado em todas as unidades! Encerrando.")
+        return
+    print("\nProcessamento concluído com sucesso!")
+
+
+def iter_planned(
+    processor, rosters, snapshot: RosterSnapshot, journal: Journal, failed: FailedCodes,
+    delta: bool, progress: Progress,
+):
+    """
+    Planeja as unidades (ver plan_units) na ordem em que suas listas chegam,
+    para que a primeira comece a ser enriquecida sem esperar as demais. No
+    modo delta todas as listas são esperadas antes, pois a comparação com a
+    execução anterior (transferências, saídas) precisa de todas.
 
-        # 4) Agora, processamos de fato (enriquece, salva Excel, etc.)
-        global_start_time = time.time()   # momento em que começamos o "processamento global"
-        global_processed = 0  # número de presos já enriquecidos
+    Parameters
+    ----------
+    rosters : iterable of (unit, df, ok)
+        Listas das unidades (ver UnitProcessor.iter_unit_lists).
+    progress : Progress
+        Recebe o total de presos de cada unidade planejada; unidades cuja
+        lista falhou são descontadas do total de unidades.
+
+    Yields
+    ------
+    tuple
+        (unit, df_unit, items), como em plan_units.
+    """
+    unit_dfs = []
+    for unit, df, ok in rosters:
+        if not ok:
+            print(f"Erro ao obter lista de presos da unidade '{unit}'. Pulando...", flush=True)
+            progress.total_units -= 1
+            continue
+        unit_dfs.append((unit, df))
+        if not delta:
+            planned = plan_units(processor, unit_dfs, snapshot, journal, failed, delta)[0]
+            unit_dfs = []
+            progress.add(len(planned[2]))
+            yield planned
+
+    if delta:
+        planned = plan_units(processor, unit_dfs, snapshot, journal, failed, delta)
+        for _, _, items in planned:
+            progress.add(len(items))
+        yield from planned
+
+
+async def roster_batches(rosters, delta: bool):
+    """
+    Agrupa as listas de uma fonte assíncrona para iter_planned: uma por vez
+    ou, no modo delta, todas juntas.
+    """
+    batch = []
+    async for roster in rosters:
+        if not delta:
+            yield [roster]
+            continue
+        batch.append(roster)
+    if batch:
+        yield batch
+
+
+def plan_units(
+    processor, unit_dfs: list, snapshot: RosterSnapshot, journal: Journal, failed: FailedCodes, delta: bool,
+) -> list:
+    """
+    Garante as colunas extras (campos MAIN, REPORTS, CERTIDAO) de cada unidade
+    e define quais presos serão enriquecidos: todos, ou, no modo delta, só os
+    que não estavam na execução anterior (os demais recebem os detalhes já
+    conhecidos e não vão para a rede). No --retry-failed, os presos da lista de
+    falhas anterior também são coletados. Presos já gravados no diário
+    (--resume) recebem os dados do diário e também não são coletados de novo.
+
+    Returns
+    -------
+    list of (unit, df_unit, items)
+        ``items`` são os pares (índice, código) a enriquecer.
+    """
+    from controllers.unit_controller import DETAIL_COLUMNS
 
-        total_units = len(unit_dfs)
+    if delta:
+        report_delta(snapshot.compare(unit_dfs))
 
-        for unit_index, (unit, df_unit) in enumerate(unit_dfs, start=1):
-            print("\n" + "="*60)
-            print(f"[{unit_index}/{total_units}] Iniciando processamento da unidade: {unit}")
-            total_inmates_unit = len(df_unit)
-            print(f"Total de presos em {unit}: {total_inmates_unit}", flush=True)
+    planned = []
+    for unit, df_unit in unit_dfs:
+        pending = df_unit
+        if len(df_unit) > 0:
+            processor.prepare_extra_columns(df_unit)
+            if delta or failed.retrying:
+                pending_mask = snapshot.carry_over(df_unit, DETAIL_COLUMNS)
+                if failed.retrying:
+                    pending_mask |= df_unit["Código"].isin(failed.previous)
+                pending = df_unit[pending_mask]
+            if journal.completed:
+                pending = restore_from_journal(df_unit, unit, pending, journal)
+        planned.append((unit, df_unit, list(zip(pending.index, pending["Código"]))))
+    return planned
+
+
+def restore_from_journal(df_unit, unit: str, pending, journal: Journal):
+    """
+    Aplica os dados já gravados no diário às linhas da unidade e devolve
+    apenas as linhas de ``pending`` que ainda precisam ser coletadas.
+    """
+    from models.inmate_model import Inmate, apply_records
 
-            if total_inmates_unit == 0:
-                continue  # nada a processar
+    journaled = pending["Código"].map(lambda code: (unit, code) in journal.completed)
+    apply_records(df_unit, [
+        Inmate.from_details(i, code, journal.completed[(unit, code)])
+        for i, code in zip(pending.index[journaled], pending["Código"][journaled])
+    ])
+    return pending[~journaled]
 
-            # Garante colunas extras (campos MAIN, REPORTS, CERTIDAO)
-            processor.prepare_extra_columns(df_unit)
 
-            # Loop nos presos da unidade
-            for i, row in df_unit.iterrows():
-                code = row["Código"]
-                inmate_name = row["Preso"]
+def report_delta(report) -> None:
+    """
+    Exibe o resumo das movimentações desde a execução anterior e grava o
+    detalhamento em config.delta_report_filename.
+    """
+    print("\n" + "="*60)
+    print("Movimentações desde a execução anterior:")
+    for kind in ('ENTRADA', 'TRANSFERÊNCIA', 'MUDANÇA DE CELA', 'SAÍDA'):
+        print(f"  {kind}: {int((report['Tipo'] == kind).sum())}")
+    report.to_csv(delta_report_filename, index=False, encoding='utf-8-sig')
+    print(f"Detalhes em {delta_report_filename}", flush=True)
 
-                iteration_start = time.time()
-                try:
-                    # Coleta dados extras e atualiza a row
-                    extra_data = processor.get_inmate_full_info(code)
-                    for col, val in extra_data.items():
-                        df_unit.loc[i, col] = val  # Usar .loc em vez de .at para evitar warnings
-                except Exception as e:
-                    Logger.capture_error(e)
-                    print(f"Erro ao processar preso '{inmate_name}' (código: {code}).", flush=True)
 
-                # Contabiliza como processado
-                global_processed += 1
-
-                # Tempo decorrido desde o início da aplicação
-                elapsed_app = time.time() - global_start_time
-
-                # Calcula tempo médio (em segundos) por preso
-                avg_time_per_inmate = elapsed_app / global_processed
-
-                # Calcula estimativa de tempo restante (para TODOS que faltam, não só desta unit)
-                remaining = global_total_inmates - global_processed
-                eta_seconds = remaining * avg_time_per_inmate
-
-                # Formata as strings de tempo
-                elapsed_str = format_seconds_to_hhmmss(elapsed_app)
-                eta_str = format_seconds_to_hhmmss(eta_seconds)
-
-                # Monta a linha exata que você quer:
-                # [unidade_atual/total_unidades][nome_unit] [i+1/total_inmates_unit] NOME_PRESO | Tempo da Aplicação: ... | Estimativa Restante: ...
-                # Exemplo final:
-                # [1/5][PAMC] [105/1763] ALISSANDRO ... | Tempo da Aplicação: 00h:00min:00s | Estimativa Restante: 00h:00min:00s
-                print(
-                    f"[{unit_index}/{total_units}][{unit}]"
-                    f"[{i+1}/{total_inmates_unit}] {inmate_name} | "
-                    f"Tempo da Aplicação: {elapsed_str} | "
-                    f"Estimativa Restante: {eta_str}",
-                    flush=True
-                )
+def start_unit(unit_index: int, unit: str, df_unit, items: list, progress: Progress) -> bool:
+    """
+    Imprime o cabeçalho da unidade. Retorna False se não há presos.
+    """
+    print("\n" + "="*60)
+    print(f"[{unit_index}/{progress.total_units}] Iniciando processamento da unidade: {unit}")
+    print(f"Total de presos em {unit}: {len(df_unit)}", flush=True)
+    if len(items) != len(df_unit):
+        print(f"Presos a enriquecer (novos): {len(items)}", flush=True)
 
-            # Ordenar os dados (sem usar inplace para evitar warnings)
-            df_unit = df_unit.sort_values(by=["Ala", "Cela", "Preso"])
+    return len(df_unit) > 0
 
-            # 5) Salvar planilha com resultados da unidade
-            excel_handler.create_unit_sheet(unit, df_unit)
-            excel_handler.save()
 
-        print("\nProcessamento concluído com sucesso!")
+def record_inmate(
+    df_unit, records: list, unit: str, unit_index: int, done: int, items: list, i, code: str,
+    extra_data: dict, ok: bool, journal: Journal, failed: FailedCodes, progress: Progress,
+) -> None:
+    """
+    Tarefa do estágio de escrita para cada preso coletado: guarda os dados
+    (apply_inmate_info) e imprime a linha de progresso.
+    """
+    with tracer.span("registro", codigo=code):
+        apply_inmate_info(df_unit, records, unit, i, code, extra_data, ok, journal, failed)
+    tracer.finish(code)
+    progress.update(unit_index, unit, done, len(items), df_unit.at[i, "Preso"])
+
+
+def apply_inmate_info(
+    df_unit, records: list, unit: str, i, code: str, extra_data: dict, ok: bool,
+    journal: Journal, failed: FailedCodes,
+) -> None:
+    """
+    Guarda os dados extras de um preso em ``records`` (um Inmate da linha
+    ``i``, gravado no DataFrame da unidade por save_unit) e no diário da
+    execução (para o --resume). Um preso incompleto (``ok`` False) fica com
+    as páginas que deram certo e vai para a lista de falhas, não para o diário.
+    """
+    from models.inmate_model import Inmate
+
+    records.append(Inmate.from_details(i, code, extra_data))
+    metrics.inc("canaime_inmates_total", status="ok" if ok else "falha")
+    if not ok:
+        print(f"Erro ao processar preso '{df_unit.at[i, 'Preso']}' (código: {code}).", flush=True)
+        failed.add(unit, code)
+        return
+    journal.record(unit, code, extra_data)
+    failed.discard(code)
+
+
+def build_limiter(max_limit: int, asynchronous: bool = False):
+    """
+    Cria o limite adaptativo de concorrência do motor (ver
+    config.adaptive_concurrency), ou None se desativado.
+
+    Parameters
+    ----------
+    max_limit : int
+        Máximo de requisições em voo que o motor comporta.
+    asynchronous : bool, optional
+        Se True, cria a versão para o event loop (motor 'async').
+    """
+    if not adaptive_concurrency:
+        return None
+    limiter_class = AsyncAdaptiveLimiter if asynchronous else AdaptiveLimiter
+    return limiter_class(min(min_concurrency, max_limit), max_limit, max_rps=max_requests_per_second)
+
+
+def build_sinks(names: list) -> MultiSink:
+    """
+    Cria os destinos de saída pedidos (ver config.output_sinks).
+
+    Parameters
+    ----------
+    names : list of str
+        'excel', 'parquet', 'csv' e/ou 'sqlite'.
+    """
+    from views.excel_view import ExcelHandler
+    from views.sink import MultiSink
+    from views.csv_view import CsvSink
+    from views.parquet_view import ParquetSink
+    from views.sqlite_view import SqliteSink
+
+    factories = {
+        # As unidades ficam prontas na ordem de conclusão; a aba/linhas de
+        # cada uma seguem a ordem de config.units no arquivo final
+        'excel': lambda: ExcelHandler(
+            excel_filename, streaming=excel_streaming, photo_links=excel_photo_links, unit_order=units,
+        ),
+        'parquet': lambda: ParquetSink(parquet_filename),
+        'csv': lambda: CsvSink(csv_filename, unit_order=units),
+        'sqlite': lambda: SqliteSink(sqlite_filename),
+    }
+    unknown = [name for name in names if name not in factories]
+    if unknown:
+        raise ValueError(f"Destino de saída desconhecido: {', '.join(unknown)}")
+    return MultiSink([factories[name]() for name in dict.fromkeys(names)])
+
+
+def save_unit(
+    output: Sink, unit: str, df_unit, records: list, snapshot: RosterSnapshot, failed: FailedCodes,
+) -> None:
+    """
+    Grava os registros coletados (Inmate) no DataFrame da unidade, de uma vez
+    por coluna, ordena os presos, grava a unidade em todos os destinos de
+    saída e atualiza a situação da unidade para a próxima execução (modo
+    delta). Presos incompletos ficam fora da situação, para serem coletados
+    de novo.
+    """
+    from controllers.unit_controller import DETAIL_COLUMNS, has_detail_values
+    from models.inmate_model import apply_records
+
+    with tracer.span("DataFrame", unidade=unit, presos=len(records)):
+        apply_records(df_unit, records)
+    # Ordenar os dados (sem usar inplace para evitar warnings)
+    df_unit = df_unit.sort_values(by=["Ala", "Cela", "Preso"])
+    output.write_unit(unit, df_unit)
+    complete = df_unit[~df_unit["Código"].isin(list(failed.codes))]
+    snapshot.save_unit(unit, complete, DETAIL_COLUMNS, is_complete=has_detail_values)
 
 
 def test_with_limited_inmates(limit=5):
@@ -144,6 +673,11 @@ def test_with_limited_inmates(limit=5):
     limit : int
         Número máximo de presos a serem processados por unidade.
     """
+    from playwright.sync_api import sync_playwright
+    from controllers.unit_controller import UnitProcessor, PartialInfoError
+    from models.inmate_model import Inmate, apply_records
+    from views.excel_view import ExcelHandler
+
     print(f"MODO DE TESTE: Processando até {limit} presos por unidade")
     
     # Inicia Playwright e faz login
@@ -178,22 +712,27 @@ def test_with_limited_inmates(limit=5):
                 processor.prepare_extra_columns(df_unit)
                 
                 # Processa cada preso
+                records = []
                 for i, row in df_unit.iterrows():
                     code = row["Código"]
                     inmate_name = row["Preso"]
                     
                     try:
-                        # Coleta dados extras e atualiza a row
-                        extra_data = processor.get_inmate_full_info(code)
-                        for col, val in extra_data.items():
-                            df_unit.loc[i, col] = val  # Usar .loc em vez de .at
+                        # Coleta dados extras (gravados no DataFrame ao fim da unidade)
+                        records.append(Inmate.from_details(i, code, processor.get_inmate_full_info(code)))
+                    except PartialInfoError as e:
+                        # Mantém o que foi coletado das páginas que não falharam
+                        Logger.capture_error(e)
+                        records.append(Inmate.from_details(i, code, e.data))
+                        print(f"Dados incompletos do preso '{inmate_name}' (código: {code}).", flush=True)
                     except Exception as e:
                         Logger.capture_error(e)
                         print(f"Erro ao processar preso '{inmate_name}' (código: {code}).", flush=True)
                     
                     print(f"[{unit_index}/{len(units)}][{unit}] [{i+1}/{total_inmates_unit}] {inmate_name}", flush=True)
                 
-                # Ordena os dados (sem usar inplace)
+                # Grava os registros e ordena os dados (sem usar inplace)
+                apply_records(df_unit, records)
                 df_unit = df_unit.sort_values(by=["Ala", "Cela", "Preso"])
                 
                 # Salva no Excel
@@ -218,6 +757,11 @@ def test_single_unit(unit_code, limit=5):
     limit : int
         Número máximo de presos a serem processados.
     """
+    from playwright.sync_api import sync_playwright
+    from controllers.unit_controller import UnitProcessor, PartialInfoError
+    from models.inmate_model import Inmate, apply_records
+    from views.excel_view import ExcelHandler
+
     print(f"MODO DE TESTE: Processando a unidade {unit_code} com até {limit} presos")
     
     # Inicia Playwright e faz login
@@ -249,22 +793,27 @@ def test_single_unit(unit_code, limit=5):
             processor.prepare_extra_columns(df_unit)
             
             # Processa cada preso
+            records = []
             for i, row in df_unit.iterrows():
                 code = row["Código"]
                 inmate_name = row["Preso"]
                 
                 try:
-                    # Coleta dados extras e atualiza a row
-                    extra_data = processor.get_inmate_full_info(code)
-                    for col, val in extra_data.items():
-                        df_unit.loc[i, col] = val  # Usar .loc em vez de .at
+                    # Coleta dados extras (gravados no DataFrame ao fim da unidade)
+                    records.append(Inmate.from_details(i, code, processor.get_inmate_full_info(code)))
+                except PartialInfoError as e:
+                    # Mantém o que foi coletado das páginas que não falharam
+                    Logger.capture_error(e)
+                    records.append(Inmate.from_details(i, code, e.data))
+                    print(f"Dados incompletos do preso '{inmate_name}' (código: {code}).", flush=True)
                 except Exception as e:
                     Logger.capture_error(e)
                     print(f"Erro ao processar preso '{inmate_name}' (código: {code}).", flush=True)
                 
                 print(f"[{unit_code}] [{i+1}/{total_inmates_unit}] {inmate_name}", flush=True)
             
-            # Ordena os dados (sem usar inplace)
+            # Grava os registros e ordena os dados (sem usar inplace)
+            apply_records(df_unit, records)
             df_unit = df_unit.sort_values(by=["Ala", "Cela", "Preso"])
             
             # Adiciona uma coluna para testar se a nova coluna Foto está funcionando corretamente
@@ -281,7 +830,61 @@ def test_single_unit(unit_code, limit=5):
     print("\nTeste concluído com sucesso!")
 
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Lê as opções de linha de comando.
+
+    Parameters
+    ----------
+    argv : list of str, optional
+        Argumentos (padrão: sys.argv[1:]).
+
+    Returns
+    -------
+    argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Coleta de informações dos presos no Canaimé.")
+    parser.add_argument(
+        "--engine", choices=("sync", "async", "http"), default=engine,
+        help=f"motor de coleta (padrão: {engine}, ver config.py)"
+    )
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help="ignora o cache de detalhes e coleta todas as páginas novamente"
+    )
+    parser.add_argument(
+        "--delta", action="store_true",
+        help="enriquece só os presos novos desde a execução anterior e relata as movimentações"
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="continua uma execução interrompida, pulando os presos já gravados no diário"
+    )
+    parser.add_argument(
+        "--retry-failed", action="store_true",
+        help=f"coleta de novo só os presos incompletos da execução anterior ({failed_codes_filename}) e os novos"
+    )
+    parser.add_argument(
+        "--sinks", nargs="+", choices=("excel", "parquet", "csv", "sqlite"), default=output_sinks,
+        help=f"destinos de saída (padrão: {' '.join(output_sinks)}, ver config.py)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help=f"grava o perfil de cada fase (cProfile) e as pilhas amostradas (flame graph) em {profile_dirname}/"
+    )
+    parser.add_argument(
+        "--trace", action="store_true",
+        help=f"grava a linha do tempo de cada preso em {trace_filename} (formato Chrome trace event)"
+    )
+    parser.add_argument(
+        "--no-update-check", dest="check_updates", action="store_false",
+        help="não procura atualização do aplicativo antes de começar"
+    )
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
     try:
         # Para rodar o teste com 5 presos por unidade, descomente a linha abaixo:
         # test_with_limited_inmates(5)
@@ -290,7 +893,14 @@ if __name__ == "__main__":
         # test_single_unit('PAMC', 5)  # Substitua 'PAMC' pela unidade desejada
         
         # Para rodar o programa normal
-        main()
+        main(engine=args.engine, refresh=args.refresh, delta=args.delta, resume=args.resume,
+             retry_failed=args.retry_failed, sinks=args.sinks, check_updates=args.check_updates,
+             profile=args.profile, trace=args.trace)
+    except KeyboardInterrupt:
+        print("\nExecução interrompida. Use --resume para continuar de onde parou.")
+    except SessionLostError as e:
+        Logger.capture_error(e)
+        print(f"\nExecução interrompida: {e}\nUse --resume para continuar de onde parou.")
     except Exception as e:
         Logger.capture_error(e)
         print("Erro fatal na execução.")
@@ -1,50 +1,156 @@
 # models/inmate_model.py
 
+import re
+import unicodedata
+
+import pandas as pd
+
+from controllers.unit_controller import DETAIL_COLUMNS
+
+# Nome do atributo de cada coluna de detalhe. Uma coluna nova em
+# FIELDS_BY_PAGE sem entrada aqui ganha um nome derivado dela (ver
+# attribute_name), então basta incluí-la em FIELDS_BY_PAGE.
+ATTRIBUTE_BY_COLUMN = {
+    "Mãe": "mother_name",
+    "Pai": "father_name",
+    "Sexo": "sex",
+    "Data Nasc.": "birth_date",
+    "Cidade Origem": "city_origin",
+    "Estado": "state",
+    "País": "country",
+    "Endereço": "address",
+    "Estado Civil": "marital_status",
+    "Qtd Filhos": "children_count",
+    "Escolaridade": "education",
+    "Religião": "religion",
+    "Profissão": "profession",
+    "Cor/Etnia": "color",
+    "Altura": "height",
+    "Modus Operandi": "modus_operandi",
+    "Sentença Dias": "sentence_days",
+}
+
+
+def attribute_name(column: str) -> str:
+    """
+    Atributo do Inmate para a coluna ``column`` (ex: 'Cor/Etnia' -> 'color';
+    sem mapeamento, 'Nº Processo' -> 'no_processo').
+    """
+    if column in ATTRIBUTE_BY_COLUMN:
+        return ATTRIBUTE_BY_COLUMN[column]
+    ascii_name = unicodedata.normalize("NFKD", column).encode("ascii", "ignore").decode()
+    return re.sub(r"\W+", "_", ascii_name).strip("_").lower() or "field"
+
+
+# Colunas de detalhe (na ordem de FIELDS_BY_PAGE) e os atributos correspondentes
+COLUMNS = tuple(DETAIL_COLUMNS)
+ATTRIBUTES = tuple(attribute_name(col) for col in COLUMNS)
+
+# Ordem dos argumentos posicionais do construtor, a mesma das versões
+# anteriores (Inmate(code, name, mother_name, ...)). Campos que não estão
+# aqui (ex: address) só podem ser passados por nome.
+POSITIONAL_FIELDS = (
+    "name", "mother_name", "father_name", "sex", "birth_date", "city_origin",
+    "state", "country", "marital_status", "children_count", "education",
+    "religion", "profession", "color", "height", "modus_operandi", "sentence_days",
+)
+
+
 class Inmate:
     """
-    Classe que representa os dados de um detento (interno).
-    Adicione ou remova campos conforme a necessidade do seu projeto.
+    Dados de detalhe de um detento (interno) coletados na execução: a linha
+    (índice) no DataFrame da unidade, o Código, o nome e um atributo por
+    coluna de FIELDS_BY_PAGE (ver ATTRIBUTES).
+
+    O estágio de escrita guarda um Inmate por preso em vez de gravar cada
+    valor no DataFrame; apply_records() grava todos os registros da unidade
+    de uma vez, coluna a coluna. Com __slots__, cada registro ocupa só as
+    referências dos campos (sem __dict__).
+
+    Um campo não coletado (ex: a página falhou) fica None e não altera o
+    valor que já está no DataFrame ('NÃO INFORMADO' ou o da execução
+    anterior, no modo delta).
     """
 
-    def __init__(
-        self,
-        code: str,
-        name: str = 'NÃO INFORMADO',
-        mother_name: str = 'NÃO INFORMADO',
-        father_name: str = 'NÃO INFORMADO',
-        sex: str = 'NÃO INFORMADO',
-        birth_date: str = 'NÃO INFORMADO',
-        city_origin: str = 'NÃO INFORMADO',
-        state: str = 'NÃO INFORMADO',
-        country: str = 'NÃO INFORMADO',
-        marital_status: str = 'NÃO INFORMADO',
-        children_count: str = 'NÃO INFORMADO',
-        education: str = 'NÃO INFORMADO',
-        religion: str = 'NÃO INFORMADO',
-        profession: str = 'NÃO INFORMADO',
-        color: str = 'NÃO INFORMADO',
-        height: str = 'NÃO INFORMADO',
-        modus_operandi: str = 'NÃO INFORMADO',
-        sentence_days: str = 'NÃO INFORMADO'
-    ):
-        # Campos básicos
+    __slots__ = ("row", "code", "name") + ATTRIBUTES
+
+    def __init__(self, code: str, *values, row=None, **fields):
+        """
+        Parameters
+        ----------
+        code : str
+            Código do preso.
+        *values
+            Nome e demais campos por posição, na ordem de POSITIONAL_FIELDS
+            (name, mother_name, father_name, ...).
+        row : optional
+            Índice da linha do preso no DataFrame da unidade (só por nome).
+        **fields
+            Valores dos campos, pelo nome do atributo (ex: mother_name='MARIA').
+            Um campo não informado fica None (e não o antigo 'NÃO INFORMADO').
+        """
+        if len(values) > len(POSITIONAL_FIELDS):
+            raise TypeError(
+                f"Inmate() aceita no máximo {len(POSITIONAL_FIELDS) + 1} argumentos posicionais"
+            )
+        for attr, value in zip(POSITIONAL_FIELDS, values):
+            if attr in fields:
+                raise TypeError(f"Campo informado duas vezes: {attr}")
+            fields[attr] = value
         self.code = code
-        self.name = name  # Nome do interno
-
-        # Novos campos
-        self.mother_name = mother_name
-        self.father_name = father_name
-        self.sex = sex
-        self.birth_date = birth_date
-        self.city_origin = city_origin
-        self.state = state
-        self.country = country
-        self.marital_status = marital_status
-        self.children_count = children_count
-        self.education = education
-        self.religion = religion
-        self.profession = profession
-        self.color = color
-        self.height = height
-        self.modus_operandi = modus_operandi
-        self.sentence_days = sentence_days
+        self.row = row
+        self.name = fields.pop("name", None)
+        for attr in ATTRIBUTES:
+            setattr(self, attr, fields.pop(attr, None))
+        if fields:
+            raise TypeError(f"Campos desconhecidos: {', '.join(fields)}")
+
+    @classmethod
+    def from_details(cls, row, code: str, details: dict) -> "Inmate":
+        """
+        Cria o registro a partir do dict {coluna: valor} devolvido por
+        get_inmate_full_info (ou gravado no diário). Colunas fora de
+        FIELDS_BY_PAGE são ignoradas.
+        """
+        inmate = cls(code, row=row)
+        for col, attr in zip(COLUMNS, ATTRIBUTES):
+            value = details.get(col)
+            if value is not None:
+                setattr(inmate, attr, value)
+        return inmate
+
+    def details(self) -> dict:
+        """
+        Campos coletados, no formato {coluna: valor}.
+        """
+        return {
+            col: value for col, attr in zip(COLUMNS, ATTRIBUTES)
+            if (value := getattr(self, attr)) is not None
+        }
+
+    def __repr__(self) -> str:
+        return f"Inmate(code={self.code!r}, row={self.row!r}, {self.details()!r})"
+
+
+def apply_records(df: pd.DataFrame, records: list) -> None:
+    """
+    Grava os registros (Inmate) nas suas linhas do DataFrame da unidade: uma
+    atribuição por coluna de detalhe, não uma por célula. Campos None mantêm
+    o valor atual da célula.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame da unidade, já com as colunas de detalhe (prepare_extra_columns).
+    records : list of Inmate
+    """
+    if not records:
+        return
+    rows = pd.Index([inmate.row for inmate in records])
+    for col, attr in zip(COLUMNS, ATTRIBUTES):
+        values = [getattr(inmate, attr) for inmate in records]
+        present = [value is not None for value in values]
+        if all(present):
+            df.loc[rows, col] = values
+        elif any(present):
+            df.loc[rows[present], col] = [value for value in values if value is not None]
@@ -0,0 +1,101 @@
+import asyncio
+
+from controllers.async_unit_controller import AsyncUnitProcessor
+from controllers.unit_controller import FIELDS_BY_PAGE
+from utils.concurrency import AsyncAdaptiveLimiter
+
+
+class FakePage:
+    """
+    Página assíncrona falsa: cada seletor devolve "<seletor>@<url>" e a
+    navegação demora um pouco, para exercitar a concorrência.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.url = None
+
+    async def goto(self, url, timeout=0):
+        self.stats["in_flight"] += 1
+        self.stats["peak"] = max(self.stats["peak"], self.stats["in_flight"])
+        await asyncio.sleep(0.01)
+        self.stats["in_flight"] -= 1
+        self.url = url
+
+    async def evaluate(self, script, selectors):
+        # Último seletor: formulário de login (ausente, sessão válida)
+        return [[f" {selector}@{self.url} "] for selector in selectors[:-1]] + [[]]
+
+
+class FakeContext:
+    def __init__(self):
+        self.stats = {"in_flight": 0, "peak": 0, "pages": 0}
+        self.browser = None
+
+    async def new_page(self):
+        self.stats["pages"] += 1
+        return FakePage(self.stats)
+
+
+def test_iter_full_info_respects_concurrency_limit():
+    """
+    Todas as navegações acontecem, mas nunca mais que ``concurrency`` em voo.
+    """
+    context = FakeContext()
+    processor = AsyncUnitProcessor(context, concurrency=4)
+    items = [(i, str(1000 + i)) for i in range(12)]
+
+    async def collect():
+        return [r async for r in processor.iter_full_info(items)]
+
+    results = asyncio.run(collect())
+
+    assert sorted(i for i, *_ in results) == list(range(12))
+    assert all(ok for *_, ok in results)
+    assert context.stats["peak"] == 4
+    assert context.stats["pages"] <= 4
+
+
+def test_get_inmate_full_info_fills_every_column():
+    """
+    O contrato é o mesmo do UnitProcessor: uma chave por campo de FIELDS_BY_PAGE.
+    """
+    processor = AsyncUnitProcessor(FakeContext(), concurrency=2)
+    data = asyncio.run(processor.get_inmate_full_info("123"))
+
+    expected = [f["column_name"] for fields in FIELDS_BY_PAGE.values() for f in fields]
+    assert list(data) == expected
+    assert data["Mãe"].endswith("cadastro.php?id_cad_preso=123")
+
+
+def test_detail_pages_of_one_inmate_navigate_together():
+    context = FakeContext()
+    processor = AsyncUnitProcessor(context, concurrency=4)
+    asyncio.run(processor.get_inmate_full_info("123"))
+
+    assert context.stats["peak"] == len(FIELDS_BY_PAGE)
+
+
+def test_cancelled_hedge_copy_frees_its_slot_without_cutting_the_limit():
+    limiter = AsyncAdaptiveLimiter(min_limit=1, max_limit=8)
+    limiter.controller.limit = 8.0
+    processor = AsyncUnitProcessor(FakeContext(), concurrency=4, limiter=limiter)
+    processor.hedge = True
+    for _ in range(processor.latencies.min_samples):
+        processor.latencies.record("MAIN", 0.01)
+    delays = [1.0, 0.0]  # a primeira cópia trava; a segunda responde na hora
+
+    async def scrape(code, page_type):
+        await asyncio.sleep(delays.pop(0))
+        return {"Mãe": code}
+
+    processor._scrape_page = scrape
+
+    async def run():
+        data = await processor._fetch_page("1", "MAIN")
+        await asyncio.sleep(0.01)  # a cópia perdedora termina de ser cancelada
+        return data
+
+    assert asyncio.run(run()) == {"Mãe": "1"}
+    assert limiter._in_flight == 0
+    assert limiter.concurrency == 8
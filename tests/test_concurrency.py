@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.concurrency import AdaptiveLimiter, AimdController, AsyncAdaptiveLimiter
+
+
+def test_limit_grows_additively_up_to_max():
+    aimd = AimdController(min_limit=1, max_limit=4)
+    for n in range(100):
+        aimd.record(0.1, True, now=n)
+
+    assert aimd.current == 4
+
+
+def test_errors_and_slowdowns_cut_the_limit():
+    aimd = AimdController(min_limit=1, max_limit=16, cooldown=5)
+    aimd.limit = 8.0
+    for n in range(50):
+        aimd.record(0.1, True, now=0)  # latência de referência estável
+    aimd.limit = 8.0
+
+    aimd.record(0.1, False, now=10)
+    assert aimd.current == 4
+
+    # Dentro do cooldown, um novo erro não reduz de novo
+    aimd.record(0.1, False, now=11)
+    assert aimd.current == 4
+
+    # Latência recente muito acima da referência também reduz
+    for _ in range(5):
+        aimd.record(2.0, True, now=20)
+    assert aimd.current == 2
+
+
+def test_in_flight_never_exceeds_current_limit():
+    limiter = AdaptiveLimiter(min_limit=2, max_limit=3)
+    state = {"in_flight": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot():
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.005)
+            with lock:
+                state["in_flight"] -= 1
+
+    threads = [threading.Thread(target=request) for _ in range(30)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert 2 <= state["peak"] <= 3
+
+
+def test_requests_per_second_ceiling():
+    limiter = AdaptiveLimiter(min_limit=4, max_limit=4, max_rps=50)
+    start = time.monotonic()
+    for _ in range(6):
+        with limiter.slot():
+            pass
+
+    # 6 envios com no máximo 50 por segundo: ao menos 5 intervalos de 20 ms
+    assert time.monotonic() - start >= 5 / 50 * 0.9
+    assert "Concorrência: 4" in limiter.status()
+
+
+def test_failed_request_counts_as_error():
+    limiter = AdaptiveLimiter(min_limit=1, max_limit=8)
+    limiter.controller.limit = 8.0
+    with pytest.raises(RuntimeError):
+        with limiter.slot():
+            raise RuntimeError("timeout")
+
+    assert limiter.concurrency == 4
+
+
+def test_cancelled_async_request_releases_slot_without_error():
+    limiter = AsyncAdaptiveLimiter(min_limit=1, max_limit=8, max_rps=5)
+    limiter.controller.limit = 8.0
+
+    async def request(seconds):
+        async with limiter.slot():
+            await asyncio.sleep(seconds)
+
+    async def run():
+        # A primeira requisição ocupa o teto de envio; a segunda é cancelada
+        # ainda esperando por ele, a terceira no meio da requisição
+        await request(0)
+        waiting = asyncio.create_task(request(0))
+        in_flight = asyncio.create_task(request(10))
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        await asyncio.sleep(0.5)
+        assert limiter._in_flight == 1  # só a que está em andamento
+        in_flight.cancel()
+        await asyncio.gather(waiting, in_flight, return_exceptions=True)
+
+    asyncio.run(run())
+
+    assert limiter._in_flight == 0
+    assert limiter.concurrency == 8
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers.unit_controller import UnitProcessor
+from utils import cache as cache_module
+from utils.cache import DetailCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = DetailCache(str(tmp_path / "cache.sqlite"), {"MAIN": 30, "REPORTS": 7, "CERTIDAO": 0})
+    yield c
+    c.close()
+
+
+def test_get_returns_what_was_put(cache):
+    cache.put("123", "MAIN", {"Mãe": "MARIA"})
+    assert cache.get("123", "MAIN") == {"Mãe": "MARIA"}
+    assert cache.get("123", "REPORTS") is None
+
+
+def test_entries_expire_per_page_type(cache, monkeypatch):
+    cache.put("123", "MAIN", {"Mãe": "MARIA"})
+    cache.put("123", "REPORTS", {"Religião": "X"})
+
+    # 10 dias depois: REPORTS (7 dias) venceu, MAIN (30 dias) não
+    now = cache_module.time.time()
+    monkeypatch.setattr(cache_module.time, "time", lambda: now + 10 * 86400)
+
+    assert cache.get("123", "MAIN") == {"Mãe": "MARIA"}
+    assert cache.get("123", "REPORTS") is None
+
+
+def test_ttl_zero_and_refresh_skip_reads(cache, tmp_path):
+    cache.put("123", "CERTIDAO", {"Sentença Dias": "10"})
+    assert cache.get("123", "CERTIDAO") is None
+
+    cache.put("123", "MAIN", {"Mãe": "MARIA"})
+    refreshed = DetailCache(str(tmp_path / "cache.sqlite"), {"MAIN": 30}, refresh=True)
+    assert refreshed.get("123", "MAIN") is None
+    refreshed.close()
+
+
+def test_processor_only_scrapes_missing_pages(cache):
+    """
+    Na segunda coleta do mesmo preso, só a CERTIDAO (TTL 0) vai para a rede.
+    """
+    page = MagicMock()
+    page.evaluate.side_effect = lambda script, selectors: [["VALOR"] for _ in selectors[:-1]] + [[]]
+    processor = UnitProcessor(page, cache=cache)
+
+    first = processor.get_inmate_full_info("123")
+    assert page.goto.call_count == 3
+
+    second = processor.get_inmate_full_info("123")
+    assert page.goto.call_count == 4
+    assert second == first
+
+
+def test_pages_with_only_defaults_are_not_cached(cache):
+    page = MagicMock()
+    # Página autenticada (sem formulário de login), mas nenhum campo encontrado
+    page.evaluate.side_effect = lambda script, selectors: [[] for _ in selectors]
+    processor = UnitProcessor(page, cache=cache)
+
+    processor.get_inmate_full_info("123")
+    assert cache.get("123", "MAIN") is None
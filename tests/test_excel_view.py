@@ -0,0 +1,59 @@
+import pandas as pd
+from openpyxl import load_workbook
+
+from views.excel_view import ExcelHandler
+
+
+def unit_df():
+    return pd.DataFrame(
+        [
+            ["A", "01", "1", "https://canaime.com.br/fotos/1.jpg", "UM", "MAE 1"],
+            ["A", "02", "2", "SEM FOTO", "DOIS", "NÃO INFORMADO"],
+        ],
+        columns=["Ala", "Cela", "Código", "Foto", "Preso", "Mãe"],
+    )
+
+
+def dump(path):
+    wb = load_workbook(path)
+    sheets = {}
+    for ws in wb.worksheets:
+        sheets[ws.title] = [
+            [(c.value, c.border.left.style, c.hyperlink.target if c.hyperlink else None,
+              c.font.color.rgb if c.hyperlink else None, c.comment.text if c.comment else None)
+             for c in row]
+            for row in ws.iter_rows()
+        ]
+    return sheets
+
+
+def test_streaming_writes_same_workbook_once(tmp_path):
+    normal = ExcelHandler(str(tmp_path / "normal.xlsx"))
+    streaming = ExcelHandler(str(tmp_path / "streaming.xlsx"), streaming=True)
+    for handler in (normal, streaming):
+        for unit in ("PAMC", "CPBV"):
+            handler.create_unit_sheet(unit, unit_df())
+            handler.save()
+
+    # No modo streaming nada é gravado antes de close()
+    assert not (tmp_path / "streaming.xlsx").exists()
+    normal.close()
+    streaming.close()
+
+    assert dump(tmp_path / "streaming.xlsx") == dump(tmp_path / "normal.xlsx")
+    assert dump(tmp_path / "streaming.xlsx")["PAMC"][1][3][:3] == (
+        "Ver Foto", "thin", "https://canaime.com.br/fotos/1.jpg"
+    )
+
+
+def test_formula_mode_uses_named_styles_without_comments(tmp_path):
+    for streaming in (False, True):
+        path = tmp_path / f"formula_{streaming}.xlsx"
+        handler = ExcelHandler(str(path), streaming=streaming, photo_links="formula")
+        handler.create_unit_sheet("PAMC", unit_df())
+        handler.close()
+
+        ws = load_workbook(path)["PAMC"]
+        assert ws["D2"].value == '=HYPERLINK("https://canaime.com.br/fotos/1.jpg", "Ver Foto")'
+        assert (ws["D2"].style, ws["D3"].value, ws["D3"].style) == ("Link", "SEM FOTO", "Borda")
+        assert all(c.style == "Borda" and c.comment is None for c in ws[1] + ws[3])
@@ -0,0 +1,63 @@
+from urllib.parse import urlsplit
+
+import pytest
+
+from benchmarks.fake_canaime import FakeCanaime
+from controllers.http_controller import HttpUnitProcessor
+from controllers.unit_controller import EXTRACTION_PLANS
+from config import canaime_base_url
+from utils.session_guard import SessionGuard
+
+
+def session_cookies(fake):
+    host = urlsplit(fake.base_url).hostname
+    return [{"name": "PHPSESSID", "value": fake.login(fake.user, fake.password), "domain": host, "path": "/"}]
+
+
+@pytest.fixture
+def fake():
+    with FakeCanaime(inmates=20, units=("PAMC", "CME")) as server:
+        yield server
+
+
+def local_processor(fake, **kwargs):
+    """
+    HttpUnitProcessor com as requisições desviadas do Canaimé para o simulador.
+    """
+    processor = HttpUnitProcessor(session_cookies(fake), workers=2, **kwargs)
+    get = processor.session.get
+    processor.session.get = lambda url, **kw: get(url.replace(canaime_base_url, fake.base_url), **kw)
+    return processor
+
+
+def test_synthetic_pages_fill_every_field(fake):
+    processor = local_processor(fake)
+    try:
+        df = processor.create_unit_list("PAMC")
+        assert df["Código"].tolist() == fake.inmates("PAMC")
+        assert df.iloc[0]["Preso"] == f"PRESO SINTETICO {fake.inmates('PAMC')[0]}"
+
+        data = processor.get_inmate_full_info(fake.inmates("CME")[0])
+    finally:
+        processor.close()
+
+    # Nenhum campo cai no default: as páginas seguem os seletores de FIELDS_BY_PAGE
+    for plan in EXTRACTION_PLANS.values():
+        for col, default in zip(plan["columns"], plan["defaults"]):
+            assert data[col] != default, col
+    assert data["Sentença Dias"].endswith(" dias")
+
+
+def test_expired_session_is_renewed_against_the_simulator(fake):
+    guard = SessionGuard(lambda: {"cookies": session_cookies(fake)}, min_interval=0)
+    processor = local_processor(fake, session_guard=guard)
+    try:
+        processor.create_unit_list("PAMC")
+        fake.expire_sessions()
+        df = processor.create_unit_list("CME")
+    finally:
+        processor.close()
+
+    assert guard.renewals == 1
+    assert df["Código"].tolist() == fake.inmates("CME")
+    assert fake.requests["CALL"] == 2
@@ -0,0 +1,205 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers.http_controller import HttpUnitProcessor
+
+CALL_HTML = """
+<html><body><table>
+  <tr><td class="titulobkSingCAPS">GS123
+      <span class="titulo12bk"> FULANO DA SILVA </span>
+
+
+      ALA: A / 01</td></tr>
+  <tr><td class="titulobkSingCAPS">GS456
+      <span class="titulo12bk">BELTRANO PEREIRA</span>
+
+
+      ALA: B / 07</td></tr>
+</table>
+<img src="../../fotos/presos/123.jpg"><img src="../../fotos/presos/456.jpg">
+</body></html>
+"""
+
+
+def detail_html(code):
+    rows = "".join(
+        f'<tr><td class="titulo12bk">Campo {n}</td><td class="titulobk">V{n}-{code}</td></tr>'
+        for n in range(1, 12)
+    )
+    return f"<html><body><table>{rows}</table></body></html>"
+
+
+def fake_response(text):
+    response = MagicMock()
+    response.text = text
+    response.content = text.encode("utf-8")
+    response.headers = {"Content-Type": "text/html; charset=utf-8"}
+    return response
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setattr("controllers.http_controller.Logger.capture_error", lambda e: None)
+    p = HttpUnitProcessor(
+        cookies=[{"name": "PHPSESSID", "value": "abc", "domain": "canaime.com.br", "path": "/"}],
+        workers=3,
+    )
+
+    def get(url, timeout=None):
+        if "ChamadaFOTOS" in url:
+            return fake_response(CALL_HTML)
+        return fake_response(detail_html(url.rsplit("=", 1)[-1]))
+
+    p.session.get = MagicMock(side_effect=get)
+    return p
+
+
+def test_session_reuses_browser_cookies(processor):
+    assert processor.session.cookies.get("PHPSESSID") == "abc"
+
+
+def test_create_unit_list_parses_call_page(processor):
+    df = processor.create_unit_list("PAMC")
+
+    assert list(df.columns) == ["Ala", "Cela", "Código", "Foto", "Preso"]
+    assert df["Código"].tolist() == ["123", "456"]
+    assert df["Ala"].tolist() == ["A", "B"]
+    assert df["Cela"].tolist() == ["01", "07"]
+    assert df["Preso"].tolist() == ["FULANO DA SILVA", "BELTRANO PEREIRA"]
+    assert df.iloc[0]["Foto"] == "https://canaime.com.br/sgp2rr/fotos/presos/123.jpg"
+
+
+def test_scrape_page_uses_fields_by_page_selectors(processor):
+    data = processor.get_inmate_full_info("789")
+
+    assert data["Mãe"] == "V3-789"
+    assert data["Pai"] == "V4-789"
+    # Seletor sem correspondência na página cai no default
+    assert data["Sentença Dias"] == "NÃO INFORMADO"
+
+
+def test_iter_full_info_returns_every_inmate(processor):
+    items = [(i, str(500 + i)) for i in range(10)]
+    results = {i: (code, data, ok) for i, code, data, ok in processor.iter_full_info(items)}
+
+    assert sorted(results) == list(range(10))
+    assert all(ok and data["Mãe"] == f"V3-{code}" for code, data, ok in results.values())
+
+
+def test_iter_unit_lists_yields_each_unit(processor):
+    processor.retries = 0
+    get = processor.session.get.side_effect
+
+    def get_or_fail(url, timeout=None):
+        if url.endswith("CPBV"):
+            raise RuntimeError("fora do ar")
+        return get(url, timeout)
+
+    processor.session.get.side_effect = get_or_fail
+
+    results = {unit: (df, ok) for unit, df, ok in processor.iter_unit_lists(["PAMC", "CPBV"])}
+
+    assert results["PAMC"][0]["Código"].tolist() == ["123", "456"]
+    assert results["CPBV"] == (None, False)
+
+
+def test_stopping_early_does_not_wait_for_queued_inmates(processor):
+    processor.get_inmate_full_info = lambda code: time.sleep(0.05) or {"Mãe": code}
+    details = processor.iter_full_info([(i, str(i)) for i in range(200)])
+    next(details)
+
+    start = time.monotonic()
+    details.close()
+    assert time.monotonic() - start < 1
+
+
+def test_detail_pages_are_fetched_in_parallel(processor):
+    """
+    As três páginas de um preso ficam em voo ao mesmo tempo.
+    """
+    barrier = threading.Barrier(3, timeout=2)
+    get = processor.session.get.side_effect
+
+    def get_together(url, timeout=None):
+        barrier.wait()  # só passa se as três requisições estiverem em voo
+        return get(url, timeout)
+
+    processor.session.get.side_effect = get_together
+    data = processor.get_inmate_full_info("789")
+
+    assert (data["Mãe"], data["Estado Civil"]) == ("V3-789", "V3-789")
+
+
+def test_failed_page_returns_partial_info(processor):
+    """
+    Uma página que falha em todas as tentativas não descarta as demais.
+    """
+    processor.retries = 0
+    get = processor.session.get.side_effect
+
+    def get_or_fail(url, timeout=None):
+        if "certidao" in url.lower():
+            raise TimeoutError("página lenta")
+        return get(url, timeout)
+
+    processor.session.get.side_effect = get_or_fail
+    (i, code, data, ok), = processor.iter_full_info([(0, "789")])
+
+    assert not ok
+    assert data["Mãe"] == "V3-789"
+
+
+def test_hedged_request_returns_fastest_copy(processor):
+    """
+    Passado o p95 recente, uma cópia da requisição é disparada e vale a
+    primeira resposta.
+    """
+    processor.hedge = True
+    for _ in range(processor.latencies.min_samples):
+        processor.latencies.record("MAIN", 0.01)
+
+    release = threading.Event()
+    get = processor.session.get.side_effect
+    calls = []
+
+    def first_hangs(url, timeout=None):
+        calls.append(url)
+        if len(calls) == 1:
+            release.wait(2)  # a primeira cópia "trava"
+        return get(url, timeout)
+
+    processor.session.get.side_effect = first_hangs
+    data = processor._fetch_page("789", "MAIN")
+    release.set()
+
+    assert len(calls) == 2
+    assert data["Mãe"] == "V3-789"
+
+
+def test_login_redirect_renews_cookies_and_replays(processor):
+    from utils.session_guard import SessionGuard
+
+    get = processor.session.get.side_effect
+    expired = [True]
+
+    def get_or_redirect(url, timeout=None):
+        response = get(url, timeout)
+        if expired[0]:
+            response.url = "https://canaime.com.br/sgp2rr/login/login_principal.php"
+        return response
+
+    def renew():
+        expired[0] = False
+        return {"cookies": [{"name": "PHPSESSID", "value": "novo", "domain": "canaime.com.br", "path": "/"}]}
+
+    processor.session.get.side_effect = get_or_redirect
+    processor.session_guard = SessionGuard(renew)
+
+    data = processor.get_inmate_full_info("789")
+
+    assert processor.session_guard.renewals == 1
+    assert processor.session.cookies.get("PHPSESSID") == "novo"
+    assert data["Mãe"] == "V3-789"
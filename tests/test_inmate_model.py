@@ -0,0 +1,50 @@
+import pandas as pd
+import pytest
+
+from controllers.unit_controller import DETAIL_COLUMNS, UnitProcessor
+from models.inmate_model import ATTRIBUTES, Inmate, apply_records, attribute_name
+
+
+def unit_frame(codes):
+    df = pd.DataFrame({"Código": codes, "Preso": [f"PRESO {code}" for code in codes]}, index=[10, 11, 12][:len(codes)])
+    UnitProcessor(page=None).prepare_extra_columns(df)
+    return df
+
+
+def test_record_has_one_slot_per_detail_column():
+    inmate = Inmate.from_details(0, "1", {"Mãe": "MARIA", "Cor/Etnia": "PARDA", "Foto": "ignorada"})
+
+    assert len(ATTRIBUTES) == len(DETAIL_COLUMNS)
+    assert not hasattr(inmate, "__dict__")
+    assert (inmate.mother_name, inmate.color, inmate.father_name) == ("MARIA", "PARDA", None)
+    assert inmate.details() == {"Mãe": "MARIA", "Cor/Etnia": "PARDA"}
+    with pytest.raises(TypeError):
+        Inmate("1", photo="x")
+    assert attribute_name("Nº Processo") == "no_processo"
+
+
+def test_constructor_keeps_the_positional_order_of_name_and_fields():
+    inmate = Inmate("1", "FULANO", "MARIA", "JOSÉ", row=7, address="RUA A")
+
+    assert (inmate.code, inmate.name, inmate.row) == ("1", "FULANO", 7)
+    assert (inmate.mother_name, inmate.father_name, inmate.address) == ("MARIA", "JOSÉ", "RUA A")
+    with pytest.raises(TypeError):
+        Inmate("1", "FULANO", name="OUTRO")
+
+
+def test_records_are_written_per_column_keeping_missing_fields():
+    df = unit_frame(["1", "2", "3"])
+    df.loc[12, "Mãe"] = "DA EXECUÇÃO ANTERIOR"
+    full = dict.fromkeys(DETAIL_COLUMNS, "X")
+    records = [
+        Inmate.from_details(11, "2", {**full, "Mãe": "ANA"}),
+        Inmate.from_details(12, "3", {"Pai": "JOSÉ"}),  # só parte das páginas
+    ]
+
+    apply_records(df, records)
+
+    assert df.loc[11, DETAIL_COLUMNS].tolist() == ["ANA"] + ["X"] * (len(DETAIL_COLUMNS) - 1)
+    assert df.loc[12, "Mãe"] == "DA EXECUÇÃO ANTERIOR"
+    assert df.loc[12, "Pai"] == "JOSÉ"
+    assert df.loc[12, "Sexo"] == "NÃO INFORMADO"
+    assert (df.loc[10, DETAIL_COLUMNS] == "NÃO INFORMADO").all()
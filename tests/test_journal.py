@@ -0,0 +1,71 @@
+import os
+
+from utils.journal import Journal
+
+
+def test_resume_loads_recorded_inmates(tmp_path):
+    path = str(tmp_path / "diario.jsonl")
+    journal = Journal(path)
+    journal.record("PAMC", "123", {"Mãe": "MARIA"})
+    journal.record("CPBV", "456", {"Mãe": "ANA"})
+    journal.close()
+
+    resumed = Journal(path, resume=True)
+    assert resumed.completed == {("PAMC", "123"): {"Mãe": "MARIA"}, ("CPBV", "456"): {"Mãe": "ANA"}}
+
+    # Continua gravando no mesmo arquivo
+    resumed.record("PAMC", "789", {"Mãe": "JOANA"})
+    resumed.close()
+    assert len(Journal(path, resume=True).completed) == 3
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = str(tmp_path / "diario.jsonl")
+    journal = Journal(path)
+    journal.record("PAMC", "123", {"Mãe": "MARIA"})
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"unit": "PAMC", "code": "4')  # queda no meio da gravação
+
+    resumed = Journal(path, resume=True)
+    assert list(resumed.completed) == [("PAMC", "123")]
+
+    # O próximo registro não fica grudado no pedaço da linha perdida
+    resumed.record("PAMC", "789", {"Mãe": "JOANA"})
+    resumed.close()
+    assert list(Journal(path, resume=True).completed) == [("PAMC", "123"), ("PAMC", "789")]
+
+
+def test_new_run_starts_empty_and_clear_removes_file(tmp_path):
+    path = str(tmp_path / "diario.jsonl")
+    journal = Journal(path)
+    journal.record("PAMC", "123", {"Mãe": "MARIA"})
+    journal.close()
+
+    fresh = Journal(path)
+    assert fresh.completed == {}
+    # O diário da execução interrompida não é apagado sem --resume
+    previous = Journal(fresh.backup, resume=True)
+    assert list(previous.completed) == [("PAMC", "123")]
+    previous.close()
+    fresh.clear()
+    assert not os.path.exists(path)
+
+
+def test_second_interrupted_run_keeps_the_first_backup(tmp_path):
+    path = str(tmp_path / "diario.jsonl")
+    backups = []
+    for code in ("123", "456", "789"):
+        journal = Journal(path)
+        if journal.backup:
+            backups.append(journal.backup)
+        journal.record("PAMC", code, {"Mãe": "MARIA"})
+        journal.close()
+
+    assert len(set(backups)) == 2
+    kept = []
+    for backup in backups:
+        previous = Journal(backup, resume=True)
+        kept += [code for _, code in previous.completed]
+        previous.close()
+    assert kept == ["123", "456"]
@@ -0,0 +1,53 @@
+import json
+
+from utils.metrics import Metrics, TextfileExporter
+
+
+def test_histogram_in_prometheus_text_format():
+    m = Metrics(buckets=(0.1, 1))
+    m.observe("canaime_navigation_seconds", 0.05, page_type="MAIN")
+    m.observe("canaime_navigation_seconds", 0.5, page_type="MAIN")
+    m.observe("canaime_navigation_seconds", 3, page_type="MAIN")
+    m.inc("canaime_page_retries_total", page_type="CERTIDAO")
+    m.inc("canaime_page_retries_total", page_type="CERTIDAO")
+
+    text = m.prometheus_text()
+
+    assert "# TYPE canaime_navigation_seconds histogram" in text
+    assert 'canaime_navigation_seconds_bucket{page_type="MAIN",le="0.1"} 1' in text
+    assert 'canaime_navigation_seconds_bucket{page_type="MAIN",le="1"} 2' in text
+    assert 'canaime_navigation_seconds_bucket{page_type="MAIN",le="+Inf"} 3' in text
+    assert 'canaime_navigation_seconds_count{page_type="MAIN"} 3' in text
+    assert "# TYPE canaime_page_retries_total counter" in text
+    assert 'canaime_page_retries_total{page_type="CERTIDAO"} 2' in text
+
+
+def test_summary_json_has_quantiles_and_counters(tmp_path):
+    m = Metrics(buckets=(0.1, 1, 10))
+    for _ in range(19):
+        m.observe("canaime_extraction_seconds", 0.05, page_type="REPORTS")
+    m.observe("canaime_extraction_seconds", 5, page_type="REPORTS")
+    m.inc("canaime_inmates_total", status="ok")
+
+    path = tmp_path / "metricas.json"
+    m.write_summary(str(path))
+    summary = json.loads(path.read_text(encoding="utf-8"))
+
+    (extraction,) = summary["histograms"]["canaime_extraction_seconds"]
+    assert extraction["labels"] == {"page_type": "REPORTS"}
+    assert extraction["count"] == 20
+    assert extraction["p50"] == 0.1  # limite superior do bucket
+    assert extraction["p95"] == 0.1
+    assert extraction["max"] == 5
+    assert summary["counters"]["canaime_inmates_total"] == [{"labels": {"status": "ok"}, "value": 1}]
+
+
+def test_exporter_writes_final_textfile(tmp_path):
+    m = Metrics()
+    path = tmp_path / "canaime.prom"
+
+    with TextfileExporter(m, str(path), interval=60):
+        with m.timer("canaime_excel_save_seconds"):
+            pass
+
+    assert "canaime_excel_save_seconds_count 1" in path.read_text(encoding="utf-8")
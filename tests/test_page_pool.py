@@ -0,0 +1,125 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers import pool_controller
+from controllers.pool_controller import PagePool
+
+
+class FakeProcessor:
+    """
+    Substitui o UnitProcessor de cada worker: devolve dados derivados do código.
+    """
+
+    def get_inmate_full_info(self, code):
+        if code == "999":
+            raise RuntimeError("falha simulada")
+        return {"Mãe": f"MAE {code}", "Pai": f"PAI {code}"}
+
+    def read_unit_list(self, unit):
+        if unit == "FALHA":
+            raise RuntimeError("lista indisponível")
+        return f"lista {unit}"
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """
+    PagePool com 3 workers, sem abrir browser de verdade.
+    """
+    monkeypatch.setattr(pool_controller, "sync_playwright", MagicMock())
+    monkeypatch.setattr(PagePool, "_open_processor", lambda self, p: FakeProcessor())
+    monkeypatch.setattr(pool_controller.Logger, "capture_error", lambda e: None)
+    with PagePool(storage_state={}, workers=3) as p:
+        yield p
+
+
+def test_iter_full_info_matches_serial(pool):
+    """
+    O modo pool deve devolver, por índice, os mesmos dados do modo serial.
+    """
+    items = [(i, str(100 + i)) for i in range(20)]
+    serial = {i: FakeProcessor().get_inmate_full_info(code) for i, code in items}
+
+    results = {i: (code, data, ok) for i, code, data, ok in pool.iter_full_info(items)}
+
+    assert set(results) == set(serial)
+    for i, (code, data, ok) in results.items():
+        assert ok
+        assert data == serial[i]
+
+
+def test_iter_full_info_reports_failures(pool):
+    """
+    Uma exceção em um preso não deve travar o pool nem os demais presos.
+    """
+    items = [(0, "1"), (1, "999"), (2, "3")]
+    results = {i: (data, ok) for i, _, data, ok in pool.iter_full_info(items)}
+
+    assert results[1] == ({}, False)
+    assert results[0][1] and results[2][1]
+
+
+def test_worker_without_browser_leaves_the_queue_to_the_others(monkeypatch):
+    """
+    Um worker cujo browser não abre sai do pool: os demais coletam todos os presos.
+    """
+    opened = []
+
+    def first_breaks(self, p):
+        with lock:
+            opened.append(p)
+            if len(opened) == 1:
+                raise RuntimeError("chromium não abriu")
+        return FakeProcessor()
+
+    lock = threading.Lock()
+    monkeypatch.setattr(pool_controller, "sync_playwright", MagicMock())
+    monkeypatch.setattr(PagePool, "_open_processor", first_breaks)
+    monkeypatch.setattr(pool_controller.Logger, "capture_error", lambda e: None)
+
+    with PagePool(storage_state={}, workers=2) as p:
+        results = list(p.iter_full_info([(i, str(i)) for i in range(10)]))
+
+    assert len(results) == 10 and all(ok for *_, ok in results)
+
+
+def test_pool_without_any_browser_raises(monkeypatch):
+    def broken(self, p):
+        raise RuntimeError("chromium não abriu")
+
+    monkeypatch.setattr(pool_controller, "sync_playwright", MagicMock())
+    monkeypatch.setattr(PagePool, "_open_processor", broken)
+    monkeypatch.setattr(pool_controller.Logger, "capture_error", lambda e: None)
+
+    with pytest.raises(RuntimeError):
+        PagePool(storage_state={}, workers=2).start()
+
+
+def test_close_discards_tasks_not_started(pool, monkeypatch):
+    """
+    Interromper a coleta (ex: Ctrl+C) não espera a unidade inteira ser coletada.
+    """
+    def slow(self, code):
+        time.sleep(0.05)
+        return {"Mãe": code}
+
+    monkeypatch.setattr(FakeProcessor, "get_inmate_full_info", slow)
+    details = pool.iter_full_info([(i, str(i)) for i in range(200)])
+    next(details)
+    details.close()
+
+    start = time.monotonic()
+    pool.close()
+    assert time.monotonic() - start < 1
+
+
+def test_iter_unit_lists_reads_units_in_parallel(pool):
+    """
+    Cada lista chega como (unidade, df, ok); uma unidade com falha não trava as demais.
+    """
+    results = {unit: (df, ok) for unit, df, ok in pool.iter_unit_lists(["PAMC", "FALHA", "CPBV"])}
+
+    assert results == {"PAMC": ("lista PAMC", True), "FALHA": (None, False), "CPBV": ("lista CPBV", True)}
@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils import pipeline
+from utils.pipeline import WriterStage
+
+
+def test_tasks_run_in_order_on_one_thread():
+    seen = []
+    with WriterStage(maxsize=2) as writer:
+        for n in range(50):
+            writer.put(lambda n: seen.append((n, threading.current_thread().name)), n)
+
+    assert [n for n, _ in seen] == list(range(50))
+    assert {name for _, name in seen} == {"writer-stage"}
+
+
+def test_full_queue_blocks_producer():
+    """
+    Com a fila cheia, put() espera o estágio de escrita (backpressure).
+    """
+    release = threading.Event()
+    writer = WriterStage(maxsize=1)
+    writer.put(release.wait)   # ocupa a thread
+    writer.put(lambda: None)   # ocupa a fila
+
+    blocked = threading.Thread(target=writer.put, args=(lambda: None,))
+    blocked.start()
+    blocked.join(timeout=0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(timeout=1)
+    assert not blocked.is_alive()
+    writer.close()
+
+
+def test_failure_is_raised_to_the_producer(monkeypatch):
+    monkeypatch.setattr(pipeline.Logger, "capture_error", lambda e: None)
+
+    def boom():
+        raise ValueError("planilha travada")
+
+    writer = WriterStage()
+    writer.put(boom)
+    with pytest.raises(RuntimeError):
+        writer.close()
+
+
+def test_aput_from_event_loop():
+    seen = []
+
+    async def produce(writer):
+        for n in range(10):
+            await writer.aput(seen.append, n)
+
+    with WriterStage(maxsize=1) as writer:
+        asyncio.run(produce(writer))
+
+    assert seen == list(range(10))
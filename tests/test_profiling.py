@@ -0,0 +1,44 @@
+import pstats
+import threading
+import time
+
+from utils.profiling import PhaseProfiler, profiled, profiled_iter
+
+
+def busy_roster():
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+def slow_enrichment():
+    time.sleep(0.05)
+
+
+def test_disabled_profiler_returns_the_original_objects():
+    items = [1, 2, 3]
+    assert profiled(None, "save", busy_roster) is busy_roster
+    assert profiled_iter(None, "roster", items) is items
+
+
+def test_phases_are_written_as_prof_and_folded_stacks(tmp_path):
+    profiler = PhaseProfiler(str(tmp_path), interval=0.001)
+    with profiler:
+        assert list(profiled_iter(profiler, "roster", (busy_roster() for _ in range(3)))) == [busy_roster()] * 3
+        # Outra thread (como o estágio de escrita) com a sua própria fase
+        worker = threading.Thread(target=profiled(profiler, "enrichment", slow_enrichment))
+        worker.start()
+        worker.join()
+    paths = profiler.save()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["enrichment.prof", "roster.prof", "stacks.folded"]
+    assert len(paths) == 3
+    roster = pstats.Stats(str(tmp_path / "roster.prof")).stats
+    assert any(func[2] == "busy_roster" for func in roster)
+    enrichment = pstats.Stats(str(tmp_path / "enrichment.prof")).stats
+    assert not any(func[2] == "busy_roster" for func in enrichment)
+
+    lines = (tmp_path / "stacks.folded").read_text(encoding="utf-8").splitlines()
+    stacks = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in lines}
+    assert any(stack.startswith("enrichment;") and "slow_enrichment" in stack for stack in stacks)
@@ -0,0 +1,65 @@
+import pytest
+
+from utils.failed_codes import FailedCodes
+from utils.resilience import LatencyTracker, backoff_delay, retry_call
+
+
+def test_retry_call_retries_until_success():
+    calls, sleeps = [], []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TimeoutError("lenta")
+        return "ok"
+
+    assert retry_call(flaky, retries=3, sleep=sleeps.append) == "ok"
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+
+
+def test_retry_call_propagates_last_error():
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise TimeoutError("fora do ar")
+
+    with pytest.raises(TimeoutError):
+        retry_call(broken, retries=2, sleep=lambda _: None)
+    assert len(calls) == 3
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, cap=5) <= 5 for attempt in range(10))
+
+
+def test_latency_tracker_p95_needs_min_samples():
+    tracker = LatencyTracker(min_samples=20)
+    for n in range(19):
+        tracker.record("MAIN", n / 100)
+    assert tracker.p95("MAIN") is None
+
+    for n in range(19, 100):
+        tracker.record("MAIN", n / 100)
+    assert tracker.p95("MAIN") == pytest.approx(0.94)
+    assert tracker.p95("REPORTS") is None
+
+
+def test_failed_codes_round_trip(tmp_path):
+    path = str(tmp_path / "falhas.csv")
+    failed = FailedCodes(path)
+    failed.add("PAMC", "123")
+    failed.add("CPBV", "456")
+    failed.save()
+
+    retry = FailedCodes(path, keep_previous=True)
+    assert retry.retrying and retry.previous == {"123", "456"}
+
+    retry.discard("123")
+    retry.save()
+    assert FailedCodes.load(path) == {"456": "CPBV"}
+
+    retry.discard("456")
+    retry.save()
+    assert not (tmp_path / "falhas.csv").exists()
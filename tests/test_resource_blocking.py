@@ -0,0 +1,35 @@
+import pytest
+
+from utils.resource_blocking import blocked_url_pattern
+
+PHOTO = "https://canaime.com.br/sgp2rr/fotos/presos/123.JPG"
+PAGE = "https://canaime.com.br/sgp2rr/areas/unidades/cadastro.php?id_cad_preso=123"
+
+
+def blocked(pattern, url):
+    return pattern.search(url) is not None
+
+
+def test_pattern_matches_only_blocked_types():
+    pattern = blocked_url_pattern(['image', 'font'])
+
+    assert blocked(pattern, PHOTO)
+    assert blocked(pattern, "https://canaime.com.br/fontes/a.woff2?v=3")
+    assert not blocked(pattern, PAGE)
+    assert not blocked(pattern, "https://canaime.com.br/sgp2rr/estilo.css")
+    assert not blocked(pattern, "https://canaime.com.br/sgp2rr/jpg.php?id=1")
+
+
+def test_third_party_hosts():
+    pattern = blocked_url_pattern(['third_party'])
+
+    assert blocked(pattern, "https://fonts.googleapis.com/css?family=Roboto")
+    assert blocked(pattern, "https://canaime.com.br.example.org/x")
+    assert not blocked(pattern, PAGE)
+    assert not blocked(pattern, "https://www.canaime.com.br:443/sgp2rr/")
+
+
+def test_nothing_to_block_and_unknown_types():
+    assert blocked_url_pattern([]) is None
+    with pytest.raises(ValueError):
+        blocked_url_pattern(['script'])
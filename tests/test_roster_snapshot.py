@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from controllers.unit_controller import DETAIL_COLUMNS, has_detail_values
+from utils.snapshot import RosterSnapshot
+
+
+def roster(rows):
+    return pd.DataFrame(rows, columns=["Ala", "Cela", "Código", "Foto", "Preso"])
+
+
+def enriched(df, mother_prefix="MAE"):
+    df = df.copy()
+    for col in DETAIL_COLUMNS:
+        df[col] = "NÃO INFORMADO"
+    df["Mãe"] = [f"{mother_prefix} {code}" for code in df["Código"]]
+    return df
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """
+    Execução anterior: PAMC com 1, 2 e 3; CPBV com 4.
+    """
+    path = str(tmp_path / "snap.sqlite")
+    previous = RosterSnapshot(path)
+    previous.save_unit("PAMC", enriched(roster([
+        ["A", "01", "1", "SEM FOTO", "UM"],
+        ["A", "02", "2", "SEM FOTO", "DOIS"],
+        ["B", "01", "3", "SEM FOTO", "TRES"],
+    ])), DETAIL_COLUMNS)
+    previous.save_unit("CPBV", enriched(roster([["C", "01", "4", "SEM FOTO", "QUATRO"]])), DETAIL_COLUMNS)
+    previous.close()
+
+    s = RosterSnapshot(path)
+    yield s
+    s.close()
+
+
+def test_compare_reports_every_kind_of_movement(snapshot):
+    unit_dfs = [
+        # 1 igual, 2 mudou de cela, 3 saiu, 5 entrou
+        ("PAMC", roster([
+            ["A", "01", "1", "SEM FOTO", "UM"],
+            ["A", "09", "2", "SEM FOTO", "DOIS"],
+            ["A", "01", "5", "SEM FOTO", "CINCO"],
+        ])),
+        # 4 foi para o CPP
+        ("CPP", roster([["D", "01", "4", "SEM FOTO", "QUATRO"]])),
+        ("CPBV", roster([])),
+    ]
+    report = snapshot.compare(unit_dfs)
+    kinds = dict(zip(report["Código"], report["Tipo"]))
+
+    assert kinds == {"2": "MUDANÇA DE CELA", "5": "ENTRADA", "4": "TRANSFERÊNCIA", "3": "SAÍDA"}
+    move = report[report["Código"] == "2"].iloc[0]
+    assert (move["Cela Anterior"], move["Cela Atual"]) == ("02", "09")
+
+
+def test_carry_over_fills_known_and_flags_new(snapshot):
+    df = roster([["A", "09", "2", "SEM FOTO", "DOIS"], ["A", "01", "5", "SEM FOTO", "CINCO"]])
+    for col in DETAIL_COLUMNS:
+        df[col] = "NÃO INFORMADO"
+
+    pending = snapshot.carry_over(df, DETAIL_COLUMNS)
+
+    assert pending.tolist() == [False, True]
+    assert df.loc[0, "Mãe"] == "MAE 2"
+    assert df.loc[1, "Mãe"] == "NÃO INFORMADO"
+
+
+def test_save_unit_skips_incomplete_details(tmp_path):
+    s = RosterSnapshot(str(tmp_path / "snap.sqlite"))
+    df = enriched(roster([["A", "01", "1", "SEM FOTO", "UM"], ["A", "01", "2", "SEM FOTO", "DOIS"]]))
+    df.loc[1, "Mãe"] = "NÃO INFORMADO"  # coleta do preso 2 falhou
+
+    s.save_unit("PAMC", df, DETAIL_COLUMNS, is_complete=has_detail_values)
+    s.close()
+
+    assert set(RosterSnapshot(str(tmp_path / "snap.sqlite")).previous()) == {"1"}
@@ -0,0 +1,116 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers import unit_controller
+from controllers.unit_controller import UnitProcessor, FIELDS_BY_PAGE
+from utils.session_guard import SessionGuard, SessionLostError
+
+STATE = {"cookies": [{"name": "PHPSESSID", "value": "novo", "domain": "canaime.com.br", "path": "/"}]}
+
+
+def test_concurrent_expirations_renew_once():
+    release = threading.Event()
+    renew = MagicMock(side_effect=lambda: release.wait(2) and STATE)
+    guard = SessionGuard(renew)
+    generations = []
+
+    workers = [threading.Thread(target=lambda: generations.append(guard.renew(0))) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    release.set()
+    for worker in workers:
+        worker.join()
+
+    assert renew.call_count == 1
+    assert generations == [1, 1, 1, 1]
+    assert guard.state == STATE
+
+
+def test_expiry_right_after_renewal_is_not_renewed_again():
+    now = [0.0]
+    guard = SessionGuard(MagicMock(return_value=STATE), min_interval=60, clock=lambda: now[0])
+
+    assert guard.renew(0) == 1
+    now[0] = 10
+    assert guard.renew(1) == 1  # mesma geração, mas renovada há pouco
+    now[0] = 100
+    assert guard.renew(1) == 2
+    assert guard.renewals == 2
+
+
+def test_processor_renews_session_and_replays_page(monkeypatch):
+    """
+    Uma página com o formulário de login (sessão caiu) dispara o novo login
+    e é coletada de novo com os cookies novos.
+    """
+    monkeypatch.setattr(unit_controller.Logger, "capture_error", lambda e: None)
+    page = MagicMock()
+    page.url = "https://canaime.com.br/sgp2rr/areas/unidades/cadastro.php?id_cad_preso=1"
+    expired = [True]
+
+    def evaluate(script, selectors):
+        if expired[0]:
+            return [[] for _ in selectors[:-1]] + [["login"]]
+        return [["V"] for _ in selectors[:-1]] + [[]]
+
+    def renew():
+        expired[0] = False
+        return STATE
+
+    page.evaluate.side_effect = evaluate
+    guard = SessionGuard(renew)
+    processor = UnitProcessor(page, session_guard=guard)
+    processor.retries = 0
+
+    data = processor.get_inmate_full_info("1")
+
+    assert guard.renewals == 1
+    page.context.add_cookies.assert_called_once_with(STATE["cookies"])
+    assert set(data.values()) == {"V"}
+    assert len(data) == sum(len(fields) for fields in FIELDS_BY_PAGE.values())
+
+
+def test_login_redirect_without_guard_is_a_page_failure(monkeypatch):
+    monkeypatch.setattr(unit_controller.Logger, "capture_error", lambda e: None)
+    page = MagicMock()
+    page.url = "https://canaime.com.br/sgp2rr/login/login_principal.php"
+    page.evaluate.side_effect = lambda script, selectors: [["V"] for _ in selectors[:-1]] + [[]]
+    processor = UnitProcessor(page)
+    processor.retries = 0
+
+    (_, _, data, ok), = processor.iter_full_info([(0, "1")])
+
+    assert not ok and data == {}
+
+
+def test_empty_detail_page_is_not_an_expired_session(monkeypatch):
+    """
+    Uma página autenticada sem nenhum campo (ex: preso sem informes) fica
+    com os defaults e não dispara um novo login.
+    """
+    monkeypatch.setattr(unit_controller.Logger, "capture_error", lambda e: None)
+    page = MagicMock()
+    page.url = "https://canaime.com.br/sgp2rr/areas/unidades/Informes_LER.php?id_cad_preso=1"
+    page.evaluate.side_effect = lambda script, selectors: [[] for _ in selectors]
+    renew = MagicMock(return_value=STATE)
+    processor = UnitProcessor(page, session_guard=SessionGuard(renew))
+
+    data = processor.get_inmate_full_info("1")
+
+    renew.assert_not_called()
+    assert set(data.values()) == {"NÃO INFORMADO"}
+
+
+def test_failed_renewal_stops_every_later_page():
+    renew = MagicMock(side_effect=RuntimeError("sem credenciais"))
+    guard = SessionGuard(renew, min_interval=0)
+
+    with pytest.raises(SessionLostError):
+        guard.renew(0)
+    for call in (guard.wait_ready, guard.check, lambda: guard.renew(0)):
+        with pytest.raises(SessionLostError):
+            call()
+    assert renew.call_count == 1
+    assert guard.ready.is_set()
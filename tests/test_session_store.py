@@ -0,0 +1,95 @@
+import os
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers.login_controller import CanaimeLogin
+
+STATE = {"cookies": [{"name": "PHPSESSID", "value": "abc", "domain": "canaime.com.br", "path": "/"}], "origins": []}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    from utils.session_store import SessionStore
+
+    monkeypatch.delenv("CANAIME_TEST_KEY", raising=False)
+    return SessionStore(str(tmp_path / "sessao.bin"), str(tmp_path / "sessao.key"), "CANAIME_TEST_KEY", 1)
+
+
+def test_session_round_trip_is_encrypted(store, tmp_path):
+    assert store.load() is None
+
+    store.save(STATE)
+
+    assert b"PHPSESSID" not in (tmp_path / "sessao.bin").read_bytes()
+    assert store.load() == STATE
+
+
+def test_key_is_created_in_its_own_folder_outside_the_project(tmp_path, monkeypatch):
+    pytest.importorskip("cryptography")
+    import config
+    from utils.session_store import SessionStore
+
+    monkeypatch.delenv("CANAIME_TEST_KEY", raising=False)
+    key_path = tmp_path / "config" / "canaime" / "sessao.key"
+    SessionStore(str(tmp_path / "sessao.bin"), str(key_path), "CANAIME_TEST_KEY", 1).save(STATE)
+
+    assert key_path.exists()
+    assert os.path.dirname(os.path.abspath(config.session_key_filename)) != os.getcwd()
+
+
+def test_session_is_discarded_with_another_key(store, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    store.save(STATE)
+    monkeypatch.setenv("CANAIME_TEST_KEY", Fernet.generate_key().decode())
+
+    assert store.load() is None
+
+
+def fake_playwright(login_form_fields: int):
+    p = MagicMock()
+    page = p.chromium.launch.return_value.new_context.return_value.new_page.return_value
+    page.locator.return_value.count.return_value = login_form_fields
+    return p, page
+
+
+def test_login_reuses_valid_session(monkeypatch):
+    monkeypatch.setattr("builtins.input", MagicMock(side_effect=AssertionError("pediu credenciais")))
+    p, page = fake_playwright(login_form_fields=0)
+    login = CanaimeLogin(p, persist=False)
+    login.session_store = MagicMock()
+    login.session_store.load.return_value = STATE
+
+    assert login.login() is page
+    p.chromium.launch.return_value.new_context.assert_called_once_with(storage_state=STATE, java_script_enabled=False)
+    login.session_store.save.assert_not_called()
+
+
+def test_login_with_expired_session_uses_env_credentials(monkeypatch):
+    monkeypatch.setenv("CANAIME_USER", "usuario")
+    monkeypatch.setenv("CANAIME_PASSWORD", "senha")
+    monkeypatch.setattr("builtins.input", MagicMock(side_effect=AssertionError("pediu credenciais")))
+    p, page = fake_playwright(login_form_fields=1)  # sessão gravada caiu no formulário de login
+    login = CanaimeLogin(p, persist=False)
+    login.session_store = MagicMock()
+    login.session_store.load.return_value = STATE
+    page.locator.return_value.count.side_effect = [1, 4]  # formulário; depois 4 imagens (logado)
+
+    login.login()
+
+    login.session_store.clear.assert_called_once()
+    page.locator.return_value.fill.assert_any_call("usuario")
+    page.expect_navigation.assert_called_once()
+    login.session_store.save.assert_called_once()
+
+
+def test_renewal_without_credentials_fails_instead_of_prompting(monkeypatch):
+    monkeypatch.delenv("CANAIME_USER", raising=False)
+    monkeypatch.delenv("CANAIME_PASSWORD", raising=False)
+    monkeypatch.setattr("builtins.input", MagicMock(side_effect=AssertionError("pediu credenciais")))
+    login = CanaimeLogin(MagicMock(), persist=False)  # sessão gravada reaproveitada: sem credenciais
+
+    with pytest.raises(RuntimeError, match="CANAIME_USER"):
+        login.renew_session()
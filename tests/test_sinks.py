@@ -0,0 +1,133 @@
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from views.csv_view import CsvSink
+from views.excel_view import ExcelHandler
+from views.parquet_view import ParquetSink
+from views import sink as sink_module
+from views.sink import MultiSink, Sink
+from views.sqlite_view import SqliteSink
+
+
+def unit_df(codes):
+    return pd.DataFrame(
+        [["A", "01", code, "SEM FOTO", f"PRESO {code}", f"MAE {code}"] for code in codes],
+        columns=["Ala", "Cela", "Código", "Foto", "Preso", "Mãe"],
+    )
+
+
+def write_units(sink):
+    sink.write_unit("PAMC", unit_df(["1", "2"]))
+    sink.write_unit("CPBV", unit_df(["3"]))
+    sink.close()
+
+
+def test_csv_sink_appends_every_unit(tmp_path):
+    path = tmp_path / "presos.csv"
+    write_units(CsvSink(str(path)))
+
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    assert list(df.columns) == ["Unidade", "Ala", "Cela", "Código", "Foto", "Preso", "Mãe"]
+    assert list(zip(df["Unidade"], df["Código"])) == [("PAMC", "1"), ("PAMC", "2"), ("CPBV", "3")]
+
+
+def test_sqlite_sink_replaces_unit_rows(tmp_path):
+    path = str(tmp_path / "presos.sqlite")
+    write_units(SqliteSink(path))
+
+    # Nova execução: PAMC agora só tem o preso 2
+    sink = SqliteSink(path)
+    sink.write_unit("PAMC", unit_df(["2"]))
+    sink.close()
+
+    with sqlite3.connect(path) as conn:
+        rows = conn.execute('SELECT "Unidade", "Código", "Mãe" FROM presos ORDER BY "Código"').fetchall()
+    assert rows == [("PAMC", "2", "MAE 2"), ("CPBV", "3", "MAE 3")]
+
+
+def test_parquet_sink_writes_one_table(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "presos.parquet"
+    write_units(ParquetSink(str(path)))
+
+    df = pd.read_parquet(path)
+    assert df["Código"].tolist() == ["1", "2", "3"]
+    assert df["Unidade"].tolist() == ["PAMC", "PAMC", "CPBV"]
+
+
+def test_multi_sink_feeds_every_sink(tmp_path):
+    write_units(MultiSink([
+        ExcelHandler(str(tmp_path / "presos.xlsx")),
+        CsvSink(str(tmp_path / "presos.csv")),
+    ]))
+
+    assert pd.read_excel(tmp_path / "presos.xlsx", sheet_name=None, dtype=str).keys() == {"PAMC", "CPBV"}
+    assert len(pd.read_csv(tmp_path / "presos.csv", dtype=str)) == 3
+
+
+def test_sqlite_sink_written_by_writer_thread_closes_on_main_thread(tmp_path):
+    path = str(tmp_path / "presos.sqlite")
+    sqlite_sink = SqliteSink(path)
+    writer = threading.Thread(target=sqlite_sink.write_unit, args=("PAMC", unit_df(["1"])))
+    writer.start()
+    writer.join()
+
+    sqlite_sink.close()
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM presos').fetchone() == (1,)
+
+
+def test_multi_sink_closes_every_sink_even_if_one_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(sink_module.Logger, "capture_error", lambda e: None)
+
+    class Broken(Sink):
+        def write_unit(self, unit, df):
+            pass
+
+        def close(self):
+            raise OSError("disco cheio")
+
+    csv_sink = CsvSink(str(tmp_path / "presos.csv"))
+    with pytest.raises(OSError):
+        write_units(MultiSink([Broken(), csv_sink]))
+
+    assert len(pd.read_csv(tmp_path / "presos.csv", dtype=str)) == 3
+
+
+def test_sink_without_write_unit_fails_on_creation():
+    class Incomplete(Sink):
+        def close(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize("options", [{}, {"streaming": True}, {"photo_links": "formula"}])
+def test_excel_sheets_follow_the_unit_order(tmp_path, options):
+    path = tmp_path / "presos.xlsx"
+    handler = ExcelHandler(str(path), unit_order=("PAMC", "CPBV", "CPP"), **options)
+    # Listas prontas fora de ordem (leitura paralela)
+    handler.write_unit("CPP", unit_df(["4"]))
+    handler.write_unit("CPBV", unit_df(["3"]))
+    handler.write_unit("PAMC", unit_df(["1", "2"]))
+    handler.close()
+
+    sheets = pd.read_excel(path, sheet_name=None, dtype=str)
+    assert list(sheets) == ["PAMC", "CPBV", "CPP"]
+    assert sheets["PAMC"]["Código"].tolist() == ["1", "2"]
+
+
+def test_csv_rows_follow_the_unit_order(tmp_path):
+    path = tmp_path / "presos.csv"
+    sink = CsvSink(str(path), unit_order=("PAMC", "CPBV"))
+    sink.write_unit("CPBV", unit_df(["3"]))
+    sink.write_unit("PAMC", unit_df(["1", "2"]))
+    sink.close()
+
+    df = pd.read_csv(path, dtype=str, encoding="utf-8-sig")
+    assert list(zip(df["Unidade"], df["Código"])) == [("PAMC", "1"), ("PAMC", "2"), ("CPBV", "3")]
@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from utils import updater
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Importados só depois que o usuário digita as credenciais
+HEAVY_MODULES = ("pandas", "openpyxl", "playwright", "requests", "tkinter", "lxml")
+
+
+def clean_env():
+    env = {k: v for k, v in os.environ.items() if k not in ("CANAIME_USER", "CANAIME_PASSWORD")}
+    env["PYTHONPATH"] = ROOT
+    env["PYTHONUNBUFFERED"] = "1"
+    return env
+
+
+def test_importing_main_loads_no_heavy_module():
+    code = f"import sys, main; print([m for m in {HEAVY_MODULES!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=clean_env(),
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
+
+
+def test_login_prompt_appears_before_the_collection_starts(tmp_path, record_property):
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "main.py"), "--no-update-check"],
+        cwd=tmp_path, env=clean_env(), stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL, text=True, encoding="utf-8",
+    )
+    prompted = threading.Event()
+
+    def watch():
+        output = ""
+        while not prompted.is_set():
+            char = process.stdout.read(1)
+            if not char:
+                return
+            output += char
+            if output.endswith("Digite seu login: "):
+                prompted.set()
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        assert prompted.wait(timeout=30), "o pedido de login não apareceu"
+        elapsed = time.perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+    # Só informativo (junit/-s): o tempo depende da máquina; a garantia de que
+    # nada pesado é importado antes do pedido é o teste acima.
+    record_property("segundos_ate_login", round(elapsed, 3))
+    print(f"pedido de login após {elapsed:.2f}s")
+
+
+def test_update_check_runs_in_the_background(monkeypatch):
+    def slow_latest_version():
+        time.sleep(0.3)
+        return "0.0.1"
+
+    monkeypatch.setattr(updater, "get_latest_version", slow_latest_version)
+    start = time.perf_counter()
+    check = updater.UpdateCheck("0.0.1")
+    assert time.perf_counter() - start < 0.1
+
+    assert check.apply() is False  # mesma versão: nada a atualizar
+    assert check.latest_version == "0.0.1"
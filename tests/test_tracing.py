@@ -0,0 +1,73 @@
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from controllers.unit_controller import UnitProcessor, FIELDS_BY_PAGE
+from utils.tracing import Tracer, tracer, ASYNC_LANE_BASE
+
+
+@pytest.fixture
+def enabled_tracer():
+    tracer.enable()
+    try:
+        yield tracer
+    finally:
+        tracer.enabled = False
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    quiet = Tracer()
+    with quiet.span("MAIN navigation", codigo="1"):
+        pass
+    quiet.enqueue(["1"])
+    quiet.finish("1")
+    quiet.write(str(tmp_path / "trace.json"))
+
+    assert json.loads((tmp_path / "trace.json").read_text())["traceEvents"] == []
+
+
+def test_inmate_lifecycle_is_exported_as_trace_events(enabled_tracer, tmp_path):
+    page = MagicMock()
+    page.url = "https://canaime.com.br/sgp2rr/areas/unidades/cadastro.php?id_cad_preso=42"
+    page.evaluate.side_effect = lambda script, selectors: [["V"] for _ in selectors[:-1]] + [[]]
+    processor = UnitProcessor(page)
+
+    enabled_tracer.enqueue(["42"])
+    processor.get_inmate_full_info("42")
+    with enabled_tracer.span("registro", codigo="42"):
+        pass
+    enabled_tracer.finish("42")
+    path = tmp_path / "trace.json"
+    enabled_tracer.write(str(path))
+
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    spans = [e["name"] for e in events if e["ph"] == "X"]
+    assert spans == [f"{page_type} {stage}" for page_type in FIELDS_BY_PAGE
+                     for stage in ("navigation", "extraction")] + ["registro"]
+    assert all(e["args"] == {"codigo": "42"} for e in events if e["ph"] != "M")
+    # Trecho do preso com a fila aninhada, fechada na primeira navegação
+    lifecycle = [(e["ph"], e["name"]) for e in events if e.get("cat") == "preso"]
+    assert lifecycle == [("b", "preso 42"), ("b", "fila"), ("e", "fila"), ("e", "preso 42")]
+    queue_end = next(e["ts"] for e in events if e["ph"] == "e" and e["name"] == "fila")
+    first_navigation = next(e for e in events if e["name"] == "MAIN navigation")
+    assert queue_end <= first_navigation["ts"]
+    assert {"name": "thread_name"}.items() <= next(e for e in events if e["ph"] == "M").items()
+
+
+def test_overlapping_async_spans_use_separate_lanes(enabled_tracer, tmp_path):
+    async def navigate():
+        with enabled_tracer.span("MAIN navigation", codigo="1"):
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(navigate(), navigate())
+        await navigate()
+
+    asyncio.run(run())
+    enabled_tracer.write(str(tmp_path / "trace.json"))
+
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    lanes = [e["tid"] - ASYNC_LANE_BASE for e in events if e["ph"] == "X"]
+    assert sorted(lanes) == [1, 1, 2]
@@ -2,7 +2,10 @@ import pytest
 import pandas as pd
 from unittest.mock import MagicMock
 
-from controllers.unit_controller import UnitProcessor, NEW_FIELDS
+from controllers.unit_controller import UnitProcessor, FIELDS_BY_PAGE
+
+# Todos os campos extras (MAIN, REPORTS, CERTIDAO)
+NEW_FIELDS = [field for fields in FIELDS_BY_PAGE.values() for field in fields]
 
 @pytest.fixture
 def mock_page():
@@ -23,6 +26,11 @@ def mock_page():
 
     page.locator.return_value = locator_mock
 
+    # page.evaluate(EXTRACT_FIELDS_JS, seletores) devolve uma lista de textos
+    # por seletor: simulamos 1 elemento com "MOCK_VALUE" para cada campo e
+    # nenhum formulário de login (último seletor).
+    page.evaluate.side_effect = lambda script, selectors: [["MOCK_VALUE"] for _ in selectors[:-1]] + [[]]
+
     return page
 
 
@@ -30,92 +38,43 @@ def test_create_unit_list(mock_page):
     """
     Testa se create_unit_list retorna o DataFrame esperado.
     """
-    # Supondo que a página .locator('.titulobkSingCAPS') retorne 2 itens
-    # Precisamos ajustar o count()
-    mock_page.locator.return_value.count.return_value = 2
-
-    # Simulamos dois "text_contents" distintos para as entradas
-    # ex.: "GS123\n\n\n\nALA:1/2" e "GS456\n\n\n\nALA:3/4"
-    def side_effect_text_content(*args, **kwargs):
-        # Cada chamada nth(i).text_content() devolve algo diferente
-        i = mock_page.locator.call_args[0][0]  # A forma de capturar 'i' pode variar
-        # Para simplificar, vamos só alternar manualmente:
-        if mock_page.locator.call_args_list[-1][0][0].endswith('.titulobkSingCAPS'):
-            # Se for a query de .titulobkSingCAPS, retorna algo
-            # Mas isso fica complexo de controlar. Vamos simplificar:
-            pass
-        return "GS123\n\n\n\nALA:1/2"
-
-    # Para simplificar, vamos criar um mock completamente manual:
-    # - Precisamos diferenciar .nth(0) e .nth(1).
-    #   Então podemos criar sub-mocks e trocar de acordo com nth(i).
-
-    # Para não complicar muito, vamos assumir que cada nth(i).text_content()
-    # retorna um valor fixo no test. Ajustaremos a "count" e "text_content" manualmente.
-    # Assim testamos se a função gera 2 linhas no DF.
-    all_entries_mock = MagicMock()
-    all_entries_mock.count.return_value = 2
-
-    # Duas entradas, para nth(0) e nth(1):
-    nth_0 = MagicMock()
-    nth_0.text_content.return_value = "GS123\n\n\n\nALA:1/2"
-    nth_1 = MagicMock()
-    nth_1.text_content.return_value = "GS456\n\n\n\nALA:3/4"
-
-    # Faremos all_entries_mock.nth(i) -> nth_0 ou nth_1
-    def nth_side_effect(i):
-        if i == 0:
-            return nth_0
-        else:
-            return nth_1
-
-    all_entries_mock.nth.side_effect = nth_side_effect
-
-    # E para os nomes:
-    names_mock = MagicMock()
-    names_mock.count.return_value = 2
-    name_0 = MagicMock()
-    name_0.text_content.return_value = "Fulano da Silva"
-    name_1 = MagicMock()
-    name_1.text_content.return_value = "Beltrano Pereira"
-
-    def names_nth_side_effect(i):
-        return name_0 if i == 0 else name_1
-
-    names_mock.nth.side_effect = names_nth_side_effect
-
-    # Agora, ajustamos mock_page.locator para retornar all_entries_mock ou names_mock
-    # dependendo do seletor chamado:
-    def locator_side_effect(selector):
-        if selector == '.titulobkSingCAPS':
-            return all_entries_mock
-        elif selector == '.titulobkSingCAPS .titulo12bk':
-            return names_mock
-        return MagicMock()
-
-    mock_page.locator.side_effect = locator_side_effect
+    # A página de chamada é lida em uma única chamada (ROSTER_JS), que devolve
+    # os textos das entradas, os nomes e o src de cada imagem.
+    mock_page.evaluate.side_effect = None
+    mock_page.evaluate.return_value = {
+        "entries": ["GS123\n\n\n\nALA:1/2", "GS456\n\n\n\nALA:3/4"],
+        "names": ["Fulano da Silva", "Beltrano Pereira"],
+        # Só o primeiro preso tem foto
+        "srcs": ["../../fotos/presos/123.jpg"],
+    }
 
     # Agora testamos create_unit_list
     processor = UnitProcessor(mock_page)
     df = processor.create_unit_list("PAMC")
 
+    # Uma única chamada ao driver, sem locators por elemento
+    assert mock_page.evaluate.call_count == 1
+    mock_page.locator.assert_not_called()
+
     # Verificamos se o DF tem 2 linhas
     assert len(df) == 2
 
     # Verificamos colunas
-    assert list(df.columns) == ["Ala", "Cela", "Código", "Preso"]
+    assert list(df.columns) == ["Ala", "Cela", "Código", "Foto", "Preso"]
 
     # Verificamos valores esperados
     # 1ª linha
     assert df.iloc[0]["Código"] == "123"   # pois era "GS123", cortamos "GS"
     assert df.iloc[0]["Ala"] == "1"
     assert df.iloc[0]["Cela"] == "2"
+    assert df.iloc[0]["Foto"] == "https://canaime.com.br/sgp2rr/fotos/presos/123.jpg"
     assert df.iloc[0]["Preso"] == "Fulano da Silva"
 
     # 2ª linha
     assert df.iloc[1]["Código"] == "456"
     assert df.iloc[1]["Ala"] == "3"
     assert df.iloc[1]["Cela"] == "4"
+    assert df.iloc[1]["Foto"] == "SEM FOTO"
     assert df.iloc[1]["Preso"] == "Beltrano Pereira"
 
 
@@ -150,3 +109,26 @@ def test_enrich_unit_list(mock_page):
     assert df_enriched.loc[0, "Preso"] == "Fulano da Silva"
     assert df_enriched.loc[1, "Ala"] == "3"
     assert df_enriched.loc[1, "Cela"] == "4"
+
+
+def test_scrape_page_single_round_trip(mock_page):
+    """
+    Testa se _scrape_page coleta todos os campos da página em uma única
+    chamada a page.evaluate, mantendo as regras de default e de junção.
+    """
+    # Primeiro campo com 2 matches (junção), segundo sem match (default),
+    # demais com 1 match.
+    def evaluate_side_effect(script, selectors):
+        texts = [[" linha 1 ", "", "linha 2"], []]
+        return texts + [["X"] for _ in selectors[2:-1]] + [[]]
+
+    mock_page.evaluate.side_effect = evaluate_side_effect
+
+    processor = UnitProcessor(mock_page)
+    data = processor._scrape_page("123", "MAIN")
+
+    assert mock_page.evaluate.call_count == 1
+    mock_page.locator.assert_not_called()
+    assert data["Mãe"] == "linha 1\nlinha 2"
+    assert data["Pai"] == "NÃO INFORMADO"
+    assert data["Sexo"] == "X"
@@ -0,0 +1,100 @@
+# utils/cache.py
+
+import json
+import sqlite3
+import threading
+import time
+
+
+class DetailCache:
+    """
+    Cache em disco (SQLite) dos dados de detalhe de cada preso, por código
+    e tipo de página (MAIN, REPORTS, CERTIDAO).
+
+    Cada tipo de página tem seu próprio tempo de validade (TTL): campos como
+    Mãe, Pai e Data Nasc. quase nunca mudam, enquanto a certidão muda mais.
+    Entradas vencidas ou ausentes são tratadas como "não encontradas" e
+    coletadas novamente. Pode ser usado por várias threads ao mesmo tempo.
+    """
+
+    def __init__(self, path: str, ttl_days: dict, refresh: bool = False):
+        """
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo SQLite (criado se não existir).
+        ttl_days : dict
+            Validade em dias por tipo de página, ex: {'MAIN': 30, 'CERTIDAO': 1}.
+            Tipos ausentes ou com 0 não são lidos do cache.
+        refresh : bool, optional
+            Se True, ignora o que está no cache (força nova coleta),
+            mas continua gravando os dados novos.
+        """
+        self.path = path
+        self.ttl_seconds = {k: v * 86400 for k, v in ttl_days.items()}
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " code TEXT NOT NULL,"
+            " page_type TEXT NOT NULL,"
+            " data TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " PRIMARY KEY (code, page_type))"
+        )
+        self._conn.commit()
+
+    def get(self, code: str, page_type: str):
+        """
+        Retorna os dados em cache de uma página, ou None se ausentes/vencidos.
+
+        Parameters
+        ----------
+        code : str
+            Código do preso.
+        page_type : str
+            'MAIN', 'REPORTS' ou 'CERTIDAO'.
+
+        Returns
+        -------
+        dict or None
+        """
+        ttl = self.ttl_seconds.get(page_type, 0)
+        # Chamado em paralelo pelos workers: os contadores também ficam sob o lock
+        with self._lock:
+            if self.refresh or ttl <= 0:
+                self.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT data, fetched_at FROM details WHERE code = ? AND page_type = ?",
+                (code, page_type)
+            ).fetchone()
+            if row is None or time.time() - row[1] > ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def put(self, code: str, page_type: str, data: dict) -> None:
+        """
+        Grava (ou substitui) os dados de uma página no cache.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (code, page_type, data, fetched_at) VALUES (?, ?, ?, ?)",
+                (code, page_type, json.dumps(data, ensure_ascii=False), time.time())
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Fecha a conexão com o banco.
+        """
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,244 @@
+# utils/concurrency.py
+
+import asyncio
+import collections
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+
+class AimdController:
+    """
+    Controle AIMD (additive increase, multiplicative decrease) do número de
+    requisições em voo, a partir da latência e dos erros observados.
+
+    - Resposta sem erro e com latência normal: o limite cresce ~1 a cada
+      ``limit`` respostas (aumento aditivo).
+    - Erro, ou latência recente (média móvel curta) acima de
+      ``latency_factor`` vezes a latência de referência (média móvel longa):
+      o limite é multiplicado por ``decrease`` (no máximo uma vez por
+      ``cooldown`` segundos, para uma rajada de lentidão contar uma vez só).
+
+    O limite fica sempre entre ``min_limit`` e ``max_limit``. Não é thread-safe:
+    AdaptiveLimiter / AsyncAdaptiveLimiter fazem a sincronização.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_factor: float = 2.0,
+        decrease: float = 0.5,
+        cooldown: float = 2.0,
+    ):
+        """
+        Parameters
+        ----------
+        min_limit, max_limit : int
+            Limites da concorrência.
+        latency_factor : float, optional
+            Quanto a latência recente pode passar da referência antes de reduzir.
+        decrease : float, optional
+            Fator da redução multiplicativa.
+        cooldown : float, optional
+            Intervalo mínimo (segundos) entre duas reduções.
+        """
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.latency_factor = latency_factor
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(self.min_limit)
+        self.short_latency = None  # média móvel rápida (alpha 0.3)
+        self.long_latency = None   # referência: média móvel lenta (alpha 0.02)
+        self._last_decrease = float("-inf")
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def record(self, latency: float, ok: bool, now: float) -> None:
+        """
+        Atualiza o limite com o resultado de uma requisição.
+        """
+        if ok:
+            if self.long_latency is None:
+                self.short_latency = self.long_latency = latency
+            else:
+                self.short_latency += 0.3 * (latency - self.short_latency)
+                self.long_latency += 0.02 * (latency - self.long_latency)
+
+        congested = not ok or self.short_latency > self.latency_factor * self.long_latency
+        if congested:
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class _Meter:
+    """
+    Ritmo (requisições por segundo) e teto de envio (token bucket de 1 vaga).
+    """
+
+    def __init__(self, max_rps: float = None, window: float = 10.0):
+        self.interval = 1 / max_rps if max_rps else 0.0
+        self.window = window
+        self._next_send = 0.0
+        self._done = collections.deque()
+
+    def reserve(self, now: float) -> float:
+        """
+        Reserva o próximo horário de envio e devolve quanto esperar até ele.
+        """
+        send_at = max(now, self._next_send)
+        self._next_send = send_at + self.interval
+        return send_at - now
+
+    def completed(self, now: float) -> None:
+        self._done.append(now)
+        while self._done and self._done[0] < now - self.window:
+            self._done.popleft()
+
+    def rate(self, now: float) -> float:
+        while self._done and self._done[0] < now - self.window:
+            self._done.popleft()
+        return len(self._done) / self.window
+
+
+class AdaptiveLimiter:
+    """
+    Limite adaptativo (AIMD) de requisições em voo para threads, com teto de
+    requisições por segundo. Compartilhado pelos workers de um motor:
+
+        with limiter.slot():
+            ...  # uma requisição
+
+    A latência e o sucesso (sem exceção) de cada requisição alimentam o
+    AimdController.
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 16, max_rps: float = None, **aimd):
+        """
+        Parameters
+        ----------
+        min_limit, max_limit : int
+            Limites da concorrência (ver AimdController).
+        max_rps : float, optional
+            Teto de requisições iniciadas por segundo (None = sem teto).
+        **aimd
+            Demais parâmetros de AimdController.
+        """
+        self.controller = AimdController(min_limit, max_limit, **aimd)
+        self._meter = _Meter(max_rps)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return self.controller.current
+
+    def rate(self) -> float:
+        with self._cond:
+            return self._meter.rate(time.monotonic())
+
+    def status(self) -> str:
+        """
+        Texto para a linha de progresso.
+        """
+        return f"Concorrência: {self.concurrency} | {self.rate():.1f} req/s"
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._in_flight >= self.controller.current:
+                self._cond.wait()
+            self._in_flight += 1
+            delay = self._meter.reserve(time.monotonic())
+
+        start = None
+        ok = False
+        try:
+            # A espera do teto de envio já ocupa a vaga: dentro do try para
+            # que uma interrupção nela também libere a vaga
+            if delay > 0:
+                time.sleep(delay)
+            start = time.monotonic()
+            yield
+            ok = True
+        finally:
+            now = time.monotonic()
+            with self._cond:
+                self._in_flight -= 1
+                if start is not None:
+                    self.controller.record(now - start, ok, now)
+                    self._meter.completed(now)
+                self._cond.notify_all()
+
+
+class AsyncAdaptiveLimiter:
+    """
+    Mesmo que AdaptiveLimiter, para corrotinas em um único event loop:
+
+        async with limiter.slot():
+            ...  # uma requisição
+    """
+
+    def __init__(self, min_limit: int = 1, max_limit: int = 16, max_rps: float = None, **aimd):
+        self.controller = AimdController(min_limit, max_limit, **aimd)
+        self._meter = _Meter(max_rps)
+        self._in_flight = 0
+        self._cond = None  # criado dentro do event loop
+
+    @property
+    def concurrency(self) -> int:
+        return self.controller.current
+
+    def rate(self) -> float:
+        return self._meter.rate(time.monotonic())
+
+    def status(self) -> str:
+        return f"Concorrência: {self.concurrency} | {self.rate():.1f} req/s"
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Uma requisição cancelada (ex: a cópia perdedora de um hedge, ou as
+        tarefas canceladas no fim de iter_full_info) libera a vaga sem contar
+        como erro no AimdController: não foi o servidor que falhou.
+        """
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < self.controller.current)
+            self._in_flight += 1
+
+        start = None
+        ok = False
+        cancelled = False
+        try:
+            # A espera do teto de envio já ocupa a vaga: dentro do try para
+            # que um cancelamento nela também libere a vaga
+            delay = self._meter.reserve(time.monotonic())
+            if delay > 0:
+                await asyncio.sleep(delay)
+            start = time.monotonic()
+            yield
+            ok = True
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            now = time.monotonic()
+            if start is not None and not cancelled:
+                self.controller.record(now - start, ok, now)
+                self._meter.completed(now)
+            # Liberada sem await: um novo cancelamento durante a notificação
+            # não pode deixar a vaga presa
+            self._in_flight -= 1
+            await asyncio.shield(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
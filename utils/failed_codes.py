@@ -0,0 +1,69 @@
+# utils/failed_codes.py
+
+import csv
+import os
+import threading
+
+
+class FailedCodes:
+    """
+    Lista dos presos que continuaram incompletos (alguma página falhou mesmo
+    após as novas tentativas), gravada em CSV (Unidade, Código) ao fim da
+    execução. "python main.py --retry-failed" coleta de novo só esses presos
+    (e os novos), reaproveitando os demais da execução anterior.
+    """
+
+    def __init__(self, path: str, keep_previous: bool = False):
+        """
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo CSV.
+        keep_previous : bool, optional
+            Se True, começa com a lista gravada anteriormente (modo
+            --retry-failed): os presos saem da lista conforme são coletados.
+        """
+        self.path = path
+        self.codes = self.load(path) if keep_previous else {}
+        # Códigos a coletar de novo nesta execução (vazio fora do --retry-failed)
+        self.retrying = keep_previous
+        self.previous = frozenset(self.codes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def load(path: str) -> dict:
+        """
+        Lê a lista gravada.
+
+        Returns
+        -------
+        dict
+            {código: unidade}
+        """
+        if not os.path.exists(path):
+            return {}
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            return {row['Código']: row['Unidade'] for row in csv.DictReader(f)}
+
+    def add(self, unit: str, code: str) -> None:
+        with self._lock:
+            self.codes[code] = unit
+
+    def discard(self, code: str) -> None:
+        with self._lock:
+            self.codes.pop(code, None)
+
+    def save(self) -> None:
+        """
+        Grava a lista (ou apaga o arquivo, se não há presos com falha).
+        """
+        with self._lock:
+            codes = dict(self.codes)
+        if not codes:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            return
+        with open(self.path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Unidade', 'Código'])
+            writer.writerows((unit, code) for code, unit in sorted(codes.items()))
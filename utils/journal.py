@@ -0,0 +1,120 @@
+# utils/journal.py
+
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    """
+    Diário (append-only, uma linha JSON por preso) dos dados extras coletados
+    na execução em andamento.
+
+    Cada preso enriquecido é gravado e enviado ao disco imediatamente, então
+    uma queda do processo (Chromium, sessão expirada, Ctrl+C) perde no máximo
+    o preso em andamento. Com ``resume=True`` o diário anterior é lido e os
+    presos já registrados não são coletados de novo.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        """
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo do diário (JSON Lines).
+        resume : bool, optional
+            Se True, carrega o diário existente em ``completed`` e continua
+            gravando no mesmo arquivo. Se False, começa um diário novo; um
+            diário não vazio de uma execução interrompida é guardado em
+            ``backup`` (ver _backup_path) em vez de apagado.
+        """
+        self.path = path
+        self.backup = None
+        if resume:
+            self.completed = self._load()
+            self._drop_partial_line()
+        else:
+            self.completed = {}
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                self.backup = self._backup_path()
+                os.replace(path, self.backup)
+        self._lock = threading.Lock()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _backup_path(self) -> str:
+        """
+        Nome livre para guardar o diário atual: ``path`` + '.anterior-' + data
+        e hora da última gravação dele (ex: 'diario.jsonl.anterior-20240131-
+        142501'), com um número no fim se já existir. Uma cópia anterior
+        nunca é sobrescrita, então duas execuções interrompidas seguidas
+        mantêm os dois diários.
+        """
+        stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(os.path.getmtime(self.path)))
+        backup = f"{self.path}.anterior-{stamp}"
+        n = 1
+        while os.path.exists(backup):
+            n += 1
+            backup = f"{self.path}.anterior-{stamp}-{n}"
+        return backup
+
+    def _drop_partial_line(self) -> None:
+        """
+        Corta o diário depois da última linha completa: uma linha pela
+        metade (queda no meio da gravação) ficaria grudada na próxima.
+        """
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            content = f.read()
+            end = content.rfind(b"\n") + 1
+            if end < len(content):
+                f.truncate(end)
+
+    def _load(self) -> dict:
+        """
+        Lê o diário existente.
+
+        Returns
+        -------
+        dict
+            {(unit, code): dados_extras}
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Última linha pode ter ficado pela metade na queda
+                    continue
+                completed[(entry["unit"], entry["code"])] = entry["data"]
+        return completed
+
+    def record(self, unit: str, code: str, data: dict) -> None:
+        """
+        Acrescenta os dados de um preso ao diário e força a gravação em disco.
+        """
+        line = json.dumps({"unit": unit, "code": code, "data": data}, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """
+        Fecha o arquivo (o diário continua no disco para um --resume).
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def clear(self) -> None:
+        """
+        Fecha e apaga o diário (execução concluída com sucesso).
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
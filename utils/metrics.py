@@ -0,0 +1,241 @@
+# utils/metrics.py
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Limites superiores (segundos) dos buckets dos histogramas de latência
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Descrição de cada métrica (linha # HELP do formato Prometheus)
+METRIC_HELP = {
+    "canaime_navigation_seconds": "Tempo de navegação/download de cada página, por tipo de página.",
+    "canaime_extraction_seconds": "Tempo de extração dos campos de cada página, por tipo de página.",
+    "canaime_page_retries_total": "Novas tentativas de páginas com falha, por tipo de página.",
+    "canaime_page_failures_total": "Páginas que falharam mesmo após as novas tentativas, por tipo de página.",
+    "canaime_cache_hits_total": "Páginas de detalhe reaproveitadas do cache, por tipo de página.",
+    "canaime_session_renewals_total": "Logins refeitos por sessão expirada.",
+    "canaime_session_renewal_failures_total": "Logins que não puderam ser refeitos (a execução é interrompida).",
+    "canaime_inmates_total": "Presos processados, por resultado (ok/falha).",
+    "canaime_sink_write_seconds": "Tempo de gravação de cada unidade, por destino de saída.",
+    "canaime_excel_save_seconds": "Tempo de cada gravação do arquivo Excel em disco.",
+}
+
+
+class Histogram:
+    """
+    Histograma cumulativo de latências (buckets fixos, como no Prometheus).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # último: +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Quantil aproximado: limite superior do bucket onde ele cai (limitado
+        ao maior valor observado).
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class Metrics:
+    """
+    Registro das métricas da execução: histogramas de latência e contadores,
+    identificados por nome + rótulos (ex: page_type='MAIN'). Seguro para uso
+    por várias threads.
+
+    Ao fim da execução, write_summary() grava o resumo em JSON; durante a
+    execução, TextfileExporter grava periodicamente o formato texto do
+    Prometheus (node_exporter --collector.textfile).
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        """
+        Registra uma latência (segundos) no histograma ``name``.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """
+        Soma ``amount`` ao contador ``name``.
+        """
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Mede o tempo do bloco ``with`` no histograma ``name``.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started_at = time.time()
+
+    def summary(self) -> dict:
+        """
+        Resumo da execução: por histograma, contagem, soma, média, p50, p95
+        e máximo (segundos); por contador, o valor.
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+            summary = {
+                "started_at": self.started_at,
+                "duration_seconds": round(time.time() - self.started_at, 3),
+                "histograms": {},
+                "counters": {},
+            }
+            for (name, labels), h in histograms:
+                summary["histograms"].setdefault(name, []).append({
+                    "labels": dict(labels),
+                    "count": h.count,
+                    "sum": round(h.sum, 6),
+                    "mean": round(h.sum / h.count, 6) if h.count else 0.0,
+                    "p50": round(h.quantile(0.5), 6),
+                    "p95": round(h.quantile(0.95), 6),
+                    "max": round(h.max, 6),
+                })
+            for (name, labels), value in counters:
+                summary["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return summary
+
+    def prometheus_text(self) -> str:
+        """
+        Métricas no formato texto do Prometheus (exposition format 0.0.4).
+        """
+        lines = []
+        declared = set()
+
+        def declare(name, kind):
+            if name not in declared:
+                declared.add(name)
+                if name in METRIC_HELP:
+                    lines.append(f"# HELP {name} {METRIC_HELP[name]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            for (name, labels), h in sorted(self._histograms.items()):
+                declare(name, "histogram")
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), h.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labels)} {h.sum:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {h.count}")
+            for (name, labels), value in sorted(self._counters.items()):
+                declare(name, "counter")
+                lines.append(f"{name}{_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_summary(self, path: str) -> None:
+        """
+        Grava o resumo (summary()) em JSON.
+        """
+        _atomic_write(path, json.dumps(self.summary(), ensure_ascii=False, indent=2))
+
+    def write_textfile(self, path: str) -> None:
+        """
+        Grava o formato texto do Prometheus (arquivo temporário + os.replace,
+        para o coletor nunca ler um arquivo pela metade).
+        """
+        _atomic_write(path, self.prometheus_text())
+
+
+class TextfileExporter:
+    """
+    Thread que grava as métricas no formato do Prometheus a cada
+    ``interval`` segundos, e uma última vez ao sair do bloco ``with``.
+    """
+
+    def __init__(self, metrics: Metrics, path: str, interval: float = 15):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.metrics.write_textfile(self.path)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Encerra a thread e grava as métricas finais.
+        """
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.metrics.write_textfile(self.path)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _atomic_write(path: str, text: str) -> None:
+    temp_path = path + ".temp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+# Registro único da execução (os controllers e as saídas gravam aqui)
+metrics = Metrics()
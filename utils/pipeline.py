@@ -0,0 +1,102 @@
+# utils/pipeline.py
+
+import asyncio
+import queue
+import threading
+
+from utils.logger import Logger
+
+# Marcador para encerrar a thread do estágio
+_STOP = object()
+
+
+class WriterStage:
+    """
+    Estágio de escrita do pipeline de coleta: uma única thread executa, na
+    ordem de chegada, as tarefas postas em uma fila limitada.
+
+    Quem coleta (threads, pool de páginas ou event loop) só enfileira o
+    resultado e volta para a rede; a atualização do DataFrame, o diário, a
+    linha de progresso e a gravação das unidades (ordenação + destinos de
+    saída) acontecem nesta thread, em paralelo com a coleta. Com a fila
+    cheia, put() bloqueia (backpressure), limitando a memória.
+
+    Methods
+    -------
+    put(func, *args)
+        Enfileira func(*args).
+    aput(func, *args)
+        Versão para corrotinas (não bloqueia o event loop).
+    close()
+        Espera as tarefas pendentes e encerra a thread.
+    """
+
+    def __init__(self, maxsize: int = 500):
+        """
+        Parameters
+        ----------
+        maxsize : int, optional
+            Número máximo de tarefas aguardando na fila.
+        """
+        self._queue = queue.Queue(maxsize=max(1, int(maxsize)))
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name="writer-stage", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(raise_error=exc_type is None)
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is _STOP:
+                return
+            if self._error is not None:
+                continue  # após uma falha, só esvazia a fila
+            func, args = task
+            try:
+                func(*args)
+            except Exception as e:
+                Logger.capture_error(e)
+                self._error = e
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Falha no estágio de escrita") from self._error
+
+    def put(self, func, *args) -> None:
+        """
+        Enfileira func(*args), bloqueando enquanto a fila estiver cheia.
+        Levanta RuntimeError se uma tarefa anterior falhou.
+        """
+        self._check()
+        self._queue.put((func, args))
+
+    async def aput(self, func, *args) -> None:
+        """
+        Mesmo que put(), mas com a fila cheia espera em outra thread, sem
+        bloquear o event loop.
+        """
+        self._check()
+        try:
+            self._queue.put_nowait((func, args))
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, (func, args))
+
+    def close(self, raise_error: bool = True) -> None:
+        """
+        Processa o que ainda está na fila e encerra a thread.
+
+        Parameters
+        ----------
+        raise_error : bool, optional
+            Se True, levanta RuntimeError caso alguma tarefa tenha falhado.
+        """
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        if raise_error:
+            self._check()
@@ -0,0 +1,223 @@
+# utils/profiling.py
+
+import collections
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+from contextlib import contextmanager
+
+
+class PhaseProfiler:
+    """
+    Perfil da execução por fase (ex: 'roster', 'enrichment', 'save'), ligado
+    pela opção --profile de main.py.
+
+    Duas medições complementares:
+
+    - determinística (cProfile): cada thread que entra em uma fase liga um
+      profiler próprio daquela fase; ao fim, os profilers de cada fase são
+      somados em ``<fase>.prof`` (pstats, snakeviz);
+    - por amostragem: uma thread lê a pilha de todas as threads a cada
+      ``interval`` segundos (inclusive workers de rede, Playwright e
+      openpyxl, que não estão dentro de uma fase) e grava as pilhas no
+      formato "folded" (flamegraph.pl, speedscope), com a fase (ou o nome
+      da thread) como raiz.
+
+    Com o perfil desligado não existe PhaseProfiler: as funções profiled*
+    devolvem o próprio objeto recebido, sem custo algum na coleta.
+    """
+
+    def __init__(self, directory: str, interval: float = 0.005):
+        """
+        Parameters
+        ----------
+        directory : str
+            Pasta onde os arquivos de perfil são gravados.
+        interval : float, optional
+            Intervalo (segundos) entre as amostras das pilhas.
+        """
+        self.directory = directory
+        self.interval = interval
+        self.samples = collections.Counter()  # {pilha "a;b;c": amostras}
+        self._profiles = {}  # {(fase, thread): cProfile.Profile}
+        self._phases = {}  # {thread: [fases abertas]}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler.is_alive():
+            self._sampler.join()
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Mede o bloco ``with`` na fase ``name`` (na thread atual). Fases
+        aninhadas pausam a de fora até terminarem.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            stack = self._phases.setdefault(ident, [])
+            outer = self._profiles.get((stack[-1], ident)) if stack else None
+            profile = self._profiles.setdefault((name, ident), cProfile.Profile())
+            stack.append(name)
+        if outer is not None:
+            outer.disable()
+        enabled = _enable(profile)
+        try:
+            yield
+        finally:
+            if enabled:
+                profile.disable()
+            with self._lock:
+                stack.pop()
+            if outer is not None:
+                _enable(outer)
+
+    def wrap(self, name: str, func):
+        """
+        Devolve func com cada chamada medida na fase ``name``.
+        """
+        def profiled_call(*args, **kwargs):
+            with self.phase(name):
+                return func(*args, **kwargs)
+        return profiled_call
+
+    def iterate(self, name: str, iterable):
+        """
+        Percorre ``iterable`` medindo cada next() na fase ``name`` (o corpo do
+        laço de quem consome fica de fora).
+        """
+        iterator = iter(iterable)
+        while True:
+            with self.phase(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    async def aiterate(self, name: str, iterable):
+        """
+        Versão de iterate() para iteradores assíncronos. No event loop, o
+        tempo de outras corrotinas que rodam durante a espera também conta.
+        """
+        iterator = iterable.__aiter__()
+        while True:
+            with self.phase(name):
+                try:
+                    item = await iterator.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield item
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            with self._lock:
+                phases = {ident: stack[-1] for ident, stack in self._phases.items() if stack}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                root = phases.get(ident) or _thread_group(names.get(ident, "thread"))
+                self.samples[";".join([root] + _stack(frame))] += 1
+
+    def save(self) -> list:
+        """
+        Grava ``<fase>.prof`` de cada fase e ``stacks.folded`` com as amostras.
+
+        Returns
+        -------
+        list of str
+            Caminhos gravados.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        by_phase = collections.defaultdict(list)
+        with self._lock:
+            for (name, _), profile in self._profiles.items():
+                by_phase[name].append(profile)
+            samples = sorted(self.samples.items())
+
+        paths = []
+        for name, profiles in sorted(by_phase.items()):
+            stats = None
+            for profile in profiles:
+                profile.create_stats()
+                if profile.stats:  # pstats não aceita um profiler sem chamadas
+                    stats = pstats.Stats(profile) if stats is None else stats.add(profile)
+            if stats is None:
+                continue
+            path = os.path.join(self.directory, f"{name}.prof")
+            stats.dump_stats(path)
+            paths.append(path)
+
+        path = os.path.join(self.directory, "stacks.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in samples)
+        paths.append(path)
+        return paths
+
+
+def profiled(profiler, name: str, func):
+    """
+    func medida na fase ``name``, ou a própria func se o perfil está desligado.
+    """
+    return func if profiler is None else profiler.wrap(name, func)
+
+
+def profiled_iter(profiler, name: str, iterable):
+    """
+    iterable medido na fase ``name`` (ver PhaseProfiler.iterate), ou o próprio
+    iterable se o perfil está desligado.
+    """
+    return iterable if profiler is None else profiler.iterate(name, iterable)
+
+
+def profiled_aiter(profiler, name: str, iterable):
+    """
+    Versão de profiled_iter para iteradores assíncronos.
+    """
+    return iterable if profiler is None else profiler.aiterate(name, iterable)
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+    # A partir do Python 3.12 só um cProfile pode estar ligado por vez no
+    # processo: as outras threads ficam só com a amostragem
+    try:
+        profile.enable()
+        return True
+    except ValueError:
+        return False
+
+
+def _thread_group(name: str) -> str:
+    # "http-page_3" / "page-pool-2" / "ThreadPoolExecutor-0_1" -> sem os números
+    return re.sub(r"[-_]\d+", "", name) or "thread"
+
+
+def _stack(frame) -> list:
+    """
+    Pilha da raiz até ``frame``, no formato "função (arquivo:linha)".
+    """
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
@@ -0,0 +1,69 @@
+# utils/progress.py
+
+import time
+
+
+def format_seconds_to_hhmmss(seconds: float) -> str:
+    """Converte segundos em string no formato '00h:00min:00s'."""
+    h = int(seconds // 3600)
+    m = int((seconds % 3600) // 60)
+    s = int(seconds % 60)
+    return f"{h:02d}h:{m:02d}min:{s:02d}s"
+
+
+class Progress:
+    """
+    Acompanha o progresso global (todas as unidades) e imprime a linha de status:
+    [unidade_atual/total_unidades][unit][preso_atual/total_presos] NOME_PRESO | ...
+    """
+
+    def __init__(self, total_inmates: int, total_units: int, limiter=None):
+        """
+        Parameters
+        ----------
+        total_inmates : int
+            Total de presos em todas as unidades (para o ETA global).
+        total_units : int
+            Total de unidades a processar.
+        limiter : AdaptiveLimiter, optional
+            Se informado, a concorrência atual e o ritmo (req/s) aparecem
+            no fim da linha de status.
+        """
+        self.total_inmates = total_inmates
+        self.total_units = total_units
+        self.limiter = limiter
+        self.processed = 0  # número de presos já enriquecidos
+        self.start_time = time.time()  # momento em que começamos o "processamento global"
+
+    def add(self, inmates: int) -> None:
+        """
+        Soma presos ao total (as listas das unidades chegam aos poucos).
+        """
+        self.total_inmates += inmates
+
+    def update(self, unit_index: int, unit: str, done: int, total_unit: int, inmate_name: str) -> None:
+        """
+        Contabiliza 1 preso processado e imprime a linha de status, no formato:
+        [1/5][PAMC][105/1763] ALISSANDRO ... | Tempo da Aplicação: 00h:00min:00s | Estimativa Restante: 00h:00min:00s
+        """
+        self.processed += 1
+
+        # Tempo decorrido desde o início da aplicação
+        elapsed_app = time.time() - self.start_time
+
+        # Calcula tempo médio (em segundos) por preso
+        avg_time_per_inmate = elapsed_app / self.processed
+
+        # Calcula estimativa de tempo restante (para TODOS que faltam, não só desta unit)
+        remaining = self.total_inmates - self.processed
+        eta_seconds = remaining * avg_time_per_inmate
+
+        status = f" | {self.limiter.status()}" if self.limiter is not None else ""
+        print(
+            f"[{unit_index}/{self.total_units}][{unit}]"
+            f"[{done}/{total_unit}] {inmate_name} | "
+            f"Tempo da Aplicação: {format_seconds_to_hhmmss(elapsed_app)} | "
+            f"Estimativa Restante: {format_seconds_to_hhmmss(eta_seconds)}"
+            f"{status}",
+            flush=True
+        )
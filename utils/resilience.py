@@ -0,0 +1,83 @@
+# utils/resilience.py
+
+import asyncio
+import collections
+import random
+import threading
+import time
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Espera antes da nova tentativa ``attempt`` (0, 1, 2...): exponencial com
+    jitter completo, sorteada entre 0 e min(cap, base * 2**attempt), para
+    que workers que falharam juntos não tentem de novo juntos.
+    """
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_call(func, retries: int, base: float = 1.0, sleep=time.sleep, on_retry=None):
+    """
+    Executa func(), tentando de novo até ``retries`` vezes se levantar
+    exceção (a última exceção é propagada). ``on_retry()``, se informado, é
+    chamado antes de cada nova tentativa.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception:
+            if attempt >= retries:
+                raise
+            if on_retry is not None:
+                on_retry()
+            sleep(backoff_delay(attempt, base))
+
+
+async def aretry_call(func, retries: int, base: float = 1.0, on_retry=None):
+    """
+    Mesmo que retry_call, para corrotinas: ``func`` devolve um awaitable.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await func()
+        except Exception:
+            if attempt >= retries:
+                raise
+            if on_retry is not None:
+                on_retry()
+            await asyncio.sleep(backoff_delay(attempt, base))
+
+
+class LatencyTracker:
+    """
+    Latências recentes por tipo de página, para decidir quando uma
+    requisição está lenta o suficiente para ser duplicada (hedging).
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        """
+        Parameters
+        ----------
+        window : int, optional
+            Quantas latências recentes guardar por tipo de página.
+        min_samples : int, optional
+            Abaixo disso, p95() devolve None (ainda não há referência).
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self._samples = collections.defaultdict(lambda: collections.deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, page_type: str, latency: float) -> None:
+        with self._lock:
+            self._samples[page_type].append(latency)
+
+    def p95(self, page_type: str):
+        """
+        Percentil 95 das latências recentes do tipo de página (ou None).
+        """
+        with self._lock:
+            samples = sorted(self._samples[page_type])
+        if len(samples) < self.min_samples:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
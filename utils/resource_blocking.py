@@ -0,0 +1,83 @@
+# utils/resource_blocking.py
+
+import re
+from urllib.parse import urlsplit
+
+from config import blocked_resources, canaime_base_url
+
+# Extensões de URL de cada tipo de recurso bloqueável
+RESOURCE_EXTENSIONS = {
+    'image': ('jpg', 'jpeg', 'png', 'gif', 'bmp', 'webp', 'svg', 'ico'),
+    'stylesheet': ('css',),
+    'font': ('woff', 'woff2', 'ttf', 'otf', 'eot'),
+    'media': ('mp4', 'webm', 'ogg', 'mp3', 'wav', 'avi'),
+}
+BLOCKABLE_RESOURCES = tuple(RESOURCE_EXTENSIONS) + ('third_party',)
+
+# Domínio do Canaimé: o resto é de terceiros
+FIRST_PARTY_HOST = urlsplit(canaime_base_url).hostname
+
+
+def blocked_url_pattern(resources=blocked_resources, first_party_host: str = FIRST_PARTY_HOST):
+    """
+    Monta uma única expressão regular que casa só as URLs a bloquear.
+
+    Uma rota com padrão (glob/regex) é avaliada pelo próprio driver do
+    Playwright: as requisições que não casam seguem direto, sem passar por
+    callback em Python. Já ``context.route("**/*", ...)`` manda toda
+    requisição (inclusive as páginas HTML) para o Python decidir.
+
+    Parameters
+    ----------
+    resources : iterable of str, optional
+        Tipos a bloquear: 'image', 'stylesheet', 'font', 'media' (pela
+        extensão da URL) e/ou 'third_party' (qualquer host fora de
+        ``first_party_host``). Padrão: config.blocked_resources.
+    first_party_host : str, optional
+        Domínio cujas requisições não contam como de terceiros.
+
+    Returns
+    -------
+    re.Pattern or None
+        None se não há nada a bloquear.
+    """
+    resources = list(resources)
+    unknown = [r for r in resources if r not in BLOCKABLE_RESOURCES]
+    if unknown:
+        raise ValueError(f"Tipo de recurso desconhecido: {', '.join(unknown)} (use {BLOCKABLE_RESOURCES})")
+
+    alternatives = []
+    extensions = [ext for r in resources for ext in RESOURCE_EXTENSIONS.get(r, ())]
+    if extensions:
+        # Extensão no fim do caminho (antes de ?query ou #fragmento)
+        alternatives.append(r"\.(?:{})(?:[?#]|$)".format("|".join(extensions)))
+    if 'third_party' in resources:
+        host = re.escape(first_party_host)
+        alternatives.append(r"^https?://(?![^/?#]*{}(?:[:/?#]|$))".format(host))
+    if not alternatives:
+        return None
+    # Sintaxe comum a Python e JavaScript (o driver avalia a regex em JS)
+    return re.compile("|".join(alternatives), re.IGNORECASE)
+
+
+def block_resources(context, resources=blocked_resources) -> None:
+    """
+    Aborta os recursos de ``resources`` no contexto (API síncrona).
+    """
+    pattern = blocked_url_pattern(resources)
+    if pattern is not None:
+        context.route(pattern, lambda route: route.abort())
+
+
+async def ablock_resources(context, resources=blocked_resources) -> None:
+    """
+    Mesmo que block_resources, para contextos da API assíncrona.
+    """
+    pattern = blocked_url_pattern(resources)
+    if pattern is None:
+        return
+
+    async def abort(route):
+        await route.abort()
+
+    await context.route(pattern, abort)
@@ -0,0 +1,112 @@
+# utils/session_guard.py
+
+import threading
+import time
+
+from utils.metrics import metrics
+
+
+class SessionLostError(RuntimeError):
+    """
+    A sessão expirou e o login não pôde ser refeito: a execução precisa ser
+    interrompida (todas as páginas seguintes falhariam).
+    """
+
+
+class SessionGuard:
+    """
+    Renovação da sessão do Canaimé compartilhada pelos workers de um motor.
+
+    Quando uma página revela que a sessão caiu, o worker chama renew() com a
+    geração da sessão que está usando. O primeiro a chegar refaz o login
+    (``renew_func``); enquanto isso ``ready`` fica baixado e os workers
+    esperam em wait_ready() antes da próxima página (pausa). Os que chegam
+    depois, com uma geração antiga, só recebem a sessão nova (``state``).
+
+    Se o novo login falhar, ``error`` guarda a falha e toda chamada seguinte
+    (wait_ready, renew, check) levanta SessionLostError, para que a execução
+    pare em vez de registrar cada página restante como falha.
+    """
+
+    def __init__(self, renew_func, min_interval: float = 60.0, clock=time.monotonic):
+        """
+        Parameters
+        ----------
+        renew_func : callable
+            Refaz o login e devolve o novo storage_state (ver
+            CanaimeLogin.renew_session).
+        min_interval : float, optional
+            Segundos mínimos entre duas renovações. Uma página que continua
+            "expirada" logo após a renovação é falha da página, não da sessão.
+        clock : callable, optional
+            Relógio monotônico (injetável nos testes).
+        """
+        self._renew_func = renew_func
+        self.min_interval = min_interval
+        self._clock = clock
+        self.generation = 0
+        self.state = None
+        self.renewals = 0
+        self.ready = threading.Event()
+        self.ready.set()
+        self._lock = threading.Lock()
+        self._last_attempt = None
+        self.error = None
+
+    def check(self) -> None:
+        """
+        Raises
+        ------
+        SessionLostError
+            Se uma renovação da sessão já falhou.
+        """
+        if self.error is not None:
+            raise SessionLostError(f"Não foi possível refazer o login no Canaimé: {self.error}") from self.error
+
+    def wait_ready(self) -> None:
+        """
+        Bloqueia enquanto o login está sendo refeito.
+
+        Raises
+        ------
+        SessionLostError
+            Se a renovação falhou (ver check).
+        """
+        self.ready.wait()
+        self.check()
+
+    def renew(self, seen_generation: int) -> int:
+        """
+        Renova a sessão, se ainda for a de ``seen_generation``.
+
+        Returns
+        -------
+        int
+            Geração atual da sessão (``state`` traz o storage_state dela).
+
+        Raises
+        ------
+        SessionLostError
+            Se o novo login falhou (agora ou numa renovação anterior).
+        """
+        with self._lock:
+            self.check()
+            if seen_generation != self.generation:
+                return self.generation  # outro worker já renovou
+            now = self._clock()
+            if self._last_attempt is not None and now - self._last_attempt < self.min_interval:
+                return self.generation
+            self._last_attempt = now
+            self.ready.clear()
+            try:
+                self.state = self._renew_func()
+            except Exception as e:
+                self.error = e
+                metrics.inc("canaime_session_renewal_failures_total")
+                self.check()
+            finally:
+                self.ready.set()
+            self.generation += 1
+            self.renewals += 1
+            metrics.inc("canaime_session_renewals_total")
+            return self.generation
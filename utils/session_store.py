@@ -0,0 +1,109 @@
+# utils/session_store.py
+
+import json
+import os
+
+
+class SessionStore:
+    """
+    Sessão autenticada do Canaimé (storage_state do Playwright: cookies e
+    localStorage) gravada criptografada em disco, para que as próximas
+    execuções não precisem repetir o login enquanto ela for válida.
+
+    A criptografia é Fernet (pacote ``cryptography``). A chave vem da variável
+    de ambiente ``key_env`` ou, se ela não existir, do arquivo ``key_path``
+    (criado na primeira gravação). A proteção da chave é a pasta onde ela
+    fica: por padrão a pasta de configuração do usuário (config.
+    user_config_dirname), que no Windows (%APPDATA%) só o próprio usuário
+    acessa. A permissão 0600 dada ao arquivo só vale em Linux/macOS; o
+    Windows a ignora.
+    """
+
+    def __init__(self, path: str, key_path: str, key_env: str, max_age_hours: float):
+        """
+        Parameters
+        ----------
+        path : str
+            Arquivo da sessão criptografada.
+        key_path : str
+            Arquivo da chave (usado se ``key_env`` não estiver definida).
+        key_env : str
+            Nome da variável de ambiente com a chave Fernet (base64).
+        max_age_hours : float
+            Idade máxima da sessão gravada; mais antiga que isso é descartada.
+        """
+        try:
+            from cryptography.fernet import Fernet, InvalidToken
+        except ImportError as e:
+            raise ImportError(
+                "Guardar a sessão requer o pacote 'cryptography' (pip install cryptography)."
+            ) from e
+        self._fernet_class = Fernet
+        self._invalid_token = InvalidToken
+        self.path = path
+        self.key_path = key_path
+        self.key_env = key_env
+        self.max_age_hours = max_age_hours
+
+    def _fernet(self, create: bool = False):
+        """
+        Devolve o Fernet com a chave configurada (ou None, se não há chave e
+        ``create`` é False).
+        """
+        key = os.environ.get(self.key_env)
+        if key is None and os.path.exists(self.key_path):
+            with open(self.key_path, 'rb') as f:
+                key = f.read().strip()
+        if key is None:
+            if not create:
+                return None
+            key = self._fernet_class.generate_key()
+            key_dir = os.path.dirname(self.key_path)
+            if key_dir:
+                os.makedirs(key_dir, mode=0o700, exist_ok=True)
+            fd = os.open(self.key_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+        return self._fernet_class(key)
+
+    def load(self):
+        """
+        Lê a sessão gravada.
+
+        Returns
+        -------
+        dict or None
+            storage_state, ou None se não há sessão, ela passou de
+            ``max_age_hours`` ou não pôde ser decifrada (chave trocada).
+        """
+        if not os.path.exists(self.path):
+            return None
+        fernet = self._fernet()
+        if fernet is None:
+            return None
+        with open(self.path, 'rb') as f:
+            token = f.read()
+        try:
+            # O token Fernet guarda o horário da gravação: ttl confere a idade
+            data = fernet.decrypt(token, ttl=int(self.max_age_hours * 3600))
+        except self._invalid_token:
+            return None
+        return json.loads(data)
+
+    def save(self, state: dict) -> None:
+        """
+        Grava a sessão criptografada (arquivo temporário + os.replace).
+        """
+        token = self._fernet(create=True).encrypt(json.dumps(state).encode('utf-8'))
+        temp_path = self.path + ".temp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(token)
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        """
+        Apaga a sessão gravada (ex: o Canaimé não a aceita mais).
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
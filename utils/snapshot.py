@@ -0,0 +1,184 @@
+# utils/snapshot.py
+
+import json
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# Colunas do relatório de movimentações (modo delta)
+DELTA_COLUMNS = [
+    'Tipo', 'Código', 'Preso',
+    'Unidade Anterior', 'Ala Anterior', 'Cela Anterior',
+    'Unidade Atual', 'Ala Atual', 'Cela Atual',
+]
+
+
+class RosterSnapshot:
+    """
+    Fotografia da última execução: para cada preso (por Código), a unidade,
+    ala, cela, nome e os dados de detalhe coletados.
+
+    Usada pelo modo delta para comparar as listas atuais com a execução
+    anterior, enriquecer apenas os presos novos e reaproveitar os detalhes
+    já conhecidos de todos os outros.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters
+        ----------
+        path : str
+            Caminho do arquivo SQLite (pode ser o mesmo do DetailCache).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot ("
+            " code TEXT PRIMARY KEY,"
+            " unit TEXT NOT NULL,"
+            " wing TEXT,"
+            " cell TEXT,"
+            " name TEXT,"
+            " details TEXT NOT NULL,"
+            " saved_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self._previous = None
+
+    def previous(self) -> dict:
+        """
+        Retorna (e memoriza) o estado da execução anterior.
+
+        Returns
+        -------
+        dict
+            {code: {"unit", "wing", "cell", "name", "details"}}
+        """
+        if self._previous is None:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT code, unit, wing, cell, name, details FROM snapshot"
+                ).fetchall()
+            self._previous = {
+                code: {"unit": unit, "wing": wing, "cell": cell, "name": name, "details": json.loads(details)}
+                for code, unit, wing, cell, name, details in rows
+            }
+        return self._previous
+
+    def compare(self, unit_dfs: list) -> pd.DataFrame:
+        """
+        Compara as listas atuais (pré-passo de create_unit_list) com a execução
+        anterior, por Código, Ala e Cela.
+
+        Parameters
+        ----------
+        unit_dfs : list of (unit, pd.DataFrame)
+            Listas de presos de cada unidade.
+
+        Returns
+        -------
+        pd.DataFrame
+            Uma linha por movimentação (colunas DELTA_COLUMNS), com Tipo:
+            'ENTRADA', 'TRANSFERÊNCIA', 'MUDANÇA DE CELA' ou 'SAÍDA'.
+        """
+        previous = self.previous()
+        rows = []
+        current_codes = set()
+
+        for unit, df in unit_dfs:
+            for wing, cell, code, name in zip(df["Ala"], df["Cela"], df["Código"], df["Preso"]):
+                current_codes.add(code)
+                prev = previous.get(code)
+                if prev is None:
+                    rows.append(['ENTRADA', code, name, '', '', '', unit, wing, cell])
+                elif prev["unit"] != unit:
+                    rows.append(['TRANSFERÊNCIA', code, name,
+                                 prev["unit"], prev["wing"], prev["cell"], unit, wing, cell])
+                elif (prev["wing"], prev["cell"]) != (wing, cell):
+                    rows.append(['MUDANÇA DE CELA', code, name,
+                                 prev["unit"], prev["wing"], prev["cell"], unit, wing, cell])
+
+        # Só é possível afirmar saída para unidades que foram lidas nesta execução
+        listed_units = {unit for unit, _ in unit_dfs}
+        for code, prev in previous.items():
+            if code not in current_codes and prev["unit"] in listed_units:
+                rows.append(['SAÍDA', code, prev["name"],
+                             prev["unit"], prev["wing"], prev["cell"], '', '', ''])
+
+        return pd.DataFrame(rows, columns=DELTA_COLUMNS)
+
+    def carry_over(self, df_unit: pd.DataFrame, columns: list) -> pd.Series:
+        """
+        Preenche, no DataFrame da unidade, os dados de detalhe já conhecidos
+        da execução anterior.
+
+        Parameters
+        ----------
+        df_unit : pd.DataFrame
+            Lista da unidade, já com as colunas extras.
+        columns : list of str
+            Colunas de detalhe a reaproveitar.
+
+        Returns
+        -------
+        pd.Series
+            Máscara booleana (por linha) dos presos que ainda precisam ser
+            enriquecidos (não estavam na execução anterior).
+        """
+        previous = self.previous()
+        known = df_unit["Código"].map(lambda code: code in previous)
+        if known.any():
+            details = pd.DataFrame.from_dict(
+                {code: previous[code]["details"] for code in df_unit.loc[known, "Código"]},
+                orient="index",
+            )
+            for col in columns:
+                if col in details.columns:
+                    df_unit.loc[known, col] = df_unit.loc[known, "Código"].map(details[col]).values
+        return ~known
+
+    def save_unit(self, unit: str, df_unit: pd.DataFrame, columns: list, is_complete=None) -> None:
+        """
+        Grava a situação atual dos presos de uma unidade.
+
+        Parameters
+        ----------
+        unit : str
+            Unidade.
+        df_unit : pd.DataFrame
+            DataFrame já enriquecido.
+        columns : list of str
+            Colunas de detalhe a guardar.
+        is_complete : callable, optional
+            Função (dict de detalhes) -> bool. Presos cujos detalhes não estão
+            completos (ex: coleta falhou) não são gravados, para serem
+            coletados novamente na próxima execução.
+        """
+        now = time.time()
+        records = []
+        for row in df_unit.to_dict("records"):
+            details = {col: row[col] for col in columns if col in row}
+            if is_complete is not None and not is_complete(details):
+                continue
+            records.append((row["Código"], unit, row["Ala"], row["Cela"], row["Preso"],
+                            json.dumps(details, ensure_ascii=False), now))
+
+        with self._lock:
+            self._conn.execute("DELETE FROM snapshot WHERE unit = ?", (unit,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshot (code, unit, wing, cell, name, details, saved_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                records
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """
+        Fecha a conexão com o banco.
+        """
+        with self._lock:
+            self._conn.close()
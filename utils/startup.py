@@ -0,0 +1,36 @@
+# utils/startup.py
+
+import importlib
+import threading
+from contextlib import contextmanager
+
+
+@contextmanager
+def preloaded(modules):
+    """
+    Importa ``modules`` numa thread em segundo plano durante o bloco ``with``
+    (ex: enquanto o usuário digita a senha) e, na saída, espera as
+    importações terminarem, para que o código seguinte não importe os mesmos
+    módulos ao mesmo tempo que a thread.
+
+    Um módulo que não pôde ser importado é ignorado aqui: o erro aparece no
+    import de quem o usa.
+
+    Parameters
+    ----------
+    modules : iterable of str
+        Nomes dos módulos (ex: 'pandas', 'views.excel_view').
+    """
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        thread.join()
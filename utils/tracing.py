@@ -0,0 +1,168 @@
+# utils/tracing.py
+
+import asyncio
+import heapq
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Devolvido por span() com o rastreamento desligado
+_NO_SPAN = nullcontext()
+
+# Identificador das linhas ("vagas") dos trechos que rodam no event loop
+ASYNC_LANE_BASE = 1_000_000
+
+
+class Tracer:
+    """
+    Linha do tempo da execução no formato Chrome trace event (JSON aberto
+    por chrome://tracing, Perfetto ou speedscope), ligada pela opção --trace
+    de main.py.
+
+    Cada navegação, extração e registro de preso vira um trecho ("X") na
+    linha da thread que o executou, com o Código do preso nos argumentos: dá
+    para ver onde a concorrência fica ociosa e onde as páginas travam. Além
+    disso, cada preso tem um trecho assíncrono próprio (da entrada na fila até
+    a gravação), com a espera na fila aninhada: o tempo até a primeira
+    navegação daquele preso.
+
+    No event loop (motor 'async') várias navegações se sobrepõem na mesma
+    thread; cada trecho ocupa então a primeira "vaga" livre, e o número de
+    vagas em uso mostra a concorrência real.
+
+    Desligado (padrão), todos os métodos retornam sem registrar nada.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._events = []
+        self._threads = {}  # {thread: nome}
+        self._queued = set()  # presos ainda na fila
+        self._free_lanes = []  # vagas do event loop liberadas (heap)
+        self._lanes = 0
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+
+    def enable(self) -> None:
+        with self._lock:
+            self.enabled = True
+            self._events.clear()
+            self._queued.clear()
+            self._origin = time.perf_counter()
+
+    def _now(self) -> float:
+        # Microssegundos desde enable()
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _add(self, event: dict, lane: int = None) -> None:
+        thread = threading.current_thread()
+        tid, name = thread.ident, thread.name
+        if lane is not None:
+            tid, name = ASYNC_LANE_BASE + lane, f"event loop (vaga {lane})"
+        event["pid"] = self._pid
+        event["tid"] = tid
+        with self._lock:
+            self._threads[tid] = name
+            self._events.append(event)
+
+    def _take_lane(self) -> int:
+        with self._lock:
+            if self._free_lanes:
+                return heapq.heappop(self._free_lanes)
+            self._lanes += 1
+            return self._lanes
+
+    def _release_lane(self, lane: int) -> None:
+        with self._lock:
+            heapq.heappush(self._free_lanes, lane)
+
+    def span(self, name: str, **args):
+        """
+        Context manager que registra o bloco ``with`` como um trecho na linha
+        da thread atual (``args`` aparecem no detalhe do trecho).
+        """
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: dict):
+        lane = self._take_lane() if _in_event_loop() else None
+        start = self._now()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": "etapa", "ph": "X", "ts": start, "dur": self._now() - start, "args": args}
+            self._add(event, lane)
+            if lane is not None:
+                self._release_lane(lane)
+
+    def enqueue(self, codes) -> None:
+        """
+        Abre o trecho de cada preso e a espera na fila (presos entregues ao
+        processor para coleta).
+        """
+        if not self.enabled:
+            return
+        ts = self._now()
+        for code in codes:
+            with self._lock:
+                self._queued.add(code)
+            self._async("b", f"preso {code}", code, ts)
+            self._async("b", "fila", code, ts)
+
+    def dequeue(self, code: str) -> None:
+        """
+        Fecha a espera na fila do preso (chamado a cada navegação; só a
+        primeira conta).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if code not in self._queued:
+                return
+            self._queued.discard(code)
+        self._async("e", "fila", code, self._now())
+
+    def finish(self, code: str) -> None:
+        """
+        Fecha o trecho do preso (dados gravados). Um preso que não navegou
+        (ex: todas as páginas no cache) sai da fila aqui.
+        """
+        if not self.enabled:
+            return
+        self.dequeue(code)
+        self._async("e", f"preso {code}", code, self._now())
+
+    def _async(self, phase: str, name: str, code: str, ts: float) -> None:
+        self._add({"name": name, "cat": "preso", "ph": phase, "id": str(code), "ts": ts, "args": {"codigo": code}})
+
+    def write(self, path: str) -> None:
+        """
+        Grava a linha do tempo (com o nome de cada thread) em JSON.
+        """
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        temp_path = path + ".temp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+def _in_event_loop() -> bool:
+    try:
+        return asyncio.current_task() is not None
+    except RuntimeError:  # sem event loop nesta thread
+        return False
+
+
+# Linha do tempo única da execução (desligada até tracer.enable())
+tracer = Tracer()
@@ -5,16 +5,15 @@ Dependências:
 - requests (para realizar o download e checar a versão)
 - packaging (comparar versões)
 - tkinter (exibir diálogo para o usuário confirmar a atualização)
+
+As dependências são importadas só no uso, para não atrasar a abertura do
+programa; a consulta da versão roda em segundo plano (ver UpdateCheck).
 """
 
 import os
 import sys
 import subprocess
-import tkinter as tk
-from tkinter import messagebox
-
-import requests
-from packaging import version
+import threading
 from urllib.parse import urljoin
 
 from utils.logger import Logger
@@ -44,6 +43,8 @@ def get_latest_version() -> str:
     str
         Versão mais recente (ex: '0.0.2'), ou None em caso de falha.
     """
+    import requests
+
     try:
         response = requests.get(urljoin(UPDATE_URL, VERSION_FILE), timeout=10)
         response.raise_for_status()
@@ -69,6 +70,8 @@ def download_update(latest_version: str, target_path: str) -> bool:
     bool
         True se o download for bem-sucedido, False em caso de erro.
     """
+    import requests
+
     try:
         download_url = urljoin(UPDATE_URL, f"canaime-preso-por-ala-{latest_version}.exe")
         response = requests.get(download_url, stream=True, timeout=20)
@@ -96,6 +99,9 @@ def prompt_user_for_update(latest_version: str) -> bool:
     bool
         True se o usuário aceitar, False se recusar.
     """
+    import tkinter as tk
+    from tkinter import messagebox
+
     root = tk.Tk()
     root.withdraw()  # Oculta a janela principal
     result = messagebox.askyesno(
@@ -126,7 +132,16 @@ def check_and_update(current_version: str) -> bool:
         False se não houve atualização ou se o usuário recusou.
     """
     # 1. Obter a versão mais recente
-    latest_version = get_latest_version()
+    return apply_update(current_version, get_latest_version())
+
+
+def apply_update(current_version: str, latest_version: str) -> bool:
+    """
+    Continuação de check_and_update com a versão mais recente já obtida
+    (None se a consulta falhou).
+    """
+    from packaging import version
+
     if not latest_version:
         print("Não foi possível verificar atualizações.")
         Logger.get_logger().warning("Falha ao verificar atualizações.")
@@ -163,3 +178,31 @@ def check_and_update(current_version: str) -> bool:
         return False
 
     return True
+
+
+class UpdateCheck:
+    """
+    Consulta a versão mais recente numa thread própria, iniciada junto com
+    o programa: a espera pela rede (até 10 s sem conexão) corre enquanto o
+    usuário digita a senha e o browser abre. apply() espera a consulta e
+    segue como check_and_update (diálogo, download), na thread de quem chama.
+    """
+
+    def __init__(self, current_version: str):
+        self.current_version = current_version
+        self.latest_version = None
+        self._thread = threading.Thread(target=self._fetch, name="update-check", daemon=True)
+        self._thread.start()
+
+    def _fetch(self) -> None:
+        self.latest_version = get_latest_version()
+
+    def apply(self) -> bool:
+        """
+        Returns
+        -------
+        bool
+            O mesmo que check_and_update.
+        """
+        self._thread.join()
+        return apply_update(self.current_version, self.latest_version)
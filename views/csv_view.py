@@ -0,0 +1,70 @@
+import csv
+import os
+
+import pandas as pd
+
+from views.excel_view import SHEET_COLUMNS
+from views.sink import Sink, with_unit_column
+
+
+class CsvSink(Sink):
+    """
+    CSV único com os presos de todas as unidades (coluna 'Unidade' na
+    frente). Cada unidade é acrescentada ao arquivo assim que fica pronta;
+    com ``unit_order``, close() regrava as linhas na ordem das unidades.
+    """
+
+    def __init__(self, filename: str, unit_order=None):
+        """
+        Parameters
+        ----------
+        filename : str
+            Nome do arquivo CSV (UTF-8 com BOM, para abrir direto no Excel).
+        unit_order : sequence of str, optional
+            Ordem final das unidades no arquivo (ex: config.units). Unidades
+            fora da lista ficam no fim, na ordem em que chegaram.
+        """
+        self.filename = filename
+        self.unit_order = list(unit_order) if unit_order is not None else None
+        self._file = None
+        self._writer = None
+        self._columns = None
+        self._units = []
+
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        if self._file is None:
+            self._file = open(self.filename, 'w', newline='', encoding='utf-8-sig')
+            self._writer = csv.writer(self._file)
+            self._columns = [c for c in SHEET_COLUMNS if c in df.columns]
+            self._writer.writerow(['Unidade'] + self._columns)
+        rows = with_unit_column(unit, df, self._columns)
+        self._writer.writerows(rows.itertuples(index=False, name=None))
+        self._file.flush()
+        self._units.append(unit)
+
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+            if self.unit_order is not None:
+                self._sort_units()
+            print(f"\nArquivo CSV salvo como {self.filename}")
+
+    def _sort_units(self) -> None:
+        """
+        Regrava o arquivo com as unidades na ordem de ``unit_order`` (só se
+        chegaram fora dela); as linhas de cada unidade mantêm a ordem.
+        """
+        position = {unit: i for i, unit in enumerate(self.unit_order)}
+        rank = {unit: (position.get(unit, len(position)), i) for i, unit in enumerate(self._units)}
+        if sorted(self._units, key=rank.get) == self._units:
+            return
+        with open(self.filename, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = sorted(reader, key=lambda row: rank[row[0]])
+        temp_filename = self.filename + ".temp"
+        with open(temp_filename, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+        os.replace(temp_filename, self.filename)
@@ -3,32 +3,101 @@ import time
 import threading
 import pandas as pd
 from openpyxl import Workbook
-from openpyxl.styles import Border, Side, Font
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border, Side, Font, NamedStyle
 from openpyxl.comments import Comment
+from views.sink import Sink
+from utils.metrics import metrics
 
-class ExcelHandler:
+# Modos de representação do link da foto
+PHOTO_LINK_MODES = ('comment', 'formula')
+
+# Ordem das colunas na planilha (colunas ausentes no DataFrame são ignoradas)
+SHEET_COLUMNS = [
+    'Ala',
+    'Cela',
+    'Código',
+    'Foto',
+    'Preso',
+    'Mãe',
+    'Pai',
+    'Sexo',
+    'Data Nasc.',
+    'Cidade Origem',
+    'Estado',
+    'País',
+    'Endereço',
+    'Estado Civil',
+    'Qtd Filhos',
+    'Escolaridade',
+    'Religião',
+    'Profissão',
+    'Cor/Etnia',
+    'Altura',
+    'Modus Operandi',
+    'Sentença Dias',
+]
+
+def photo_formula(url: str) -> str:
+    """
+    Converte a URL da foto na fórmula =HYPERLINK(...) exibida como "Ver Foto".
+    "SEM FOTO" é mantido como texto.
+    """
+    if url == "SEM FOTO":
+        return url
+    return '=HYPERLINK("{}", "Ver Foto")'.format(str(url).replace('"', '""'))
+
+
+class ExcelHandler(Sink):
     """
     Classe para manipular a geração e salvamento do arquivo Excel
-    contendo os dados dos internos.
+    contendo os dados dos internos (destino de saída padrão).
     """
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, streaming: bool = False, photo_links: str = 'comment', unit_order=None):
         """
         Parameters
         ----------
         filename : str
             Nome do arquivo Excel (ex: 'Informacoes_Presos-02.xlsx').
+        streaming : bool, optional
+            Se True, usa o modo write-only do openpyxl: as linhas são
+            gravadas em disco conforme são adicionadas (memória constante)
+            e o arquivo é escrito uma única vez, em close(). Nesse modo,
+            save() não grava nada (a proteção contra quedas fica por conta
+            do diário da execução).
+        photo_links : str, optional
+            'comment' (padrão): hyperlink + fonte + comentário com a URL em
+            cada célula de foto. 'formula': =HYPERLINK(url, "Ver Foto") sem
+            comentário e com estilos nomeados compartilhados ("Borda" e
+            "Link"); arquivo bem menor e gravação mais rápida, pois
+            comentários viram desenhos VML no .xlsx.
+        unit_order : sequence of str, optional
+            Ordem das abas no arquivo (ex: config.units). As unidades podem
+            ficar prontas em qualquer ordem; as abas são reordenadas a cada
+            gravação. Abas fora da lista ficam no fim, na ordem de criação.
         """
+        if photo_links not in PHOTO_LINK_MODES:
+            raise ValueError(f"photo_links deve ser um de {PHOTO_LINK_MODES}: {photo_links!r}")
         self.filename = filename
-        self.wb = Workbook()
+        self.streaming = streaming
+        self.photo_links = photo_links
+        self.unit_order = list(unit_order) if unit_order is not None else None
+        self.wb = Workbook(write_only=streaming)
         self.thin_border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
             top=Side(style='thin'),
             bottom=Side(style='thin')
         )
-        # Mantém ao menos uma planilha ativa
-        self.wb.active
+        self.link_font = Font(color="0000FF", underline="single")
+        if photo_links == 'formula':
+            self.wb.add_named_style(NamedStyle(name="Borda", border=self.thin_border))
+            self.wb.add_named_style(NamedStyle(name="Link", border=self.thin_border, font=self.link_font))
+        self._dirty = False
+        if not streaming:
+            # Mantém ao menos uma planilha ativa
+            self.wb.active
 
     def create_unit_sheet(self, unit: str, df: pd.DataFrame) -> None:
         """
@@ -42,6 +111,16 @@ class ExcelHandler:
             DataFrame contendo as colunas:
             ['Ala', 'Cela', 'Código', 'Foto', 'Preso', 'Mãe', 'Pai', 'Sexo', ...]
         """
+        self._dirty = True
+        columns = [c for c in SHEET_COLUMNS if c in df.columns]
+
+        if self.photo_links == 'formula':
+            self._write_compact_sheet(unit, df, columns)
+            return
+        if self.streaming:
+            self._stream_unit_sheet(unit, df, columns)
+            return
+
         # Remove a planilha padrão "Sheet" se ainda existir
         if "Sheet" in self.wb.sheetnames and len(self.wb.sheetnames) == 1:
             self.wb.remove(self.wb["Sheet"])
@@ -49,37 +128,6 @@ class ExcelHandler:
         # Cria uma nova aba com o nome da unidade
         ws = self.wb.create_sheet(title=unit)
 
-        # Vamos usar TODAS as colunas do DataFrame na ordem que desejar.
-        # Exemplo de ordem manual:
-        columns = [
-            'Ala',
-            'Cela',
-            'Código',
-            'Foto',
-            'Preso',
-            'Mãe',
-            'Pai',
-            'Sexo',
-            'Data Nasc.',
-            'Cidade Origem',
-            'Estado',
-            'País',
-            'Endereço',
-            'Estado Civil',
-            'Qtd Filhos',
-            'Escolaridade',
-            'Religião',
-            'Profissão',
-            'Cor/Etnia',
-            'Altura',
-            'Modus Operandi',
-            'Sentença Dias',
-        ]
-
-        # Caso falte alguma coluna, você pode tratar ou criar dinamicamente.
-        # Garantir que não quebre se alguma coluna não existir no DF:
-        columns = [c for c in columns if c in df.columns]
-
         # Adiciona o cabeçalho
         ws.append(columns)
         for cell in ws[1]:
@@ -116,6 +164,89 @@ class ExcelHandler:
                     comment = Comment(f"URL: {url}", "Sistema")
                     cell.comment = comment
 
+    def _stream_unit_sheet(self, unit: str, df: pd.DataFrame, columns: list) -> None:
+        """
+        Escreve a aba da unidade no modo write-only: cada linha vai direto
+        para o arquivo temporário da aba, com borda/fonte compartilhadas.
+        Mesmo conteúdo do modo normal (colunas, bordas, link "Ver Foto").
+        """
+        ws = self.wb.create_sheet(title=unit)
+        ws.append([self._bordered(ws, c) for c in columns])
+
+        foto_pos = columns.index('Foto') if 'Foto' in columns else None
+        for values in df[columns].itertuples(index=False, name=None):
+            row = [self._bordered(ws, v) for v in values]
+            if foto_pos is not None and values[foto_pos] != "SEM FOTO":
+                cell = row[foto_pos]
+                url = values[foto_pos]
+                cell.hyperlink = url
+                cell.font = self.link_font
+                cell.value = "Ver Foto"
+                cell.comment = Comment(f"URL: {url}", "Sistema")
+            ws.append(row)
+
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        """
+        Cria a aba da unidade e salva o arquivo (interface Sink).
+        """
+        self.create_unit_sheet(unit, df)
+        self.save()
+
+    def _write_compact_sheet(self, unit: str, df: pd.DataFrame, columns: list) -> None:
+        """
+        Escreve a aba da unidade no modo 'formula': valores puros, link da
+        foto como fórmula HYPERLINK e estilos nomeados. No modo normal os
+        estilos são aplicados depois, de uma vez, sobre o intervalo da aba;
+        no streaming, cada célula recebe apenas o nome do estilo.
+        """
+        ws = self._new_sheet(unit)
+        foto_pos = columns.index('Foto') if 'Foto' in columns else None
+
+        rows = df[columns].itertuples(index=False, name=None)
+        if foto_pos is not None:
+            rows = (
+                values[:foto_pos] + (photo_formula(values[foto_pos]),) + values[foto_pos + 1:]
+                for values in rows
+            )
+
+        if self.streaming:
+            ws.append([self._styled(ws, c, "Borda") for c in columns])
+            for values in rows:
+                ws.append([
+                    self._styled(ws, v, "Link" if pos == foto_pos and v != "SEM FOTO" else "Borda")
+                    for pos, v in enumerate(values)
+                ])
+            return
+
+        ws.append(columns)
+        for values in rows:
+            ws.append(values)
+        for row in ws.iter_rows(min_row=1, max_row=ws.max_row, max_col=len(columns)):
+            for cell in row:
+                cell.style = "Borda"
+        if foto_pos is not None:
+            for (cell,) in ws.iter_rows(min_row=2, min_col=foto_pos + 1, max_col=foto_pos + 1):
+                if cell.value != "SEM FOTO":
+                    cell.style = "Link"
+
+    def _new_sheet(self, unit: str):
+        """
+        Cria a aba da unidade (removendo a planilha padrão "Sheet", se houver).
+        """
+        if not self.streaming and "Sheet" in self.wb.sheetnames and len(self.wb.sheetnames) == 1:
+            self.wb.remove(self.wb["Sheet"])
+        return self.wb.create_sheet(title=unit)
+
+    def _styled(self, ws, value, style: str) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = style
+        return cell
+
+    def _bordered(self, ws, value) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        cell.border = self.thin_border
+        return cell
+
     def save_periodically(self, interval: int = 300):
         """
         Salva o arquivo Excel periodicamente em segundo plano.
@@ -130,13 +261,47 @@ class ExcelHandler:
 
     def save(self):
         """
-        Salva o arquivo Excel no disco.
+        Salva o arquivo Excel no disco (no modo streaming, a gravação
+        acontece apenas em close()).
+        """
+        if self.streaming:
+            return
+        self._write()
+
+    def close(self):
+        """
+        Finaliza o arquivo: no modo streaming, grava o workbook (uma única vez);
+        no modo normal, salva apenas se houve mudança desde o último save().
+        """
+        if self._dirty:
+            self._write()
+
+    def _sort_sheets(self) -> None:
+        """
+        Coloca as abas na ordem de ``unit_order`` (ver __init__).
+        """
+        titles = [ws.title for ws in self.wb.worksheets]
+        position = {unit: i for i, unit in enumerate(self.unit_order)}
+        ordered = sorted(titles, key=lambda t: position.get(t, len(position)))
+        if ordered == titles:
+            return
+        for target, title in enumerate(ordered):
+            self.wb.move_sheet(title, offset=target - self.wb.sheetnames.index(title))
+        self.wb.active = 0
+
+    def _write(self):
+        """
+        Grava o workbook em um arquivo temporário e o move para o destino.
         """
+        if self.unit_order is not None:
+            self._sort_sheets()
         # Garante ao menos uma sheet visível
         if not any(sheet.sheet_state == 'visible' for sheet in self.wb.worksheets):
             self.wb.active.sheet_state = 'visible'
 
         temp_filename = self.filename + ".temp"
-        self.wb.save(temp_filename)
-        os.replace(temp_filename, self.filename)
+        with metrics.timer("canaime_excel_save_seconds"):
+            self.wb.save(temp_filename)
+            os.replace(temp_filename, self.filename)
+        self._dirty = False
         print(f"\nArquivo Excel salvo como {self.filename}")
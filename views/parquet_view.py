@@ -0,0 +1,47 @@
+import pandas as pd
+
+from views.excel_view import SHEET_COLUMNS
+from views.sink import Sink, with_unit_column
+
+
+class ParquetSink(Sink):
+    """
+    Arquivo Parquet (colunar) com os presos de todas as unidades: cada unidade
+    vira um row group, gravado assim que fica pronta. Requer ``pyarrow``.
+    """
+
+    def __init__(self, filename: str):
+        """
+        Parameters
+        ----------
+        filename : str
+            Nome do arquivo Parquet.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("A saída Parquet requer o pacote 'pyarrow' (pip install pyarrow).") from e
+        self._pa = pa
+        self._pq = pq
+        self.filename = filename
+        self._columns = None
+        self._schema = None
+        self._writer = None
+
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        pa = self._pa
+        if self._writer is None:
+            self._columns = [c for c in SHEET_COLUMNS if c in df.columns]
+            self._schema = pa.schema([(c, pa.string()) for c in ['Unidade'] + self._columns])
+            self._writer = self._pq.ParquetWriter(self.filename, self._schema)
+        table = pa.Table.from_pandas(
+            with_unit_column(unit, df, self._columns), schema=self._schema, preserve_index=False
+        )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            print(f"\nArquivo Parquet salvo como {self.filename}")
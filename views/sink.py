@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+from utils.logger import Logger
+from utils.metrics import metrics
+
+
+class Sink(ABC):
+    """
+    Destino de saída dos dados dos presos.
+
+    main.py entrega a cada destino o DataFrame já enriquecido e ordenado de
+    cada unidade (write_unit) e, no fim da execução, chama close().
+
+    Um destino sem write_unit falha ao ser criado (TypeError), antes da
+    coleta, e não no meio da execução.
+
+    Methods
+    -------
+    write_unit(unit, df)
+        Grava (ou substitui) os presos de uma unidade.
+    close()
+        Finaliza o destino (grava o que estiver pendente e fecha arquivos).
+    """
+
+    @abstractmethod
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class MultiSink(Sink):
+    """
+    Repassa cada unidade para vários destinos na mesma execução (o tempo
+    de cada um vai para a métrica canaime_sink_write_seconds).
+    """
+
+    def __init__(self, sinks: list):
+        """
+        Parameters
+        ----------
+        sinks : list of Sink
+            Destinos, na ordem em que são gravados.
+        """
+        self.sinks = list(sinks)
+
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        for sink in self.sinks:
+            with metrics.timer("canaime_sink_write_seconds", sink=type(sink).__name__):
+                sink.write_unit(unit, df)
+
+    def close(self) -> None:
+        """
+        Fecha todos os destinos, mesmo que um deles falhe; a primeira falha
+        é levantada depois que os demais foram fechados.
+        """
+        error = None
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                Logger.capture_error(e)
+                error = error or e
+        if error is not None:
+            raise error
+
+
+def with_unit_column(unit: str, df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    Devolve ``df`` com a coluna 'Unidade' na frente e as colunas em ``columns``
+    (ausentes viram vazias), para os destinos que juntam todas as unidades em
+    uma única tabela.
+    """
+    out = df.reindex(columns=columns)
+    out.insert(0, 'Unidade', unit)
+    return out.fillna('').astype(str)
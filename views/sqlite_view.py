@@ -0,0 +1,59 @@
+import sqlite3
+
+import pandas as pd
+
+from views.excel_view import SHEET_COLUMNS
+from views.sink import Sink, with_unit_column
+
+
+class SqliteSink(Sink):
+    """
+    Tabela ``presos`` em um banco SQLite, com os presos de todas as unidades.
+    Cada unidade substitui as próprias linhas (DELETE + INSERT em uma
+    transação), então o banco sempre reflete a última execução de cada uma.
+    """
+
+    TABLE = "presos"
+
+    def __init__(self, filename: str):
+        """
+        Parameters
+        ----------
+        filename : str
+            Caminho do arquivo SQLite.
+        """
+        self.filename = filename
+        self._conn = None
+        self._columns = None
+
+    def _create_table(self, columns: list) -> None:
+        existing = [row[1] for row in self._conn.execute(f'PRAGMA table_info("{self.TABLE}")')]
+        if existing and existing != ['Unidade'] + columns:
+            # Colunas mudaram (nova versão): recria a tabela
+            self._conn.execute(f'DROP TABLE "{self.TABLE}"')
+        cols = ", ".join(f'"{c}" TEXT' for c in ['Unidade'] + columns)
+        self._conn.execute(
+            f'CREATE TABLE IF NOT EXISTS "{self.TABLE}" ({cols}, PRIMARY KEY ("Unidade", "Código"))'
+        )
+
+    def write_unit(self, unit: str, df: pd.DataFrame) -> None:
+        if self._conn is None:
+            # Aberto pelo estágio de escrita e fechado pela thread principal
+            # (ver main.py), uma de cada vez
+            self._conn = sqlite3.connect(self.filename, check_same_thread=False)
+            self._columns = [c for c in SHEET_COLUMNS if c in df.columns]
+            self._create_table(self._columns)
+        rows = with_unit_column(unit, df, self._columns)
+        placeholders = ", ".join("?" for _ in rows.columns)
+        with self._conn:
+            self._conn.execute(f'DELETE FROM "{self.TABLE}" WHERE "Unidade" = ?', (unit,))
+            self._conn.executemany(
+                f'INSERT OR REPLACE INTO "{self.TABLE}" VALUES ({placeholders})',
+                rows.itertuples(index=False, name=None)
+            )
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+            print(f"\nBanco SQLite salvo como {self.filename}")